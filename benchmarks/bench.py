@@ -0,0 +1,563 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##                 BENCHMARK SUITE                 ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   Benchmarks every getter and setter of ryuswitch (RyuSwitch) and ryufunc against the mock REST API in ryumock.
+#   No Ryu controller or network is needed. The mock runs in a separate process, so only the client is measured.
+#   Five groups of benchmarks are run:
+#       * getter: every getter, one switch, for each flow table size (getters that do not depend on the flow table run once).
+#       * setter: every setter, one call at a time.
+#       * bulk:   add_flows() for each concurrency level (window), through Requests and through a PipelinedWriter.
+#       * fanout: RyuFleet sweeps of get_port_stats() and get_flows() for each switch count and concurrency level (workers).
+#       * import: cold import time of the package, RyuSwitch and ryufunc, each timed in a fresh interpreter.
+#                 Whether the statement imported Requests is recorded too: it should not be, until the first call.
+#   For each benchmark the latency percentiles, throughput (calls/sec) and peak memory of one call are recorded.
+#   Peak memory is measured with tracemalloc, so it is only available on Python 3.
+#   Results are written as JSON. Pass an earlier results file with --compare to list the regressions.
+
+### USAGE INSTRUCTIONS ###
+#   $ python benchmarks/bench.py                                     # Full run, results in benchmark_results.json
+#   $ python benchmarks/bench.py --quick                             # Small sizes, for a quick check
+#   $ python benchmarks/bench.py --sizes 1000,100000 --switches 1,32 --concurrency 1,16 --output new.json
+#   $ python benchmarks/bench.py --only "get_flow" --latency 0.002  # Only matching benchmarks, 2ms added per reply
+#   $ python benchmarks/bench.py --quick --compare old.json          # Exit status 1 if anything got slower than --threshold
+#   $ python benchmarks/bench.py --groups import                     # Cold import times only
+
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import re
+import socket
+import subprocess
+import sys
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+LIBRARY_DIR = os.path.join(ROOT_DIR, "ryurest")
+sys.path.insert(0, LIBRARY_DIR)
+
+import ryufunc
+import ryusession
+from ryufleet import RyuFleet
+from ryupipeline import PipelinedWriter
+from ryuswitch import RyuSwitch
+
+
+### DEFAULT PARAMETERS ###
+SIZES = (1000, 10000, 100000)
+SWITCHES = (1, 8, 32)
+CONCURRENCY = (1, 8, 32)
+ITERATIONS = 50
+MAX_TIME = 5.0
+
+### QUICK RUN PARAMETERS ###
+QUICK = {"sizes": (100, 1000), "switches": (1, 4), "concurrency": (1, 4), "iterations": 10, "max_time": 1.0}
+
+# Fewest calls made for a benchmark, however long they take
+MIN_ITERATIONS = 3
+
+# Sizes of the synthetic switches, besides the flow table
+MOCK_SIZES = {"ports": 8, "groups": 4, "meters": 4, "queues": 2}
+
+# Flow entries per add_flows() call in the bulk benchmark
+BULK_FLOWS = 1000
+
+# Timer with the best available resolution
+clock = getattr(time, "perf_counter", time.time)
+
+
+### GETTERS ###
+#   (RyuSwitch method, ryufunc function, arguments besides the DPID, whether the result depends on the flow table size)
+GETTERS = (
+    ("get_switches", "get_switches", (), False),
+    ("get_stats", "get_switch_stats", (), False),
+    ("get_flows", "get_flows", (), True),
+    ("iter_flows", "iter_flows", (), True),
+    ("get_flow_table", "get_flow_table", (), True),
+    ("get_flow_stats", "get_flow_stats", (), True),
+    ("get_table_stats", "get_table_stats", (), True),
+    ("get_table_features", "get_table_features", (), False),
+    ("get_port_stats", "get_port_stats", (), False),
+    ("get_port_description", "get_port_description", (), False),
+    ("get_queue_stats", "get_queue_stats", (), False),
+    ("get_queue_config", "get_queue_config", (), False),
+    ("get_queue_description", "get_queue_description", (), False),
+    ("get_group_stats", "get_group_stats", (), False),
+    ("get_group_description", "get_group_description", (), False),
+    ("get_group_features", "get_group_features", (), False),
+    ("get_meter_stats", "get_meter_stats", (), False),
+    ("get_meter_description", "get_meter_description", (), False),
+    ("get_meter_features", "get_meter_features", (), False),
+)
+
+
+### SETTERS ###
+#   (method/function name, payload for call number i). Run in this order, so that e.g. deletes find what was added.
+#   delete_flow_all and send_experimenter take the DPID as well, see _setter().
+def _flow(i):
+    return {"dpid": 1, "table_id": 0, "priority": 1000 + i // 4096, "match": {"in_port": 1, "dl_vlan": i % 4096}, "actions": [{"type": "OUTPUT", "port": 2}]}
+
+SETTERS = (
+    ("add_flow", _flow),
+    ("modify_flow_strict", lambda i: dict(_flow(i), actions=[{"type": "OUTPUT", "port": 3}])),
+    ("modify_flow", lambda i: {"dpid": 1, "match": {"in_port": 1, "dl_vlan": i % 4096}, "actions": [{"type": "OUTPUT", "port": 4}]}),
+    ("delete_flow_strict", _flow),
+    ("delete_flow", lambda i: {"dpid": 1, "match": {"in_port": 2, "dl_vlan": i % 4096}}),
+    ("add_group", lambda i: {"dpid": 1, "type": "ALL", "group_id": 100 + i, "buckets": [{"actions": [{"type": "OUTPUT", "port": 1}]}]}),
+    ("modify_group", lambda i: {"dpid": 1, "type": "ALL", "group_id": 100 + i, "buckets": [{"actions": [{"type": "OUTPUT", "port": 2}]}]}),
+    ("delete_group", lambda i: {"dpid": 1, "group_id": 100 + i}),
+    ("add_meter", lambda i: {"dpid": 1, "meter_id": 100 + i, "flags": "KBPS", "bands": [{"type": "DROP", "rate": 1000}]}),
+    ("modify_meter", lambda i: {"dpid": 1, "meter_id": 100 + i, "flags": "KBPS", "bands": [{"type": "DROP", "rate": 2000}]}),
+    ("delete_meter", lambda i: {"dpid": 1, "meter_id": 100 + i}),
+    ("modify_port", lambda i: {"dpid": 1, "port_no": 1, "config": i % 2, "mask": 1}),
+    ("send_experimenter", lambda i: {"dpid": 1, "experimenter": 1, "exp_type": 1, "data_type": "ascii", "data": "bench"}),
+    ("delete_flow_all", lambda i: None),
+)
+
+
+
+### IMPORTS ###
+#   (name, statement) timed by the import benchmark, each in a fresh interpreter.
+#   "first_call" also creates the transport, as the first call to the REST API does.
+IMPORTS = (
+    ("package", "import ryurest"),
+    ("RyuSwitch", "from ryurest import RyuSwitch"),
+    ("ryufunc", "from ryurest import ryufunc"),
+    ("first_call", "from ryurest import RyuSwitch, ryusession; ryusession.SESSION._http(); ryusession.SESSION.policy"),
+)
+
+# Run in the fresh interpreter: time the statement, and report whether Requests was imported
+IMPORT_CODE = '''
+from __future__ import print_function
+import sys, time
+clock = getattr(time, "perf_counter", time.time)
+sys.path.insert(0, %r)
+start = clock()
+%s
+print(clock() - start, "requests" in sys.modules)
+'''
+
+
+
+class MockServer(object):
+
+    '''
+    Mock REST API (ryumock.py) running in a child process.
+    '''
+
+    def __init__(self, switches=1, flows=1000, latency=0.0):
+        command = [
+            sys.executable, "-u", os.path.join(LIBRARY_DIR, "ryumock.py"), "--port", "0",
+            "--switches", str(switches), "--flows", str(flows), "--latency", str(latency),
+        ]
+        for option, value in sorted(MOCK_SIZES.items()):
+            command += ["--" + option, str(value)]
+
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE)
+
+        # The mock prints its URI once it is serving
+        line = self.process.stdout.readline().decode("utf-8").strip()
+        if not line:
+            self.stop()
+            raise RuntimeError("Mock REST API did not start")
+        self.API = line.rsplit(" ", 1)[1]
+
+
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait()
+        self.process.stdout.close()
+
+
+
+    def __enter__(self):
+        return self
+
+
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+
+## Return the value at fraction q (0 to 1) of a sorted list ##
+def percentile(values, q):
+    if not values:
+        return None
+    index = q * (len(values) - 1)
+    lower = int(index)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (index - lower)
+
+
+
+## Read a result to the end (generators from iter_flows) ##
+def _consume(result):
+    if result is False or isinstance(result, (dict, list, bool)) or result is None:
+        return result
+    if hasattr(result, "__len__"):
+        return result
+    count = 0
+    for _ in result:
+        count += 1
+    return count
+
+
+
+## Time repeated calls to call(i), and measure the peak memory of one more call ##
+def measure(call, iterations, max_time, calls_per_iteration=1):
+
+    '''
+    Description:
+    Call call(i) for i = 1, 2, ... until 'iterations' calls have been made or 'max_time' seconds have passed
+    (at least MIN_ITERATIONS calls are made). A first call, call(0), is made beforehand to open connections.
+
+    Return value:
+    Dictionary of the measurements. A call returning False counts as an error.
+    '''
+
+    call(0)
+
+    latencies = []
+    errors = 0
+    start = clock()
+    while len(latencies) < iterations:
+        before = clock()
+        if _consume(call(len(latencies) + 1)) is False:
+            errors += 1
+        latencies.append(clock() - before)
+        if len(latencies) >= MIN_ITERATIONS and clock() - start > max_time:
+            break
+    total = clock() - start
+
+    peak_memory = None
+    if tracemalloc is not None:
+        tracemalloc.start()
+        try:
+            result = _consume(call(len(latencies) + 1))
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            del result
+        finally:
+            tracemalloc.stop()
+
+    return _summary(latencies, errors, len(latencies) * calls_per_iteration / total if total > 0 else None, peak_memory)
+
+
+
+## Time a statement in fresh interpreters, so every import in it is made from scratch ##
+def measure_import(statement, iterations, max_time):
+
+    '''
+    Description:
+    Run the statement in a new interpreter 'iterations' times, or until 'max_time' seconds have passed
+    (at least MIN_ITERATIONS runs are made). Only the statement is timed, not the interpreter's start up.
+
+    Return value:
+    Dictionary of the measurements, as for measure(), with "requests_imported": whether the statement imported Requests.
+    '''
+
+    code = IMPORT_CODE % (ROOT_DIR, statement)
+    latencies = []
+    requests_imported = False
+    start = clock()
+    while len(latencies) < iterations:
+        elapsed, imported = subprocess.check_output([sys.executable, "-c", code]).decode("utf-8").split()
+        latencies.append(float(elapsed))
+        requests_imported = requests_imported or imported == "True"
+        if len(latencies) >= MIN_ITERATIONS and clock() - start > max_time:
+            break
+
+    result = _summary(latencies, 0, None, None)
+    result["requests_imported"] = requests_imported
+    return result
+
+
+
+## Latency percentiles and the other measurements of a benchmark ##
+def _summary(latencies, errors, throughput, peak_memory):
+    latencies.sort()
+    return {
+        "iterations": len(latencies),
+        "errors": errors,
+        "latency_ms": {
+            "min": latencies[0] * 1000,
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p90": percentile(latencies, 0.90) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": latencies[-1] * 1000,
+            "mean": sum(latencies) / len(latencies) * 1000,
+        },
+        "throughput": throughput,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+
+## Return a function calling a getter through RyuSwitch or ryufunc ##
+def _getter(module, method, function, arguments, API):
+    if module == "ryuswitch":
+        switch = RyuSwitch(1)
+        switch.API = API
+        return lambda i: getattr(switch, method)(*arguments)
+
+    ryufunc.API = API
+    if function == "get_switches":
+        return lambda i: ryufunc.get_switches()
+    return lambda i: getattr(ryufunc, function)(1, *arguments)
+
+
+
+## Return a function calling a setter through RyuSwitch or ryufunc ##
+def _setter(module, method, payload, API):
+    if module == "ryuswitch":
+        target = RyuSwitch(1)
+        target.API = API
+    else:
+        ryufunc.API = API
+        target = ryufunc
+
+    call = getattr(target, method)
+    if method == "delete_flow_all":
+        return lambda i: call() if module == "ryuswitch" else call(1)
+    if method == "send_experimenter" and module == "ryufunc":
+        return lambda i: call(1, payload(i))
+    return lambda i: call(payload(i))
+
+
+
+def run_getters(args, record):
+    for flows in args.sizes:
+        with MockServer(1, flows, args.latency) as mock:
+            for module in ("ryuswitch", "ryufunc"):
+                for method, function, arguments, sized in GETTERS:
+                    if not sized and flows != args.sizes[0]:
+                        continue
+                    name = method if module == "ryuswitch" else function
+                    if not args.selected(module, name):
+                        continue
+                    call = _getter(module, method, function, arguments, mock.API)
+                    record("getter", module, name, measure(call, args.iterations, args.max_time), flows=flows)
+
+
+
+def run_setters(args, record):
+    flows = args.sizes[0]
+    for module in ("ryuswitch", "ryufunc"):
+        # A fresh switch per module, so both start from the same flow table
+        with MockServer(1, flows, args.latency) as mock:
+            for method, payload in SETTERS:
+                if not args.selected(module, method):
+                    continue
+                call = _setter(module, method, payload, mock.API)
+                record("setter", module, method, measure(call, args.iterations, args.max_time), flows=flows)
+
+
+
+def run_bulk(args, record):
+    with MockServer(1, args.sizes[0], args.latency) as mock:
+        for module in ("ryuswitch", "ryufunc"):
+            if not args.selected(module, "add_flows"):
+                continue
+            for window in args.concurrency:
+                if module == "ryuswitch":
+                    target = RyuSwitch(1)
+                    target.API = mock.API
+                else:
+                    ryufunc.API = mock.API
+                    target = ryufunc
+
+                def call(i, target=target, window=window):
+                    payloads = [_flow(i * BULK_FLOWS + n) for n in range(BULK_FLOWS)]
+                    return all(target.add_flows(payloads, window=window)) or False
+
+                result = measure(call, max(MIN_ITERATIONS, args.iterations // 10), args.max_time, calls_per_iteration=BULK_FLOWS)
+                record("bulk", module, "add_flows", result, flows=BULK_FLOWS, concurrency=window)
+
+        # The same writes over pipelined connections
+        if args.selected("ryupipeline", "add_flows"):
+            for window in args.concurrency:
+                session = ryusession.RyuSession()
+                session.pipeline = PipelinedWriter()
+                target = RyuSwitch(1, session=session)
+                target.API = mock.API
+
+                def call(i, target=target, window=window):
+                    payloads = [_flow(i * BULK_FLOWS + n) for n in range(BULK_FLOWS)]
+                    return all(target.add_flows(payloads, window=window)) or False
+
+                try:
+                    result = measure(call, max(MIN_ITERATIONS, args.iterations // 10), args.max_time, calls_per_iteration=BULK_FLOWS)
+                finally:
+                    session.close()
+                record("bulk", "ryupipeline", "add_flows", result, flows=BULK_FLOWS, concurrency=window)
+
+
+
+def run_fanout(args, record):
+    for switches in args.switches:
+        with MockServer(switches, args.sizes[0], args.latency) as mock:
+            for workers in args.concurrency:
+                fleet = RyuFleet(API=mock.API, workers=workers)
+                try:
+                    for method in ("get_port_stats", "get_flows"):
+                        if not args.selected("ryufleet", method):
+                            continue
+
+                        def call(i, method=method):
+                            results, errors = fleet.run(method)
+                            return False if errors else results
+
+                        result = measure(call, args.iterations, args.max_time, calls_per_iteration=switches)
+                        record("fanout", "ryufleet", method, result, flows=args.sizes[0], switches=switches, concurrency=workers)
+                finally:
+                    fleet.close()
+
+
+
+def run_imports(args, record):
+    for name, statement in IMPORTS:
+        if args.selected("ryurest", name):
+            result = measure_import(statement, args.iterations, args.max_time)
+            record("import", "ryurest", name, result)
+            if result["requests_imported"] and name != "first_call":
+                print("  (imported Requests)")
+
+
+
+## Key identifying the same benchmark in two result files ##
+def _key(result):
+    return tuple(result.get(field) for field in ("benchmark", "module", "method", "flows", "switches", "concurrency"))
+
+
+
+## Return the benchmarks that got slower than an earlier run by more than 'threshold' (a fraction) ##
+def compare(results, baseline, threshold):
+    previous = dict((_key(result), result) for result in baseline["results"])
+    regressions = []
+    for result in results:
+        old = previous.get(_key(result))
+        if old is None:
+            continue
+        old_p50, new_p50 = old["latency_ms"]["p50"], result["latency_ms"]["p50"]
+        if old_p50 and new_p50 > old_p50 * (1 + threshold):
+            regressions.append((result, "p50 latency", old_p50, new_p50))
+        if old.get("throughput") and result.get("throughput") is not None and result["throughput"] < old["throughput"] / (1 + threshold):
+            regressions.append((result, "throughput", old["throughput"], result["throughput"]))
+    return regressions
+
+
+
+def _integers(text):
+    return tuple(int(value) for value in text.split(",") if value)
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ryurest against the mock Ryu REST API.")
+    parser.add_argument("--sizes", type=_integers, default=SIZES, help="flow table sizes, comma separated")
+    parser.add_argument("--switches", type=_integers, default=SWITCHES, help="switch counts for fan-out, comma separated")
+    parser.add_argument("--concurrency", type=_integers, default=CONCURRENCY, help="windows/workers, comma separated")
+    parser.add_argument("--iterations", type=int, default=ITERATIONS, help="calls per benchmark")
+    parser.add_argument("--max-time", type=float, default=MAX_TIME, help="seconds per benchmark before stopping early")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the mock adds to every reply")
+    parser.add_argument("--groups", default="getter,setter,bulk,fanout,import", help="benchmark groups to run, comma separated")
+    parser.add_argument("--only", default=None, help="only run benchmarks whose '<module>.<method>' matches this regular expression")
+    parser.add_argument("--quick", action="store_true", help="small sizes and few iterations")
+    parser.add_argument("--output", default="benchmark_results.json", help="file to write the results to")
+    parser.add_argument("--compare", default=None, help="earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2, help="fraction a benchmark may get slower before it is a regression")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        for option, value in QUICK.items():
+            if getattr(args, option) == parser.get_default(option):
+                setattr(args, option, value)
+
+    only = re.compile(args.only) if args.only else None
+    args.selected = lambda module, method: only is None or only.search(module + "." + method) is not None
+
+    results = []
+
+    def record(benchmark, module, method, result, flows=None, switches=1, concurrency=1):
+        result.update({
+            "benchmark": benchmark, "module": module, "method": method,
+            "flows": flows, "switches": switches, "concurrency": concurrency,
+        })
+        results.append(result)
+        print("%-7s %-10s %-22s flows=%-7s switches=%-3d concurrency=%-3d p50=%9.3fms p99=%9.3fms %10.1f/s  peak=%s  errors=%d" % (
+            benchmark, module, method, flows, switches, concurrency,
+            result["latency_ms"]["p50"], result["latency_ms"]["p99"], result["throughput"] or 0,
+            "-" if result["peak_memory_bytes"] is None else "%.1fKB" % (result["peak_memory_bytes"] / 1024.0),
+            result["errors"],
+        ))
+        sys.stdout.flush()
+
+    groups = {"getter": run_getters, "setter": run_setters, "bulk": run_bulk, "fanout": run_fanout, "import": run_imports}
+    for group in args.groups.split(","):
+        groups[group](args, record)
+
+    output = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "host": socket.gethostname(),
+            "parameters": {
+                "sizes": list(args.sizes), "switches": list(args.switches), "concurrency": list(args.concurrency),
+                "iterations": args.iterations, "max_time": args.max_time, "latency": args.latency,
+            },
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2, sort_keys=True)
+    print("Results written to " + args.output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for result, measurement, old, new in regressions:
+            print("REGRESSION: %s %s.%s flows=%s switches=%s concurrency=%s %s %.3f -> %.3f" % (
+                result["benchmark"], result["module"], result["method"], result["flows"], result["switches"],
+                result["concurrency"], measurement, old, new,
+            ))
+        if regressions:
+            return 1
+        print("No regressions against " + args.compare)
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
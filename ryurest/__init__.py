@@ -0,0 +1,109 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##                 PACKAGE ENTRY POINT             ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This is the entry point of the ryurest package. It exposes RyuSwitch, the ryufunc module and the other modules,
+#   but only imports each one the first time it is used, so importing the package costs next to nothing.
+#   Importing RyuSwitch or ryufunc does not import Requests either: it is imported when the first call is made.
+
+### USAGE INSTRUCTIONS ###
+#   >> from ryurest import RyuSwitch
+#   >> from ryurest import ryufunc
+#
+#   Or:
+#   >> import ryurest
+#   >> switch1 = ryurest.RyuSwitch( DPID )
+#   >> DPID_list = ryurest.ryufunc.get_switches()
+
+
+import importlib
+import sys
+
+__version__ = "1.0.0"
+
+
+### CLASSES ###
+#   Name -> module it is imported from, when first used.
+CLASSES = {
+    "RyuSwitch": "ryuswitch",
+    "RyuSession": "ryusession",
+    "RyuCache": "ryucache",
+    "RyuFleet": "ryufleet",
+    "RyuRegistry": "ryuregistry",
+    "FlowTemplate": "ryutemplate",
+}
+
+### MODULES ###
+#   Modules of the package, imported when first used.
+MODULES = (
+    "ryuanalyze", "ryuasync", "ryucache", "ryucodec", "ryucolumns", "ryuendpoints", "ryuexporter", "ryufleet",
+    "ryuflows", "ryufunc", "ryuindex", "ryulookup", "ryumetrics", "ryumock", "ryupipeline", "ryupolicy",
+    "ryurates", "ryureconcile", "ryuregistry", "ryuscheduler", "ryusession", "ryustream", "ryuswitch", "ryutemplate",
+)
+
+__all__ = ["RyuSwitch", "RyuSession", "ryufunc", "ryuswitch", "ryusession"]
+
+
+
+## Import a class or module of the package the first time it is used (PEP 562) ##
+def __getattr__(name):
+    if name in CLASSES:
+        value = getattr(importlib.import_module("." + CLASSES[name], __name__), name)
+    elif name in MODULES:
+        value = importlib.import_module("." + name, __name__)
+    else:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    # Later uses find it without coming back here
+    setattr(sys.modules[__name__], name, value)
+    return value
+
+
+
+def __dir__():
+    return sorted(set(globals()) | set(CLASSES) | set(MODULES))
+
+
+
+# Module __getattr__ is only used from Python 3.7 on. Before that, the package is given a module class that has one.
+if sys.version_info < (3, 7):
+    import types
+
+    class _LazyModule(types.ModuleType):
+
+        def __getattr__(self, name):
+            return _getattr(name)
+
+        def __dir__(self):
+            return _dir()
+
+    _getattr, _dir = __getattr__, __dir__
+
+    if sys.version_info >= (3, 5):
+        sys.modules[__name__].__class__ = _LazyModule
+    else:
+        # The class of a module cannot be changed in Python 2, so the package module is replaced.
+        # The original is kept alive: its globals are cleared when it is deleted.
+        _module = _LazyModule(__name__)
+        _module.__dict__.update(globals())
+        _module._original = sys.modules[__name__]
+        sys.modules[__name__] = _module
@@ -0,0 +1,364 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##              FLOW ANALYSIS MODULE               ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides FlowAnalysis, which finds the flows of a flow table that waste space or may not do what was intended.
+#   Within each table_id:
+#       * Shadowed: the flow can never be hit, because a single higher priority flow matches every packet it matches,
+#         and that flow has different actions. Usually a mistake.
+#       * Redundant: removing the flow changes nothing. Either a higher priority flow with the same actions matches every
+#         packet it matches, or a lower priority flow with the same actions does and no flow in between could take its packets.
+#       * Overlapping: a flow of higher (or equal) priority with different actions matches some, but not all, of its packets.
+#         Only the highest priority such flow is reported for each flow.
+#   Shadowed and redundant flows can be removed with the delete_flow_strict() plan returned by plan().
+#
+#   Flows are grouped by the set of fields and masks they match on, and each group is hashed by its match values.
+#   The flows covering or overlapping a flow are then found with one hash lookup per group, instead of comparing every
+#   pair of flows. The time taken grows with the number of flows times the number of distinct groups, which stays small
+#   (tens) in practice, so tables of 100,000+ flows are analysed in seconds.
+#   Flows covered only by several higher priority flows together (but by none alone) are not detected.
+
+### USAGE INSTRUCTIONS ###
+#   1. Analyse the flow table of a switch:
+#           >> analysis = FlowAnalysis.from_flows(switch1.get_flows())
+#           >> print len(analysis.shadowed), len(analysis.redundant), len(analysis.overlapping)
+#      * A list of flows or a FlowTable may also be given: FlowAnalysis(switch1.get_flow_table(), DPID)
+#
+#   2. Each finding is a pair of (flow, flow that causes it):
+#           >> for flow, by in analysis.shadowed:
+#           ..     print flow["priority"], flow["match"], "is shadowed by", by["priority"], by["match"]
+#
+#   3. Remove the flows that can never be hit or are not needed:
+#           >> plan = analysis.plan()
+#           >> switch1.delete_flows(plan, strict=True)
+
+
+import bisect
+
+try:
+    from . import ryureconcile
+    from . import ryulookup
+except (ImportError, ValueError):
+    import ryureconcile
+    import ryulookup
+
+
+# int and long in Python 2, int in Python 3
+_INTEGERS = (int, type(2 ** 64))
+
+
+
+class _Rule(object):
+
+    '''
+    A parsed flow.
+    '''
+
+    __slots__ = ("flow", "priority", "actions", "fields", "order")
+
+    def __init__(self, flow, order):
+        self.flow = flow
+        self.priority = int(flow.get("priority", ryureconcile.DEFAULTS["priority"]))
+        self.actions = tuple(ryureconcile._action(action) for action in flow.get("actions") or ())
+        self.order = order
+
+        # Field -> (value, mask). mask is None for an exact match.
+        self.fields = {}
+        for field, value in (flow.get("match") or {}).items():
+            value, mask, _ = ryulookup.match_value(value)
+            self.fields[ryureconcile.MATCH_ALIASES.get(field, field)] = (value, mask)
+
+
+
+## Mask of the bits two masks both match on. None means every bit ##
+def _common(mask, other):
+    if mask is None:
+        return other
+    if other is None:
+        return mask
+    return mask & other
+
+
+
+## Mask a value, or None if it cannot be masked ##
+def _masked(value, mask):
+    if mask is None:
+        return value
+    if not isinstance(value, _INTEGERS):
+        return None
+    return value & mask
+
+
+
+class _Group(object):
+
+    '''
+    Flows of one table matching on the same fields with the same masks, hashed by their match values.
+    '''
+
+    def __init__(self, signature):
+        # ((field, mask), ...), sorted by field
+        self.signature = signature
+
+        # Tuple of match values -> rules, highest priority first
+        self.rules = {}
+
+        # Tuple of (field, mask) projections -> projected values -> (negated priorities, rules), highest priority first
+        self._projections = {}
+
+
+
+    def add(self, rule):
+        key = tuple(rule.fields[field][0] for field, _ in self.signature)
+        self.rules.setdefault(key, []).append(rule)
+
+
+
+    def sort(self):
+        for rules in self.rules.values():
+            rules.sort(key=_rank)
+
+
+
+    ## Return the rules of this group matching every packet the rule matches ##
+    def covering(self, rule):
+        key = []
+        for field, mask in self.signature:
+            if field not in rule.fields:
+                return ()
+            value, rule_mask = rule.fields[field]
+            # The rule must match on every bit this group matches on
+            if mask is None:
+                if rule_mask is not None:
+                    return ()
+            elif rule_mask is not None and mask & ~rule_mask:
+                return ()
+            value = _masked(value, mask)
+            if value is None:
+                return ()
+            key.append(value)
+        return self.rules.get(tuple(key), ())
+
+
+
+    ## Return (negated priorities, rules) of this group that match some packet the rule matches ##
+    def overlapping(self, rule):
+        projection = []
+        key = []
+        for index, (field, mask) in enumerate(self.signature):
+            if field not in rule.fields:
+                # Any value of the rule's packets can match this group's value
+                continue
+            value, rule_mask = rule.fields[field]
+            common = _common(mask, rule_mask)
+            value = _masked(value, common)
+            if value is None:
+                return (), ()
+            projection.append((index, common))
+            key.append(value)
+
+        projection = tuple(projection)
+        projected = self._projections.get(projection)
+        if projected is None:
+            projected = self._projections[projection] = self._project(projection)
+        return projected.get(tuple(key), ((), ()))
+
+
+
+    ## Hash the rules of this group by the values of some of their fields, under the given masks ##
+    def _project(self, projection):
+        projected = {}
+        for values, rules in self.rules.items():
+            key = []
+            for index, mask in projection:
+                value = _masked(values[index], mask)
+                if value is None:
+                    break
+                key.append(value)
+            else:
+                projected.setdefault(tuple(key), []).extend(rules)
+
+        for key, rules in projected.items():
+            rules.sort(key=_rank)
+            projected[key] = ([-rule.priority for rule in rules], rules)
+        return projected
+
+
+
+## Highest priority first, then in the order given ##
+def _rank(rule):
+    return (-rule.priority, rule.order)
+
+
+
+class FlowAnalysis(object):
+
+    def __init__(self, flows=(), DPID=None):
+        # DPID of the switch the flows were read from
+        self.DPID = DPID
+
+        # Lists of (flow, flow that causes the finding)
+        self.shadowed = []
+        self.redundant = []
+        self.overlapping = []
+
+        tables = {}
+        for order, flow in enumerate(flows):
+            table_id = int(flow.get("table_id", ryureconcile.DEFAULTS["table_id"]))
+            tables.setdefault(table_id, []).append(_Rule(flow, order))
+
+        for table_id in sorted(tables):
+            self._analyse(tables[table_id])
+
+
+
+    ## Analyse the flow table in the result of get_flows() ##
+    @classmethod
+    def from_flows(cls, flows):
+
+        '''
+        Description:
+        Analyse the flows in the dictionary returned by get_flows().
+
+        Arguments:
+        flows: Return value of get_flows(), e.g. {"123917682136708": [ {flow}, {flow}, ... ]}
+
+        Return value:
+        FlowAnalysis of the flows of the (first) switch in the dictionary.
+
+        Usage:
+        analysis = FlowAnalysis.from_flows(switch1.get_flows())
+        '''
+
+        for DPID, entries in flows.items():
+            return cls(entries, DPID)
+        return cls()
+
+
+
+    def _analyse(self, rules):
+        groups = {}
+        for rule in rules:
+            signature = tuple(sorted((field, mask) for field, (_, mask) in rule.fields.items()))
+            group = groups.get(signature)
+            if group is None:
+                group = groups[signature] = _Group(signature)
+            group.add(rule)
+        groups = list(groups.values())
+        for group in groups:
+            group.sort()
+
+        # Walk the flows from the highest priority down. A flow found to be shadowed or redundant is planned for removal,
+        # so it cannot cover (or be the fallback of) a lower priority flow: of two identical flows, only one is removed.
+        removed = set()
+        shadowed, redundant, overlapping = [], [], []
+        for rule in sorted(rules, key=_rank):
+            covering = []
+            for group in groups:
+                covering.extend(other for other in group.covering(rule) if other is not rule and other.order not in removed)
+
+            # Dead: a higher priority flow takes every packet
+            above = [other for other in covering if other.priority > rule.priority]
+            if above:
+                same = [other for other in above if other.actions == rule.actions]
+                if same:
+                    redundant.append((rule.order, rule.flow, min(same, key=_rank).flow))
+                else:
+                    shadowed.append((rule.order, rule.flow, min(above, key=_rank).flow))
+                removed.add(rule.order)
+                continue
+
+            # Not needed: the closest lower priority flow with the same actions would take its packets anyway
+            below = [other for other in covering if other.priority < rule.priority and other.actions == rule.actions]
+            if below:
+                fallback = min(below, key=_rank)
+                if self._conflict(groups, rule, fallback.priority, rule.priority, fallback) is None:
+                    redundant.append((rule.order, rule.flow, fallback.flow))
+                    removed.add(rule.order)
+                    continue
+
+            # Partly taken by a flow of higher or equal priority with other actions
+            other = self._conflict(groups, rule, rule.priority, None, None)
+            if other is not None:
+                overlapping.append((rule.order, rule.flow, other.flow))
+
+        # Findings are listed in the order the flows were given
+        for findings, found in ((self.shadowed, shadowed), (self.redundant, redundant), (self.overlapping, overlapping)):
+            findings.extend((flow, by) for _, flow, by in sorted(found, key=lambda finding: finding[0]))
+
+
+
+    ## Highest priority flow with other actions overlapping the rule, with low <= priority (< high) ##
+    def _conflict(self, groups, rule, low, high, ignore):
+        found = None
+        for group in groups:
+            priorities, others = group.overlapping(rule)
+            start = 0 if high is None else bisect.bisect_right(priorities, -high)
+            end = bisect.bisect_right(priorities, -low)
+            for index in range(start, end):
+                other = others[index]
+                if other is rule or other is ignore or other.actions == rule.actions:
+                    continue
+                if found is None or _rank(other) < _rank(found):
+                    found = other
+                break
+        return found
+
+
+
+    ## Number of flows that can be removed ##
+    def __len__(self):
+        return len(self.shadowed) + len(self.redundant)
+
+
+
+    ## Return the delete_flow_strict() payloads removing shadowed and redundant flows ##
+    def plan(self, shadowed=True, redundant=True):
+
+        '''
+        Description:
+        Return the payloads to remove the flows that are never hit (shadowed) or not needed (redundant).
+
+        Arguments:
+        shadowed: [OPTIONAL] Include shadowed flows.
+        redundant: [OPTIONAL] Include redundant flows.
+
+        Return value:
+        List of payloads for delete_flow_strict() (or delete_flows(payloads, strict=True)).
+
+        Usage:
+        analysis = FlowAnalysis.from_flows(switch1.get_flows())
+        switch1.delete_flows(analysis.plan(), strict=True)
+        '''
+
+        findings = (self.shadowed if shadowed else []) + (self.redundant if redundant else [])
+        plan = []
+        for flow, _ in findings:
+            payload = {
+                "table_id": flow.get("table_id", ryureconcile.DEFAULTS["table_id"]),
+                "priority": flow.get("priority", ryureconcile.DEFAULTS["priority"]),
+                "match": flow.get("match") or {},
+            }
+            if self.DPID is not None:
+                payload["dpid"] = self.DPID
+            plan.append(payload)
+        return plan
@@ -0,0 +1,626 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##                  ASYNCIO MODULE                 ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### RYU REST API DOCUMENTATION ###
+#   http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html
+
+### ABOUT ###
+#   This a Python module that provides non-blocking (asyncio) access to the Ryu REST API.
+#   It offers the same methods as the ryuswitch module (AsyncRyuSwitch) and the same functions as the ryufunc module,
+#   except that every method/function must be awaited.
+#   All calls share one pool of keep-alive connections, and the number of calls in flight to each controller is bounded.
+
+### REQUIREMENTS ###
+#   Python 3.5+
+#   "aiohttp" library: https://docs.aiohttp.org/
+#   Install using: pip install aiohttp
+
+### USAGE INSTRUCTIONS ###
+#   1. Import this module into your script, for example:
+#      >> from ryurest import ryuasync
+#
+#   2. Use AsyncRyuSwitch exactly as you would a RyuSwitch, awaiting each call:
+#      >> switch1 = ryuasync.AsyncRyuSwitch( DPID )
+#      >> flows = await switch1.get_flows()
+#
+#      Or use the functions exactly as you would the ryufunc functions:
+#      >> ryuasync.API = "http://192.168.1.30:8080"
+#      >> flows = await ryuasync.get_flows( DPID )
+#
+#   3. Run many calls at once with asyncio.gather(). For example:
+#      >> stats = await asyncio.gather(*[ryuasync.get_port_stats(DPID) for DPID in DPID_list])
+#
+#   4. [OPTIONAL] Change the maximum number of calls in flight to a controller (default: CONCURRENCY):
+#      >> ryuasync.SESSION.set_concurrency("http://192.168.1.30:8080", 500)
+#      * Calls above this limit wait for a free slot instead of opening more connections.
+#
+#   5. Close the pooled connections before the event loop stops:
+#      >> await ryuasync.SESSION.close()
+#      * Connections and concurrency limits belong to the event loop they were made in. A session can be used from
+#        several event loops (e.g. one asyncio.run() after another): each loop gets its own.
+#      * asyncio.run() closes the connections of its loop when it returns, if they were not closed before.
+#
+#   6. [OPTIONAL] Choose the JSON backend, as for ryusession. See ryucodec.py for more info.
+#      >> ryuasync.SESSION.codec = ryucodec.get("ujson")
+#
+#   7. Return Formats
+#       * Identical to the ryuswitch and ryufunc modules.
+
+
+import asyncio
+from urllib.parse import urlsplit
+
+# Use aiohttp library (required)
+import aiohttp
+
+try:
+    from . import ryucodec, ryuendpoints
+except (ImportError, ValueError):
+    import ryucodec
+    import ryuendpoints
+
+
+### API PATH ###
+#   To alter, once this module has been imported use in your script, override this by setting:
+#       >> ryuasync.API = "http://<hostname_or_ip>:<port>"
+#   Warning: DO NOT add a trailing '/' at the end or API will fail.
+API = "http://localhost:8080"
+
+### DEFAULT CONCURRENCY ###
+#   Maximum number of calls in flight to a single controller URL.
+CONCURRENCY = 100
+
+# asyncio.get_running_loop() is only available from Python 3.7
+_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+
+
+class AsyncRyuSession(object):
+
+    def __init__(self, concurrency=CONCURRENCY, codec=None):
+        # Default number of in-flight calls per controller
+        self.concurrency = concurrency
+
+        # ryucodec.Codec encoding payloads and decoding responses. None uses the fastest installed backend.
+        self.codec = codec
+
+        # Controller -> concurrency, for controllers with their own setting
+        self.concurrencies = {}
+
+        # aiohttp sessions and asyncio semaphores can only be used in the event loop they were created in,
+        # so each event loop gets its own, created on first use. A session refers to its loop, so these cannot be
+        # weak: a session is closed by its loop's shutdown (see _closer()), and dropped once its loop is closed.
+        # Event loop -> aiohttp.ClientSession
+        self._sessions = {}
+
+        # Event loop -> {controller -> asyncio.Semaphore bounding its in-flight calls}
+        self._semaphores = {}
+
+        # Event loop -> async generator closing its session when asyncio.run() shuts the loop down
+        self._closers = {}
+
+
+
+    ## Return the "scheme://host:port" part of a URI ##
+    @staticmethod
+    def _controller(rest_uri):
+        parts = urlsplit(rest_uri)
+        return parts.scheme + "://" + parts.netloc
+
+
+
+    ## Set the maximum number of in-flight calls for a single controller ##
+    def set_concurrency(self, API, concurrency):
+
+        '''
+        Description:
+        Set the maximum number of calls in flight to a single Ryu controller at once.
+
+        Arguments:
+        API: Base REST API URI of the controller, e.g. "http://192.168.1.30:8080" (no trailing '/').
+        concurrency: Maximum number of concurrent calls. Further calls wait until one completes.
+
+        Return value:
+        None.
+
+        Usage:
+        ryuasync.SESSION.set_concurrency("http://192.168.1.30:8080", 500)
+        '''
+
+        controller = self._controller(API)
+        self.concurrencies[controller] = concurrency
+        for semaphores in list(self._semaphores.values()):
+            semaphores.pop(controller, None)
+
+
+
+    def _semaphore(self, loop, controller):
+        semaphores = self._semaphores.setdefault(loop, {})
+        semaphore = semaphores.get(controller)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrencies.get(controller, self.concurrency))
+            semaphores[controller] = semaphore
+        return semaphore
+
+
+
+    ## Make a call to the REST API over a pooled connection ##
+    async def request(self, method, rest_uri, **kwargs):
+
+        '''
+        Description:
+        Make an HTTP request to the Ryu REST API, re-using a pooled connection where possible.
+
+        Arguments:
+        method: HTTP method, e.g. "GET", "POST" or "DELETE".
+        rest_uri: Full URI of the REST API call.
+        kwargs: Passed through to aiohttp (e.g. json=).
+
+        Return value:
+        Tuple of (HTTP status code, response body as bytes).
+        '''
+
+        payload = kwargs.get("json")
+        if payload is not None:
+            # Encode the payload with the session's codec, as RyuSession does, instead of aiohttp's json.dumps
+            if not isinstance(payload, bytes):
+                payload = self._codec().dumps(payload)
+            headers = dict(kwargs.get("headers") or {}, **{"Content-Type": "application/json"})
+            kwargs = dict(kwargs, data=payload, headers=headers)
+            del kwargs["json"]
+
+        loop = _running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            # Loops closed without asyncio.run() (e.g. loop.close()) never shut their session down
+            for other in [other for other in self._sessions if other.is_closed()]:
+                _abandon(self._forget(other))
+
+            # Connections are bounded per controller by the semaphores, not by the connector.
+            session = self._sessions[loop] = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0))
+            closer = self._closers[loop] = self._closer(loop, session)
+            await closer.asend(None)
+
+        async with self._semaphore(loop, self._controller(rest_uri)):
+            async with session.request(method, rest_uri, **kwargs) as r:
+                return r.status, await r.read()
+
+
+
+    def _codec(self):
+        codec = self.codec
+        if codec is None:
+            codec = self.codec = ryucodec.default()
+        return codec
+
+
+
+    ## Decode the JSON body of a response ##
+    def decode(self, content):
+        return self._codec().loads(content)
+
+
+
+    ## Close a loop's session when the loop shuts down its async generators, as asyncio.run() does before closing it ##
+    async def _closer(self, loop, session):
+        try:
+            yield
+        finally:
+            if self._sessions.get(loop) is session:
+                self._forget(loop)
+            await session.close()
+
+
+
+    ## Drop everything kept for an event loop, and return its session ##
+    def _forget(self, loop):
+        self._semaphores.pop(loop, None)
+        self._closers.pop(loop, None)
+        return self._sessions.pop(loop)
+
+
+
+    ## Close the pooled connections of every event loop ##
+    async def close(self):
+        loop = _running_loop()
+        for other in list(self._sessions):
+            session = self._forget(other)
+            if other is loop:
+                await session.close()
+            elif other.is_running():
+                # Another thread's loop: close it there
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), other))
+            else:
+                _abandon(session)
+
+
+
+## Close a session whose event loop is not running, without awaiting it ##
+def _abandon(session):
+    connector = session.connector
+    session.detach()
+    if connector is not None:
+        # Closes the connections if the loop is still open, otherwise only marks the connector closed
+        connector._close()
+
+
+
+### SHARED SESSION ###
+#   Used by every AsyncRyuSwitch object and function in this module unless another session is given.
+SESSION = AsyncRyuSession()
+
+
+
+class AsyncRyuSwitch(object):
+
+    '''
+    Awaitable counterpart of ryuswitch.RyuSwitch.
+    Every method takes the same arguments and returns the same values as the RyuSwitch method of the same name.
+    '''
+
+    def __init__(self, DPID=None, session=None):
+        # Set switch DPID
+        self.DPID = DPID
+
+        ### HTTP Session ###
+        # All calls share the pooled connections of ryuasync.SESSION unless another AsyncRyuSession is given.
+        self.session = session if session is not None else SESSION
+
+        ### Base REST API URI ###
+        # Warning: DO NOT add a trailing '/' at the end or API will fail.
+        self.API = "http://localhost:8080"
+
+
+
+    ## Make a call to an endpoint of ryuendpoints.ENDPOINTS, and return its result as the RyuSwitch methods do ##
+    async def _call(self, endpoint, values=(), openflow=None, filters=None, payload=None):
+        endpoint = ryuendpoints.ENDPOINTS[endpoint]
+        method, rest_uri, kwargs = endpoint.prepare(self.API, self.DPID, values, openflow, filters, payload)
+        status, content = await self.session.request(method, rest_uri, **kwargs)
+        return endpoint.result(status, content, self.session.decode)
+
+
+
+    #########################################
+    ###     GET DATA FROM THE SWITCH      ###
+    #########################################
+
+    async def get_switches(self):
+        '''Get the list of all switch DPIDs that are connected to the controller.'''
+        return await self._call("switches")
+
+
+
+    async def get_stats(self):
+        '''Get the desc stats of the switch.'''
+        return await self._call("desc")
+
+
+
+    # Same as get_stats(), under the name used by ryufunc
+    get_switch_stats = get_stats
+
+
+
+    async def get_flows(self, filters={}):
+        '''Get all flows stats of the switch. Optionally give a filter.'''
+        return await self._call("flow", filters=filters)
+
+
+
+    async def get_flow_stats(self, filters={}):
+        '''Get aggregate flow stats of the switch. Optionally give a filter.'''
+        return await self._call("aggregateflow", filters=filters)
+
+
+
+    async def get_table_stats(self):
+        '''Get table stats of the switch.'''
+        return await self._call("table")
+
+
+
+    async def get_table_features(self):
+        '''Get table features of the switch.'''
+        return await self._call("tablefeatures")
+
+
+
+    async def get_port_stats(self, port=None):
+        '''Get ports stats of the switch. Filtering by port is disabled, as in RyuSwitch.get_port_stats().'''
+        return await self._call("port")
+
+
+
+    async def get_port_description(self, port=None, openflow=None):
+        '''Get ports description of the switch. Filtering by port requires OpenFlow v1.5+.'''
+        return await self._call("portdesc", values=(port,), openflow=openflow)
+
+
+
+    async def get_queue_stats(self, port=None, queue=None):
+        '''Get queues stats of the switch, optionally for one port and/or queue ID.'''
+        return await self._call("queue", values=(port, queue))
+
+
+
+    async def get_queue_config(self, port=None):
+        '''Get queues config of the switch. OpenFlow v1.0 - v1.3 ONLY.'''
+        return await self._call("queueconfig", values=(port,))
+
+
+
+    async def get_queue_description(self, port=None, queue=None):
+        '''Get queues description of the switch, optionally for one port and/or queue ID. OpenFlow v1.4+ ONLY.'''
+        return await self._call("queuedesc", values=(port, queue))
+
+
+
+    async def get_group_stats(self, group=None):
+        '''Get groups stats of the switch, optionally for one group ID.'''
+        return await self._call("group", values=(group,))
+
+
+
+    async def get_group_description(self, group=None, openflow=None, port=None):
+        '''Get group description stats of the switch. Filtering by group ID requires OpenFlow v1.5+.'''
+        return await self._call("groupdesc", values=(group if group is not None else port,), openflow=openflow)
+
+
+
+    async def get_group_features(self):
+        '''Get group features stats of the switch.'''
+        return await self._call("groupfeatures")
+
+
+
+    async def get_meter_stats(self, meter=None):
+        '''Get meters stats of the switch, optionally for one meter ID.'''
+        return await self._call("meter", values=(meter,))
+
+
+
+    async def get_meter_description(self, meter=None, openflow=1.0):
+        '''Get meter config (OpenFlow v1.0 - v1.4) or meter desc (OpenFlow v1.5+) stats of the switch.'''
+        return await self._call("meterconfig", values=(meter,), openflow=openflow)
+
+
+
+    async def get_meter_features(self):
+        '''Get meter features stats of the switch.'''
+        return await self._call("meterfeatures")
+
+
+
+    async def get_role(self):
+        '''Disabled due to RYU bug in REST API (404 error), as in RyuSwitch.get_role().'''
+        return None
+
+
+
+    #########################################
+    ###       SET DATA ON THE SWITCH      ###
+    #########################################
+
+    async def add_flow(self, payload):
+        '''Add a flow entry to the switch. DPID of target is specified in payload.'''
+        return await self._call("flowentry/add", payload=payload)
+
+
+
+    async def modify_flow(self, payload):
+        '''Modify ** ALL ** matching flow entries of the switch.'''
+        return await self._call("flowentry/modify", payload=payload)
+
+
+
+    async def modify_flow_strict(self, payload):
+        '''Modify flow entry strictly matching wildcards and priority.'''
+        return await self._call("flowentry/modify_strict", payload=payload)
+
+
+
+    async def delete_flow(self, payload):
+        '''Delete ** ALL ** matching flow entries of the switch.'''
+        return await self._call("flowentry/delete", payload=payload)
+
+
+
+    async def delete_flow_strict(self, payload):
+        '''Delete flow entry strictly matching wildcards and priority.'''
+        return await self._call("flowentry/delete_strict", payload=payload)
+
+
+
+    async def delete_flow_all(self):
+        '''Delete ** ALL ** flow entries of the switch.'''
+        return await self._call("flowentry/clear")
+
+
+
+    async def add_group(self, payload):
+        '''Add a group entry to the switch.'''
+        return await self._call("groupentry/add", payload=payload)
+
+
+
+    async def modify_group(self, payload):
+        '''Modify a group entry of the switch.'''
+        return await self._call("groupentry/modify", payload=payload)
+
+
+
+    async def delete_group(self, payload):
+        '''Delete a group entry of the switch.'''
+        return await self._call("groupentry/delete", payload=payload)
+
+
+
+    async def modify_port(self, payload):
+        '''Modify the behaviour of a physical port.'''
+        return await self._call("portdesc/modify", payload=payload)
+
+
+
+    async def add_meter(self, payload):
+        '''Add a meter entry to the switch.'''
+        return await self._call("meterentry/add", payload=payload)
+
+
+
+    async def modify_meter(self, payload):
+        '''Modify a meter entry of the switch.'''
+        return await self._call("meterentry/modify", payload=payload)
+
+
+
+    async def delete_meter(self, payload):
+        '''Delete a meter entry of the switch.'''
+        return await self._call("meterentry/delete", payload=payload)
+
+
+
+    async def modify_role(self, payload):
+        '''Modify the role of the switch.'''
+        return await self._call("role", payload=payload)
+
+
+
+    async def send_experimenter(self, payload):
+        '''Send a experimenter message to the switch.'''
+        return await self._call("experimenter", payload=payload)
+
+
+
+#########################################
+###   FUNCTIONAL (ryufunc) VERSIONS   ###
+#########################################
+
+# Each function below takes the same arguments and returns the same values as the ryufunc function of the same name.
+
+def _switch(DPID=None):
+    switch = AsyncRyuSwitch(DPID, session=SESSION)
+    switch.API = API
+    return switch
+
+
+
+async def get_switches():
+    return await _switch().get_switches()
+
+async def get_switch_stats(DPID):
+    return await _switch(DPID).get_stats()
+
+get_stats = get_switch_stats
+
+async def get_flows(DPID, filters={}):
+    return await _switch(DPID).get_flows(filters)
+
+async def get_flow_stats(DPID, filters={}):
+    return await _switch(DPID).get_flow_stats(filters)
+
+async def get_table_stats(DPID):
+    return await _switch(DPID).get_table_stats()
+
+async def get_table_features(DPID):
+    return await _switch(DPID).get_table_features()
+
+async def get_port_stats(DPID, port=None):
+    return await _switch(DPID).get_port_stats(port)
+
+async def get_port_description(DPID, port=None, openflow=None):
+    return await _switch(DPID).get_port_description(port, openflow)
+
+async def get_queue_stats(DPID, port=None, queue=None):
+    return await _switch(DPID).get_queue_stats(port, queue)
+
+async def get_queue_config(DPID, port=None):
+    return await _switch(DPID).get_queue_config(port)
+
+async def get_queue_description(DPID, port=None, queue=None):
+    return await _switch(DPID).get_queue_description(port, queue)
+
+async def get_group_stats(DPID, group=None):
+    return await _switch(DPID).get_group_stats(group)
+
+async def get_group_description(DPID, group=None, openflow=None, port=None):
+    return await _switch(DPID).get_group_description(group, openflow, port)
+
+async def get_group_features(DPID):
+    return await _switch(DPID).get_group_features()
+
+async def get_meter_stats(DPID, meter=None):
+    return await _switch(DPID).get_meter_stats(meter)
+
+async def get_meter_description(DPID, meter=None, openflow=1.0):
+    return await _switch(DPID).get_meter_description(meter, openflow)
+
+async def get_meter_features(DPID):
+    return await _switch(DPID).get_meter_features()
+
+async def get_role(DPID):
+    return await _switch(DPID).get_role()
+
+async def add_flow(payload):
+    return await _switch().add_flow(payload)
+
+async def modify_flow(payload):
+    return await _switch().modify_flow(payload)
+
+async def modify_flow_strict(payload):
+    return await _switch().modify_flow_strict(payload)
+
+async def delete_flow(payload):
+    return await _switch().delete_flow(payload)
+
+async def delete_flow_strict(payload):
+    return await _switch().delete_flow_strict(payload)
+
+async def delete_flow_all(DPID):
+    return await _switch(DPID).delete_flow_all()
+
+async def add_group(payload):
+    return await _switch().add_group(payload)
+
+async def modify_group(payload):
+    return await _switch().modify_group(payload)
+
+async def delete_group(payload):
+    return await _switch().delete_group(payload)
+
+async def modify_port(payload):
+    return await _switch().modify_port(payload)
+
+async def add_meter(payload):
+    return await _switch().add_meter(payload)
+
+async def modify_meter(payload):
+    return await _switch().modify_meter(payload)
+
+async def delete_meter(payload):
+    return await _switch().delete_meter(payload)
+
+async def modify_role(payload):
+    return await _switch().modify_role(payload)
+
+async def send_experimenter(DPID, payload):
+    return await _switch(DPID).send_experimenter(payload)
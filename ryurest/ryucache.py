@@ -0,0 +1,261 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##              RESPONSE CACHE MODULE              ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides RyuCache, an opt-in cache for the responses of the read-only (GET) REST API calls.
+#   Each endpoint has its own time-to-live: switch features and descriptions are kept until invalidated,
+#   counters only for a second or so. The cache holds a bounded number of responses and evicts the least recently used.
+#   When an add/modify/delete call succeeds, the cached flow, group, meter or port entries of that DPID are dropped.
+#   A GET still in flight when its DPID is invalidated is not cached when it returns, as it may have been read before the write.
+
+### USAGE INSTRUCTIONS ###
+#   1. Attach a cache to a session. Every RyuSwitch object and ryufunc function using that session is then cached:
+#           >> ryusession.SESSION.cache = RyuCache()
+#      * Or only for some switches:
+#           >> session = ryusession.RyuSession(cache=RyuCache())
+#           >> switch1 = RyuSwitch( DPID, session=session )
+#
+#   2. [OPTIONAL] Change the time-to-live (in seconds) of some endpoints. FOREVER keeps a response until it is invalidated, 0 disables caching:
+#           >> cache = RyuCache(max_entries=5000, ttl={"port": 5, "flow": 0})
+#
+#   3. [OPTIONAL] Drop cached responses explicitly:
+#           >> cache.invalidate()                               # Everything
+#           >> cache.invalidate(DPID)                           # Everything for one switch
+#           >> cache.invalidate(DPID, endpoints=["flow"])       # Only the flow table of one switch
+
+
+import threading
+import time
+from collections import OrderedDict
+
+
+### NEVER EXPIRE ###
+FOREVER = None
+
+### DEFAULT TIME-TO-LIVE PER ENDPOINT (seconds) ###
+#   Keyed by the REST API path segment after /stats/. Endpoints not listed here are not cached.
+TTL = {
+    # Fixed for the lifetime of the switch connection
+    "desc": FOREVER,
+    "tablefeatures": FOREVER,
+    "groupfeatures": FOREVER,
+    "meterfeatures": FOREVER,
+
+    # Configuration, changed by add/modify/delete calls (which invalidate it) or rarely otherwise
+    "portdesc": 60,
+    "groupdesc": 60,
+    "meterconfig": 60,
+    "meterdesc": 60,
+    "queueconfig": 60,
+    "queuedesc": 60,
+
+    # Counters
+    "switches": 5,
+    "flow": 1,
+    "aggregateflow": 1,
+    "table": 1,
+    "port": 1,
+    "queue": 1,
+    "group": 1,
+    "meter": 1,
+}
+
+### INVALIDATION ON WRITES ###
+#   Write endpoint -> cached endpoints of the same DPID that are dropped when a write succeeds.
+INVALIDATES = {
+    "flowentry": ("flow", "aggregateflow", "table"),
+    "groupentry": ("group", "groupdesc"),
+    "meterentry": ("meter", "meterconfig", "meterdesc"),
+    "portdesc": ("portdesc", "port"),
+}
+
+# Path segment following a write endpoint, e.g. /stats/flowentry/add
+WRITE_ACTIONS = ("add", "modify", "modify_strict", "delete", "delete_strict", "clear")
+
+### DEFAULT SIZE ###
+#   Maximum number of responses held in a cache.
+MAX_ENTRIES = 1000
+
+# time.monotonic is not available in Python 2
+_clock = getattr(time, "monotonic", time.time)
+
+
+
+## Split a REST API URI into its (endpoint, DPID) parts, e.g. ".../stats/flow/1" -> ("flow", "1") ##
+def parse_uri(rest_uri):
+    parts = rest_uri.split("/stats/", 1)[-1].split("/") + [None, None]
+
+    # Write calls carry the action first, e.g. /stats/flowentry/clear/<DPID>
+    if parts[1] in WRITE_ACTIONS:
+        return parts[0], parts[2]
+    return parts[0], parts[1]
+
+
+
+class RyuCache(object):
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=None):
+        # Maximum number of responses held
+        self.max_entries = max_entries
+
+        # Endpoint -> time-to-live, starting from the module defaults
+        self.ttl = dict(TTL)
+        if ttl:
+            self.ttl.update(ttl)
+
+        # URI -> (expiry time, response), least recently used first
+        self._entries = OrderedDict()
+
+        # (endpoint, DPID) -> set of cached URIs, so one switch can be invalidated without a full scan
+        self._keys = {}
+
+        # Number of invalidations so far, and DPID -> number at its last invalidation (None: invalidation of every switch)
+        self._generation = 0
+        self._invalidated = {}
+
+        self._lock = threading.Lock()
+
+
+
+    ## Return a cached response, or None if there is no fresh one ##
+    def get(self, rest_uri):
+        with self._lock:
+            entry = self._entries.pop(rest_uri, None)
+            if entry is None:
+                return None
+
+            expires, response = entry
+            if expires is not None and expires <= _clock():
+                self._unindex(rest_uri)
+                return None
+
+            # Re-insert to mark as most recently used
+            self._entries[rest_uri] = entry
+            return response
+
+
+
+    ## Return the current generation, to be given to put() for a GET made from now on ##
+    def generation(self):
+        return self._generation
+
+
+
+    ## Store a successful response, if its endpoint is cached ##
+    def put(self, rest_uri, response, generation=None):
+        endpoint, DPID = parse_uri(rest_uri)
+        ttl = self.ttl.get(endpoint, 0)
+        if ttl == 0:
+            return
+
+        expires = None if ttl is FOREVER else _clock() + ttl
+
+        with self._lock:
+            # The switch was invalidated while the GET was in flight, so the response may predate a write
+            if generation is not None:
+                if max(self._invalidated.get(None, 0), self._invalidated.get(DPID, 0)) > generation:
+                    return
+
+            if self._entries.pop(rest_uri, None) is None:
+                self._keys.setdefault((endpoint, DPID), set()).add(rest_uri)
+            self._entries[rest_uri] = (expires, response)
+
+            # Evict the least recently used responses
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                del self._entries[oldest]
+                self._unindex(oldest)
+
+
+
+    ## Drop cached responses ##
+    def invalidate(self, DPID=None, endpoints=None):
+
+        '''
+        Description:
+        Drop cached responses.
+
+        Arguments:
+        DPID: [OPTIONAL] Only drop responses for this switch. If not specified, responses for all switches are dropped.
+        endpoints: [OPTIONAL] List of endpoints (REST API path segment after /stats/, e.g. "flow") to drop. If not specified, all are dropped.
+
+        Return value:
+        None.
+
+        Usage:
+        cache.invalidate()
+        cache.invalidate('123917682136708', endpoints=["flow", "aggregateflow"])
+        '''
+
+        with self._lock:
+            self._generation += 1
+            if DPID is None:
+                # Later than the last invalidation of every switch, so their own entries are no longer needed
+                self._invalidated = {None: self._generation}
+            else:
+                self._invalidated[str(DPID)] = self._generation
+
+            if DPID is None and endpoints is None:
+                self._entries.clear()
+                self._keys.clear()
+                return
+
+            for endpoint, key_DPID in list(self._keys):
+                if DPID is not None and key_DPID != str(DPID):
+                    continue
+                if endpoints is not None and endpoint not in endpoints:
+                    continue
+                for rest_uri in self._keys.pop((endpoint, key_DPID)):
+                    self._entries.pop(rest_uri, None)
+
+
+
+    ## Drop the cached entries affected by a successful write call ##
+    def written(self, rest_uri, payload=None):
+        endpoint, DPID = parse_uri(rest_uri)
+        endpoints = INVALIDATES.get(endpoint)
+        if endpoints is None:
+            return
+
+        # The DPID of most writes is carried in the payload rather than the URI
+        if isinstance(payload, dict) and "dpid" in payload:
+            DPID = payload["dpid"]
+        elif getattr(payload, "dpid", None) is not None:
+            # Payload already encoded to JSON (ryutemplate.Payload)
+            DPID = payload.dpid
+
+        self.invalidate(DPID, endpoints)
+
+
+
+    def _unindex(self, rest_uri):
+        key = parse_uri(rest_uri)
+        uris = self._keys.get(key)
+        if uris is not None:
+            uris.discard(rest_uri)
+            if not uris:
+                del self._keys[key]
+
+
+
+    def __len__(self):
+        return len(self._entries)
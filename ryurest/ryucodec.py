@@ -0,0 +1,171 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##                JSON CODEC MODULE                ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides the JSON codecs used by RyuSession to encode request payloads and decode response bodies
+#   (i.e. by every RyuSwitch method and ryufunc function).
+#   Decoding large responses (e.g. get_flows(), get_table_features()) with the standard library json module is slow.
+#   The fastest installed backend is used instead, in this order: orjson, ujson, simplejson, json (always available).
+#   The backend is only looked for (and imported) when the first payload is encoded or response decoded.
+#   Bodies and payloads that a fast backend rejects are handled by the standard library instead.
+#   Every backend decodes integers of up to 64 bits (all OpenFlow values: cookies, counters, DPIDs) exactly.
+
+### REQUIREMENTS ###
+#   [OPTIONAL] Any of:
+#       orjson: pip install orjson
+#       ujson: pip install ujson
+#       simplejson: pip install simplejson
+
+### USAGE INSTRUCTIONS ###
+#   1. Nothing needs to be done: the fastest installed backend is used. To check which one:
+#           >> print ryucodec.default().name
+#
+#   2. [OPTIONAL] Choose a backend for a session:
+#           >> ryusession.SESSION.codec = ryucodec.get("json")
+#
+#   3. [OPTIONAL] Skip decoding: getters called through a raw session return the response body as bytes, e.g. to forward it
+#      elsewhere. The raw session shares the connections, cache and policy of the session it was made from:
+#           >> raw = ryusession.SESSION.as_raw()
+#           >> body = RyuSwitch(DPID, session=raw).get_flows()       # b'{"1": [...]}'
+
+
+import json
+import threading
+
+
+### BACKENDS ###
+#   JSON backends, fastest first.
+BACKENDS = ("orjson", "ujson", "simplejson", "json")
+
+
+
+class Codec(object):
+
+    '''
+    Encodes payloads to and decodes bodies from JSON with one backend.
+    '''
+
+    def __init__(self, name, loads, dumps):
+        # Backend module name
+        self.name = name
+
+        # loads(bytes) -> object, and dumps(object) -> bytes
+        self._loads = loads
+        self._dumps = dumps
+
+
+
+    ## Decode a JSON body (bytes) ##
+    def loads(self, content):
+        try:
+            return self._loads(content)
+        except (ValueError, TypeError, OverflowError):
+            if self._loads is _json_loads:
+                raise
+            # Fast backends reject some valid JSON (e.g. ujson and integers above 64 bits)
+            return _json_loads(content)
+
+
+
+    ## Encode a payload to JSON (bytes) ##
+    def dumps(self, payload):
+        try:
+            return self._dumps(payload)
+        except (ValueError, TypeError, OverflowError):
+            if self._dumps is _json_dumps:
+                raise
+            return _json_dumps(payload)
+
+
+
+    def __repr__(self):
+        return "Codec(%r)" % self.name
+
+
+
+def _json_loads(content):
+    if isinstance(content, bytes):
+        content = content.decode("utf-8")
+    return json.loads(content)
+
+
+
+def _json_dumps(payload):
+    return json.dumps(payload).encode("utf-8")
+
+
+
+## Return the codec of a backend. Raises ImportError if it is not installed ##
+def get(name):
+
+    '''
+    Description:
+    Return a Codec using the named backend.
+
+    Arguments:
+    name: "orjson", "ujson", "simplejson" or "json".
+
+    Return value:
+    Codec. Raises ImportError if the backend is not installed, ValueError if it is not known.
+
+    Usage:
+    ryusession.SESSION.codec = ryucodec.get("ujson")
+    '''
+
+    if name == "json":
+        return Codec("json", _json_loads, _json_dumps)
+
+    if name == "orjson":
+        import orjson
+        options = orjson.OPT_NON_STR_KEYS
+        return Codec(name, orjson.loads, lambda payload: orjson.dumps(payload, option=options))
+
+    if name == "ujson":
+        import ujson
+        return Codec(name, ujson.loads, lambda payload: ujson.dumps(payload).encode("utf-8"))
+
+    if name == "simplejson":
+        import simplejson
+        return Codec(name, simplejson.loads, lambda payload: simplejson.dumps(payload).encode("utf-8"))
+
+    raise ValueError("Unknown JSON backend: %s" % name)
+
+
+
+_default = None
+_lock = threading.Lock()
+
+
+
+## Return the codec of the fastest installed backend ##
+def default():
+    global _default
+    if _default is None:
+        with _lock:
+            if _default is None:
+                for name in BACKENDS:
+                    try:
+                        _default = get(name)
+                        break
+                    except ImportError:
+                        continue
+    return _default
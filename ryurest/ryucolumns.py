@@ -0,0 +1,171 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##              COLUMNAR EXPORT MODULE             ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module converts the results of the statistics getters into NumPy arrays, one array per field.
+#   get_flows(), get_port_stats(), get_queue_stats(), get_meter_stats() and get_group_stats() all return
+#   { "<DPID>": [ {entry}, {entry}, ... ] }. to_columns() turns this into { "field": array, ... }, with one
+#   element per entry, so that counters across thousands of entries can be processed with vectorised operations.
+
+### REQUIREMENTS ###
+#   "NumPy" library: http://www.numpy.org/
+#   Install using: pip install numpy
+
+### USAGE INSTRUCTIONS ###
+#   1. Convert the result of a getter:
+#           >> ports = to_columns(switch1.get_port_stats())
+#           >> busiest = ports["port_no"][ports["tx_bytes"].argmax()]
+#
+#   2. Results of several switches can be combined into one set of columns. The "dpid" column says which switch each entry came from:
+#           >> results, errors = RyuFleet().get_port_stats()
+#           >> ports = to_columns(results)
+#           >> ports["dpid"], ports["port_no"], ports["rx_bytes"]
+#
+#   3. [OPTIONAL] Only convert some fields:
+#           >> flows = to_columns(switch1.get_flows(), fields=["priority", "byte_count", "packet_count"])
+#
+#   4. Column types:
+#       * Whole numbers become uint64 (int64 if any are negative).
+#       * Fractional numbers, or whole numbers missing from some entries, become float64 (missing entries are NaN).
+#       * Anything else (e.g. port_no "LOCAL", or match dictionaries when asked for) becomes an object array.
+#       * Fields holding dictionaries or lists (match, actions, band_stats, ...) are left out unless named in fields.
+
+
+_INTEGERS = (int, type(2 ** 64))
+
+
+
+## Import NumPy only when a conversion is made, so that the rest of the library works without it ##
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy is required for columnar export. Install using: pip install numpy")
+    return numpy
+
+
+
+## Return the single entry list(s) of a getter result, as (DPID, entry) pairs ##
+def _entries(result):
+    for DPID, value in result.items():
+        # Results of RyuFleet are keyed by DPID twice: { DPID: { "<DPID>": [...] } }
+        if isinstance(value, dict):
+            for pair in _entries(value):
+                yield pair
+        else:
+            for entry in value:
+                yield DPID, entry
+
+
+
+## DPIDs are reported as strings of the decimal DPID ##
+def _dpid(DPID):
+    try:
+        return int(DPID)
+    except (TypeError, ValueError):
+        return DPID
+
+
+
+## Build one column from a list of values (None for missing) ##
+def _column(np, values):
+    integers = True
+    numbers = True
+    missing = False
+
+    for value in values:
+        if value is None:
+            missing = True
+        elif isinstance(value, bool) or not isinstance(value, _INTEGERS + (float,)):
+            integers = numbers = False
+            break
+        elif not isinstance(value, _INTEGERS):
+            integers = False
+
+    if integers and not missing:
+        if values and min(values) < 0:
+            if min(values) >= -2 ** 63 and max(values) < 2 ** 63:
+                return np.array(values, dtype=np.int64)
+            return np.array(values, dtype=object)
+        if values and max(values) >= 2 ** 64:
+            return np.array(values, dtype=object)
+        return np.array(values, dtype=np.uint64)
+
+    if numbers:
+        return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+
+## Convert a getter result to NumPy arrays keyed by field name ##
+def to_columns(result, fields=None):
+
+    '''
+    Description:
+    Convert the result of get_flows(), get_port_stats(), get_queue_stats(), get_meter_stats(), get_group_stats()
+    (or any getter returning { "<DPID>": [ {entry}, ... ] }) to one NumPy array per field.
+
+    Arguments:
+    result: Return value of the getter. The combined results of several switches (e.g. from RyuFleet) are also accepted.
+    fields: [OPTIONAL] List of fields to convert. If not specified, every field holding a number or a string is converted.
+
+    Return value:
+    Dictionary of field name -> NumPy array, with one element per entry, in the same order for every field.
+    Also contains a "dpid" column with the DPID each entry came from.
+
+    Usage:
+    ports = to_columns(switch1.get_port_stats())
+    # uint64 differences wrap around to huge values when a counter is reset: cast to int64 and clip resets to 0
+    # (ryurates.PortRateTracker also handles reset ports, counters wrapping around 2^64 and ports coming and going)
+    rx_rate = (ports["rx_bytes"] - previous["rx_bytes"]).astype(numpy.int64).clip(0) * 8.0 / interval
+    '''
+
+    np = _numpy()
+
+    DPIDs = []
+    entries = []
+    for DPID, entry in _entries(result):
+        DPIDs.append(DPID)
+        entries.append(entry)
+
+    if fields is None:
+        fields = []
+        seen = set()
+        for entry in entries:
+            for field, value in entry.items():
+                if field not in seen:
+                    seen.add(field)
+                    if value is None or isinstance(value, _INTEGERS + (float, str, type(u""))):
+                        fields.append(field)
+
+    columns = {"dpid": _column(np, [_dpid(DPID) for DPID in DPIDs])}
+    for field in fields:
+        columns[field] = _column(np, [entry.get(field) for entry in entries])
+    return columns
+
+
+
+## Alias of to_columns() ##
+as_arrays = to_columns
@@ -0,0 +1,256 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##                 ENDPOINTS MODULE                ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### RYU REST API DOCUMENTATION ###
+#   http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html
+
+### ABOUT ###
+#   This module describes every Ryu REST API endpoint in one table (ENDPOINTS), and makes the calls for all of them.
+#   The ryuswitch, ryufunc and ryuasync modules are thin front ends over it: each method/function only names its endpoint
+#   and passes its arguments. URI building, filters, OpenFlow version differences and status handling are done here once,
+#   so they behave the same (and go through the same session: pooling, cache, policy, instruments, codec) in every module.
+
+### USAGE INSTRUCTIONS ###
+#   1. Nothing needs to be done: RyuSwitch, ryufunc and ryuasync use this module.
+#
+#   2. [OPTIONAL] Call an endpoint directly, e.g. one without a method of its own:
+#           >> ENDPOINTS["meterconfig"].call(ryusession.SESSION, API, DPID, values=(3,), openflow=1.5)
+#
+#   3. [OPTIONAL] Build the URI of an endpoint:
+#           >> ENDPOINTS["queue"].uri(API, DPID, values=(None, 4))     # http://localhost:8080/stats/queue/1/ALL/4
+
+
+### RETURN KINDS ###
+#   What a successful call returns.
+JSON = "json"         # The decoded response body
+STATUS = "status"     # True
+
+
+
+class Endpoint(object):
+
+    '''
+    One Ryu REST API endpoint: /stats/<path>[/<DPID>][/<segment>[/<segment>]]
+    '''
+
+    def __init__(self, method, path, dpid=True, segments=(), filtered=False, returns=JSON, since=None, variants=()):
+        # HTTP method, e.g. "GET"
+        self.method = method
+
+        # Path, e.g. "/stats/flow"
+        self.path = path
+
+        # The DPID of the target switch follows the path
+        self.dpid = dpid
+
+        # Names of the optional segments following the DPID, e.g. ("port", "queue")
+        # Trailing segments not given are left out. Segments not given before one that is are sent as "ALL".
+        self.segments = segments
+
+        # A filter given is POSTed (as JSON) to the same path, instead of the GET
+        self.filtered = filtered
+
+        # JSON or STATUS
+        self.returns = returns
+
+        # Lowest OpenFlow version accepting the optional segments. None if every version does.
+        self.since = since
+
+        # ((OpenFlow version, path), ...): the path used from that version on, e.g. ((1.5, "/stats/meterdesc"),)
+        self.variants = variants
+
+
+
+    ## Build the URI of a call ##
+    def uri(self, API, DPID=None, values=(), openflow=None):
+
+        '''
+        Description:
+        Build the URI of a call to this endpoint.
+
+        Arguments:
+        API: Base REST API URI of the controller (no trailing '/').
+        DPID: [OPTIONAL] Datapath ID (DPID) of the target switch, for endpoints taking one.
+        values: [OPTIONAL] Values of the optional segments, in order. None for a segment not given.
+        openflow: [OPTIONAL] OpenFlow version of the switch, for endpoints that differ between versions.
+
+        Return value:
+        URI string.
+
+        Usage:
+        rest_uri = ENDPOINTS["queue"].uri(API, DPID, values=(3, 1))
+        '''
+
+        path = self.path
+        if openflow is not None:
+            for version, variant in self.variants:
+                if openflow >= version:
+                    path = variant
+
+        rest_uri = API + path
+        if self.dpid:
+            rest_uri = rest_uri + "/" + str(DPID)
+
+        # Leave out trailing segments not given
+        values = list(values)
+        while values and values[-1] is None:
+            values.pop()
+        if not values:
+            return rest_uri
+
+        name = self.segments[len(values) - 1].capitalize()
+        if self.since is not None and openflow is None:
+            print("[ WARNING ]: " + name + " filter specified, but OpenFlow version was not. Filtering is only compatible with OpenFlow v" + str(self.since) + "+. Defaulting to no filter & dumping all.")
+        elif self.since is not None and openflow < self.since:
+            print("[ WARNING ]: " + name + " filter specified, but REST API does not allow filtering with specified OpenFlow version (v" + str(openflow) + "). Filtering is only compatible with OpenFlow v" + str(self.since) + "+. Defaulting to no filter & dumping all.")
+        else:
+            for value in values:
+                rest_uri = rest_uri + "/" + ("ALL" if value is None else str(value))
+        return rest_uri
+
+
+
+    ## Return the (method, URI, keyword arguments) of a call ##
+    def prepare(self, API, DPID=None, values=(), openflow=None, filters=None, payload=None):
+        rest_uri = self.uri(API, DPID, values, openflow)
+
+        # If no filter defined, use GET. If filter defined, use POST.
+        if filters and self.filtered:
+            return "POST", rest_uri, {"json": filters}
+        if payload is not None:
+            return self.method, rest_uri, {"json": payload}
+        return self.method, rest_uri, {}
+
+
+
+    ## Return what a call returns, given its HTTP status and body ##
+    def result(self, status, body, decode):
+        # Ryu returns HTTP 200 status if successful
+        if status != 200:
+            return False
+            # If submission fails, Ryu returns HTTP 400 status.
+            # Catch all for HTTP errors.
+        if self.returns == STATUS:
+            return True
+        return decode(body)
+
+
+
+    ## Make a call to this endpoint ##
+    def call(self, session, API, DPID=None, values=(), openflow=None, filters=None, payload=None):
+
+        '''
+        Description:
+        Make a call to this endpoint through a session, and return its result as the RyuSwitch methods do.
+
+        Arguments:
+        session: ryusession.RyuSession to make the call through.
+        API: Base REST API URI of the controller (no trailing '/').
+        DPID: [OPTIONAL] Datapath ID (DPID) of the target switch, for endpoints taking one.
+        values: [OPTIONAL] Values of the optional segments, in order. None for a segment not given.
+        openflow: [OPTIONAL] OpenFlow version of the switch, for endpoints that differ between versions.
+        filters: [OPTIONAL] Dictionary to filter the results returned, for filtered endpoints.
+        payload: [OPTIONAL] Data payload, encoded to JSON.
+
+        Return value:
+        JSON endpoints: the decoded response body. STATUS endpoints: True. False if the call failed.
+
+        Usage:
+        flows = ENDPOINTS["flow"].call(ryusession.SESSION, API, DPID, filters={"table_id": 0})
+        '''
+
+        method, rest_uri, kwargs = self.prepare(API, DPID, values, openflow, filters, payload)
+        r = session.request(method, rest_uri, **kwargs)
+        return self.result(r.status_code, r, session.decode)
+
+
+
+    def __repr__(self):
+        return "Endpoint(%r, %r)" % (self.method, self.path)
+
+
+
+### ENDPOINTS ###
+#   Every endpoint of the Ryu REST API, named by its path after /stats/ (as in ryucache).
+#   Keep in step with the methods of ryuswitch.RyuSwitch and the functions of ryufunc.
+ENDPOINTS = {
+    ###### Retrieve Switch Information ######
+    "switches": Endpoint("GET", "/stats/switches", dpid=False),
+    "desc": Endpoint("GET", "/stats/desc"),
+
+    ###### Retrieve Flow Information ######
+    "flow": Endpoint("GET", "/stats/flow", filtered=True),
+    "aggregateflow": Endpoint("GET", "/stats/aggregateflow", filtered=True),
+
+    ###### Retrieve Flow Table Information ######
+    "table": Endpoint("GET", "/stats/table"),
+    "tablefeatures": Endpoint("GET", "/stats/tablefeatures"),
+
+    ###### Retrieve Port Information ######
+    "port": Endpoint("GET", "/stats/port", segments=("port",)),
+    "portdesc": Endpoint("GET", "/stats/portdesc", segments=("port",), since=1.5),
+
+    ###### Retrieve Queue Information ######
+    "queue": Endpoint("GET", "/stats/queue", segments=("port", "queue")),
+    "queueconfig": Endpoint("GET", "/stats/queueconfig", segments=("port",)),       # OpenFlow v1.0 - v1.3
+    "queuedesc": Endpoint("GET", "/stats/queuedesc", segments=("port", "queue")),   # OpenFlow v1.4+
+
+    ###### Retrieve Group Information ######
+    "group": Endpoint("GET", "/stats/group", segments=("group",)),
+    "groupdesc": Endpoint("GET", "/stats/groupdesc", segments=("group",), since=1.5),
+    "groupfeatures": Endpoint("GET", "/stats/groupfeatures"),
+
+    ###### Retrieve Meter Information ######
+    "meter": Endpoint("GET", "/stats/meter", segments=("meter",)),
+    "meterconfig": Endpoint("GET", "/stats/meterconfig", segments=("meter",), variants=((1.5, "/stats/meterdesc"),)),
+    "meterfeatures": Endpoint("GET", "/stats/meterfeatures"),
+
+    ###### Retrieve Controller Information ######
+    # GET /stats/role/<DPID> returns a 404 error in Ryu, see RyuSwitch.get_role()
+
+    ###### Modify Flow Entries ######
+    "flowentry/add": Endpoint("POST", "/stats/flowentry/add", dpid=False, returns=STATUS),
+    "flowentry/modify": Endpoint("POST", "/stats/flowentry/modify", dpid=False, returns=STATUS),
+    "flowentry/modify_strict": Endpoint("POST", "/stats/flowentry/modify_strict", dpid=False, returns=STATUS),
+    "flowentry/delete": Endpoint("POST", "/stats/flowentry/delete", dpid=False, returns=STATUS),
+    "flowentry/delete_strict": Endpoint("POST", "/stats/flowentry/delete_strict", dpid=False, returns=STATUS),
+    "flowentry/clear": Endpoint("DELETE", "/stats/flowentry/clear", returns=STATUS),
+
+    ###### Modify Group Entries ######
+    "groupentry/add": Endpoint("POST", "/stats/groupentry/add", dpid=False, returns=STATUS),
+    "groupentry/modify": Endpoint("POST", "/stats/groupentry/modify", dpid=False, returns=STATUS),
+    "groupentry/delete": Endpoint("POST", "/stats/groupentry/delete", dpid=False, returns=STATUS),
+
+    ###### Modify Port Entries ######
+    "portdesc/modify": Endpoint("POST", "/stats/portdesc/modify", dpid=False, returns=STATUS),
+
+    ###### Modify Meter Entries ######
+    "meterentry/add": Endpoint("POST", "/stats/meterentry/add", dpid=False, returns=STATUS),
+    "meterentry/modify": Endpoint("POST", "/stats/meterentry/modify", dpid=False, returns=STATUS),
+    "meterentry/delete": Endpoint("POST", "/stats/meterentry/delete", dpid=False, returns=STATUS),
+
+    ###### Modify Controller Role ######
+    "role": Endpoint("POST", "/stats/role", dpid=False, returns=STATUS),
+
+    ###### Send a experimenter message ######
+    "experimenter": Endpoint("POST", "/stats/experimenter", returns=STATUS),
+}
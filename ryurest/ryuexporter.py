@@ -0,0 +1,397 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##             METRICS EXPORTER MODULE             ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides RyuExporter, which publishes the statistics of every switch as Prometheus-style text metrics.
+#   A background thread polls the whole fleet (through RyuFleet, so switches are called concurrently) every 'interval'
+#   seconds and renders the results once. Scrapes of the metrics endpoint are answered from that rendered snapshot,
+#   so however often the metrics are scraped, the controller is only called once per interval.
+#   The following getters are polled by default:
+#       get_port_stats, get_flow_stats (aggregate), get_table_stats, get_queue_stats, get_meter_stats
+
+### USAGE INSTRUCTIONS ###
+#   1. Start an exporter for the switches of a controller. Metrics are served on http://<host>:<port>/metrics
+#           >> exporter = RyuExporter(API="http://192.168.1.30:8080", interval=15, port=9101)
+#           >> exporter.start()
+#
+#   2. [OPTIONAL] Embed the metrics in your own web server instead of running the exporter's one:
+#           >> exporter = RyuExporter(port=None)
+#           >> exporter.start()
+#           >> body = exporter.metrics()     # Latest rendered snapshot (text)
+#
+#   3. [OPTIONAL] Only poll some of the getters:
+#           >> exporter = RyuExporter(getters=("get_port_stats", "get_flow_stats"))
+#
+#   4. Call .stop() to stop polling and serving.
+#
+#   5. The exporter can also be run from the command line:
+#           $ python ryuexporter.py --api http://localhost:8080 --port 9101 --interval 15
+
+
+import argparse
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+try:
+    from .ryufleet import RyuFleet
+except (ImportError, ValueError):
+    from ryufleet import RyuFleet
+
+
+### DEFAULT POLL INTERVAL (seconds) ###
+INTERVAL = 15
+
+### DEFAULT METRICS PORT ###
+PORT = 9101
+
+### EXPORTED STATISTICS ###
+#   Getter -> (metric name prefix, entry fields used as labels (field, label name), metrics (field, name, type, help))
+#   Every metric also has a "dpid" label.
+METRICS = {
+    "get_port_stats": ("ryu_port_", (("port_no", "port"),), (
+        ("rx_packets", "receive_packets_total", "counter", "Packets received by the port."),
+        ("tx_packets", "transmit_packets_total", "counter", "Packets transmitted by the port."),
+        ("rx_bytes", "receive_bytes_total", "counter", "Bytes received by the port."),
+        ("tx_bytes", "transmit_bytes_total", "counter", "Bytes transmitted by the port."),
+        ("rx_dropped", "receive_dropped_total", "counter", "Packets dropped by the port on receive."),
+        ("tx_dropped", "transmit_dropped_total", "counter", "Packets dropped by the port on transmit."),
+        ("rx_errors", "receive_errors_total", "counter", "Receive errors on the port."),
+        ("tx_errors", "transmit_errors_total", "counter", "Transmit errors on the port."),
+        ("rx_frame_err", "receive_frame_errors_total", "counter", "Frame alignment errors on the port."),
+        ("rx_over_err", "receive_overrun_errors_total", "counter", "Receive overrun errors on the port."),
+        ("rx_crc_err", "receive_crc_errors_total", "counter", "CRC errors on the port."),
+        ("collisions", "collisions_total", "counter", "Collisions on the port."),
+        ("duration_sec", "duration_seconds", "gauge", "Time the port has been alive."),
+    )),
+    "get_flow_stats": ("ryu_flows_", (), (
+        ("flow_count", "count", "gauge", "Flow entries installed on the switch."),
+        ("packet_count", "packets_total", "counter", "Packets matched by all flow entries."),
+        ("byte_count", "bytes_total", "counter", "Bytes matched by all flow entries."),
+    )),
+    "get_table_stats": ("ryu_table_", (("table_id", "table"),), (
+        ("active_count", "active_entries", "gauge", "Active entries in the flow table."),
+        ("lookup_count", "lookups_total", "counter", "Packets looked up in the flow table."),
+        ("matched_count", "matched_total", "counter", "Packets that hit the flow table."),
+    )),
+    "get_queue_stats": ("ryu_queue_", (("port_no", "port"), ("queue_id", "queue")), (
+        ("tx_bytes", "transmit_bytes_total", "counter", "Bytes transmitted by the queue."),
+        ("tx_packets", "transmit_packets_total", "counter", "Packets transmitted by the queue."),
+        ("tx_errors", "transmit_errors_total", "counter", "Packets dropped by the queue due to overrun."),
+    )),
+    "get_meter_stats": ("ryu_meter_", (("meter_id", "meter"),), (
+        ("flow_count", "flows", "gauge", "Flow entries using the meter."),
+        ("packet_in_count", "input_packets_total", "counter", "Packets processed by the meter."),
+        ("byte_in_count", "input_bytes_total", "counter", "Bytes processed by the meter."),
+    )),
+}
+
+GETTERS = ("get_port_stats", "get_flow_stats", "get_table_stats", "get_queue_stats", "get_meter_stats")
+
+# Value of a counter the switch does not support; it is left out
+_UNSUPPORTED = 2 ** 64 - 1
+
+# int and long in Python 2, int in Python 3
+_INTEGERS = (int, type(_UNSUPPORTED))
+
+
+
+## Escape a label value for the text format ##
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+
+## Render poll results in the Prometheus text format ##
+def render(results, getters=GETTERS):
+
+    '''
+    Description:
+    Render the results of a poll as Prometheus text metrics.
+
+    Arguments:
+    results: Dictionary of getter name -> RyuFleet results for that getter (DPID -> return value of the getter).
+    getters: [OPTIONAL] Getters to render, in order.
+
+    Return value:
+    Text of the metrics.
+
+    Usage:
+    results = {"get_port_stats": fleet.get_port_stats()[0]}
+    print render(results)
+    '''
+
+    lines = []
+    for getter in getters:
+        prefix, labels, metrics = METRICS[getter]
+
+        # Collect the label text of every entry once, shared by all its metrics
+        entries = []
+        for DPID in sorted(results.get(getter, {}), key=str):
+            for entries_of_switch in results[getter][DPID].values():
+                for entry in entries_of_switch:
+                    text = ",".join(['dpid="%s"' % _label(DPID)] + ['%s="%s"' % (name, _label(entry.get(field))) for field, name in labels])
+                    entries.append((text, entry))
+
+        if getter == "get_table_stats":
+            # Ryu reports every table the switch has (often 254). Only tables in use are exported.
+            entries = [(text, entry) for text, entry in entries if entry.get("active_count") or entry.get("lookup_count")]
+
+        for field, name, metric_type, description in metrics:
+            lines.append("# HELP %s%s %s" % (prefix, name, description))
+            lines.append("# TYPE %s%s %s" % (prefix, name, metric_type))
+            for text, entry in entries:
+                value = entry.get(field)
+                if isinstance(value, bool) or not isinstance(value, _INTEGERS + (float,)) or value == _UNSUPPORTED:
+                    continue
+                lines.append("%s%s{%s} %s" % (prefix, name, text, value))
+
+    return "\n".join(lines) + "\n"
+
+
+
+class RyuExporter(object):
+
+    def __init__(self, API="http://localhost:8080", interval=INTERVAL, host="", port=PORT, getters=GETTERS, fleet=None):
+        # Fleet polled. By default, every switch connected to the controller; the list is refreshed on every poll.
+        self.fleet = fleet if fleet is not None else RyuFleet(DPIDs=[], API=API)
+        self._refresh = fleet is None
+
+        # Seconds between the start of two polls
+        self.interval = interval
+
+        # Getters polled, see METRICS
+        self.getters = tuple(getters)
+
+        # Address the metrics are served on. Set port to None to not serve them.
+        self.host = host
+        self.port = port
+
+        # Exporter's own counters
+        self.polls = 0
+        self.errors = dict((getter, 0) for getter in self.getters)
+
+        # Latest rendered snapshot and when it was taken (time.time())
+        self.snapshot = render({}, self.getters) + self._render_status({}, 0.0, False)
+        self.snapshot_time = None
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+
+
+
+    ## Poll every switch once and replace the snapshot ##
+    def poll(self):
+
+        '''
+        Description:
+        Call every getter on every switch (concurrently, through RyuFleet) and render the results as the new snapshot.
+
+        Arguments:
+        None.
+
+        Return value:
+        The new snapshot (text).
+
+        Usage:
+        exporter = RyuExporter(port=None)
+        print exporter.poll()
+        '''
+
+        start = time.time()
+
+        up = True
+        if self._refresh and self.fleet.refresh() is False:
+            up = False
+
+        results = {}
+        failed = {}
+        for getter in self.getters:
+            results[getter], errors = self.fleet.run(getter)
+            self.errors[getter] += len(errors)
+            for DPID in errors:
+                failed[DPID] = True
+
+        self.polls += 1
+        switches = dict((DPID, DPID not in failed) for DPID in self.fleet.switches)
+
+        # Replaced in one assignment, so scrapes always see a whole snapshot
+        self.snapshot = render(results, self.getters) + self._render_status(switches, time.time() - start, up)
+        self.snapshot_time = start
+        return self.snapshot
+
+
+
+    def _render_status(self, switches, duration, up):
+        lines = [
+            "# HELP ryu_up Whether the last poll could read the switch list from the controller.",
+            "# TYPE ryu_up gauge",
+            "ryu_up %d" % up,
+            "# HELP ryu_switch_up Whether every getter succeeded for the switch in the last poll.",
+            "# TYPE ryu_switch_up gauge",
+        ]
+        for DPID in sorted(switches, key=str):
+            lines.append('ryu_switch_up{dpid="%s"} %d' % (_label(DPID), switches[DPID]))
+        lines += [
+            "# HELP ryu_exporter_polls_total Polls made by the exporter.",
+            "# TYPE ryu_exporter_polls_total counter",
+            "ryu_exporter_polls_total %d" % self.polls,
+            "# HELP ryu_exporter_errors_total Failed getter calls, by getter.",
+            "# TYPE ryu_exporter_errors_total counter",
+        ]
+        for getter, errors in sorted(self.errors.items()):
+            lines.append('ryu_exporter_errors_total{getter="%s"} %d' % (getter, errors))
+        lines += [
+            "# HELP ryu_exporter_poll_duration_seconds Time taken by the last poll.",
+            "# TYPE ryu_exporter_poll_duration_seconds gauge",
+            "ryu_exporter_poll_duration_seconds %f" % duration,
+        ]
+        return "\n".join(lines) + "\n"
+
+
+
+    ## Return the latest snapshot ##
+    def metrics(self):
+        return self.snapshot
+
+
+
+    ## Start polling (and serving, unless port is None) in background threads ##
+    def start(self):
+
+        '''
+        Description:
+        Start polling every 'interval' seconds in a background thread, and serve the snapshot on http://<host>:<port>/metrics.
+
+        Arguments:
+        None.
+
+        Return value:
+        URL of the metrics endpoint, or None if port is None.
+
+        Usage:
+        exporter = RyuExporter(API="http://192.168.1.30:8080", interval=15, port=9101)
+        exporter.start()
+        '''
+
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+        if self.port is not None and self._server is None:
+            self._server = _Server((self.host, self.port), _Handler)
+            self._server.exporter = self
+            self.port = self._server.server_address[1]
+            thread = threading.Thread(target=self._server.serve_forever)
+            thread.daemon = True
+            thread.start()
+
+        if self.port is None:
+            return None
+        return "http://%s:%d/metrics" % (self.host or "localhost", self.port)
+
+
+
+    def _run(self):
+        while not self._stop.is_set():
+            start = time.time()
+            try:
+                self.poll()
+            except Exception:
+                # Keep the last snapshot and try again next interval
+                pass
+            self._stop.wait(max(0.0, self.interval - (time.time() - start)))
+
+
+
+    ## Stop polling and serving ##
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        self.fleet.close()
+
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        body = self.server.exporter.metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Do not log every scrape
+    def log_message(self, format, *args):
+        pass
+
+
+
+## Run an exporter from the command line ##
+def main():
+    parser = argparse.ArgumentParser(description="Export Ryu switch statistics as Prometheus metrics.")
+    parser.add_argument("--api", default="http://localhost:8080", help="base URI of the Ryu REST API")
+    parser.add_argument("--host", default="", help="address to serve the metrics on")
+    parser.add_argument("--port", type=int, default=PORT, help="port to serve the metrics on")
+    parser.add_argument("--interval", type=float, default=INTERVAL, help="seconds between polls")
+    parser.add_argument("--getters", default=",".join(GETTERS), help="getters to poll, comma separated")
+    args = parser.parse_args()
+
+    exporter = RyuExporter(API=args.api, interval=args.interval, host=args.host, port=args.port, getters=args.getters.split(","))
+    print("Serving metrics of " + args.api + " on " + exporter.start())
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        exporter.stop()
+
+
+
+if __name__ == "__main__":
+    main()
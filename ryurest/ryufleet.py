@@ -0,0 +1,245 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##                   FLEET MODULE                  ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides the RyuFleet class, which runs a RyuSwitch method against many switches at once.
+#   Calls are spread over a pool of worker threads sharing the pooled connections of ryusession,
+#   so a sweep of the whole fabric takes roughly as long as the slowest switch, not the sum of all of them.
+
+### USAGE INSTRUCTIONS ###
+#   1. Create a fleet. With no DPIDs given, the fleet contains every switch reported by get_switches():
+#           >> fleet = RyuFleet()
+#           >> fleet = RyuFleet(API="http://192.168.1.30:8080", workers=64)
+#           >> fleet = RyuFleet([1, 2, 3])
+#
+#   2. Call any RyuSwitch getter on the fleet. The same arguments as the RyuSwitch method are accepted:
+#           >> results, errors = fleet.get_port_stats()
+#           >> results, errors = fleet.get_flows(filters={"table_id": 0}, DPIDs=[1, 2])
+#      * results is a dictionary of DPID -> return value of the method, for every switch that succeeded.
+#      * errors is a dictionary of DPID -> the exception raised, or False if the REST API call failed.
+#
+#   3. Any other RyuSwitch method (e.g. delete_flow_all) can be run with .run():
+#           >> results, errors = fleet.run("delete_flow_all", DPIDs=[1, 2])
+#
+#   4. Call .refresh() to pick up switches that have connected since the fleet was created, and .close() when done.
+
+
+import threading
+from multiprocessing.pool import ThreadPool
+
+try:
+    from . import ryusession
+    from .ryuswitch import RyuSwitch
+except (ImportError, ValueError):
+    import ryusession
+    from ryuswitch import RyuSwitch
+
+
+### DEFAULT WORKER LIMIT ###
+#   Maximum number of calls in flight at once for a single fleet.
+WORKERS = 32
+
+### PER-DPID GETTERS ###
+#   RyuSwitch methods that can be called directly on a fleet, e.g. fleet.get_port_stats()
+GETTERS = (
+    "get_stats", "get_flows", "get_flow_stats", "get_table_stats", "get_table_features",
+    "get_port_stats", "get_port_description", "get_queue_stats", "get_queue_config",
+    "get_queue_description", "get_group_stats", "get_group_description", "get_group_features",
+    "get_meter_stats", "get_meter_description", "get_meter_features",
+)
+
+
+
+class RyuFleet(object):
+
+    def __init__(self, DPIDs=None, API="http://localhost:8080", workers=WORKERS, session=None):
+        ### Base REST API URI ###
+        # Warning: DO NOT add a trailing '/' at the end or API will fail.
+        self.API = API
+
+        # Maximum number of calls in flight at once
+        self.workers = workers
+
+        ### HTTP Session ###
+        self.session = session if session is not None else ryusession.SESSION
+
+        # Keep enough pooled connections open for every worker, so none are thrown away after each call.
+        self.session.ensure_pool_size(API, workers)
+
+        # Worker threads are started on the first sweep
+        self._pool = None
+        self._lock = threading.Lock()
+
+        # DPID -> RyuSwitch
+        self.switches = {}
+
+        if DPIDs is None:
+            self.refresh()
+        else:
+            for DPID in DPIDs:
+                self.add(DPID)
+
+
+
+    ## Add a switch to the fleet ##
+    def add(self, DPID):
+        switch = self._switch(DPID)
+        self.switches[DPID] = switch
+        return switch
+
+
+
+    ## Return a RyuSwitch for a DPID, without adding it to the fleet ##
+    def _switch(self, DPID):
+        switch = RyuSwitch(DPID, session=self.session)
+        switch.API = self.API
+        return switch
+
+
+
+    ## Return the switch of the fleet to call for a DPID. DPIDs not in the fleet are called without being added. ##
+    def _lookup(self, DPID):
+        switch = self.switches.get(DPID)
+        if switch is None:
+            switch = self._switch(DPID)
+        return switch
+
+
+
+    ## Return the switches to call for many DPIDs as [(DPID, switch)], and {DPID: exception} for those with none ##
+    def _lookup_all(self, DPIDs):
+        switches = []
+        errors = {}
+        for DPID in DPIDs:
+            try:
+                switches.append((DPID, self._lookup(DPID)))
+            except Exception as e:
+                errors[DPID] = e
+        return switches, errors
+
+
+
+    ## Re-read the list of connected switches from the controller ##
+    def refresh(self):
+
+        '''
+        Description:
+        Replace the switches in the fleet with the switches currently connected to the controller.
+
+        Arguments:
+        None.
+
+        Return value:
+        List of DPIDs in the fleet, or False if the REST API call failed (the fleet is left unchanged).
+
+        Usage:
+        fleet = RyuFleet()
+        DPID_list = fleet.refresh()
+        '''
+
+        switch = RyuSwitch(session=self.session)
+        switch.API = self.API
+
+        DPIDs = switch.get_switches()
+        if DPIDs is False:
+            return False
+
+        self.switches = {}
+        for DPID in DPIDs:
+            self.add(DPID)
+        return DPIDs
+
+
+
+    ## Run a RyuSwitch method against many switches at once ##
+    def run(self, method, *args, **kwargs):
+
+        '''
+        Description:
+        Call a RyuSwitch method on every switch in the fleet (or a subset of them) concurrently.
+
+        Arguments:
+        method: Name of the RyuSwitch method to call, e.g. "get_port_stats".
+        DPIDs: [OPTIONAL] Keyword argument. List of DPIDs to call. If not specified, every switch in the fleet is called.
+               DPIDs not in the fleet are called too, but are not added to it.
+        args, kwargs: Any other arguments are passed to the RyuSwitch method.
+
+        Return value:
+        Tuple of two dictionaries: (results, errors).
+        results: DPID -> return value of the method, for every switch that succeeded.
+        errors: DPID -> the exception raised, or False if the REST API call failed.
+
+        Usage:
+        fleet = RyuFleet()
+        results, errors = fleet.run("get_queue_stats", port=3)
+        results, errors = fleet.run("get_flows", DPIDs=[1, 2])
+        '''
+
+        DPIDs = kwargs.pop("DPIDs", None)
+        if DPIDs is None:
+            DPIDs = list(self.switches)
+
+        results = {}
+        switches, errors = self._lookup_all(DPIDs)
+
+        def call(entry):
+            try:
+                return getattr(entry[1], method)(*args, **kwargs), None
+            except Exception as e:
+                return None, e
+
+        for (DPID, switch), (value, error) in zip(switches, self._get_pool().map(call, switches)):
+            if error is not None:
+                errors[DPID] = error
+            elif value is False:
+                errors[DPID] = False
+            else:
+                results[DPID] = value
+
+        return results, errors
+
+
+
+    ## Allow fleet.get_port_stats(...) etc. as a shortcut for fleet.run("get_port_stats", ...) ##
+    def __getattr__(self, name):
+        if name in GETTERS:
+            def getter(*args, **kwargs):
+                return self.run(name, *args, **kwargs)
+            return getter
+        raise AttributeError(name)
+
+
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPool(self.workers)
+            return self._pool
+
+
+
+    ## Stop the worker threads ##
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
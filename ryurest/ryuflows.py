@@ -0,0 +1,353 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##               COMPACT FLOW TABLE MODULE         ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides FlowTable, a compact in-memory copy of a switch's flow table.
+#   get_flows() returns one dictionary per flow entry, repeating the same keys for every entry. A FlowTable instead keeps:
+#       * The numeric fields (priority, cookie, byte_count, ...) in one array per field, 8 bytes per entry.
+#       * The match of each entry as a shared tuple of field names plus its values in one flat list.
+#       * Identical actions lists, match values and field-name tuples only once (interned).
+#   This uses several times less memory than the dictionaries for large tables.
+#   Entries are read as FlowEntry records, which support both attribute and dictionary-style lookups.
+
+### USAGE INSTRUCTIONS ###
+#   1. Get the flow table of a switch as a FlowTable (the response is streamed, so the dictionaries are never all in memory):
+#           >> table = switch1.get_flow_table()
+#           >> table = ryufunc.get_flow_table(DPID)
+#      * Or convert the result of get_flows():
+#           >> table = FlowTable.from_flows(switch1.get_flows())
+#
+#   2. Read entries by index or by iterating:
+#           >> entry = table[0]
+#           >> print entry.priority, entry["byte_count"], entry.match["in_port"], entry.actions
+#           >> for entry in table:
+#           ..     print entry.get("cookie")
+#
+#   3. Read a whole numeric field at once (an array.array, no copy is made):
+#           >> total_bytes = sum(table.column("byte_count"))
+#      * Or as NumPy arrays (requires NumPy):
+#           >> arrays = table.as_arrays()
+#
+#   4. Convert back to the get_flows() format with table.to_list() or entry.to_dict().
+#      * The actions lists returned by a FlowEntry are shared between entries. Do not modify them.
+
+
+from array import array
+
+try:
+    from . import ryucolumns
+except (ImportError, ValueError):
+    import ryucolumns
+
+
+### NUMERIC FIELDS ###
+#   Flow entry fields stored in compact arrays, one per field.
+COUNTERS = (
+    "table_id", "priority", "cookie", "idle_timeout", "hard_timeout", "flags",
+    "byte_count", "packet_count", "duration_sec", "duration_nsec", "length",
+)
+
+# Unsigned 64-bit array type: 'Q' in Python 3, 'L' (64-bit on Linux/macOS) in Python 2
+try:
+    array("Q")
+    TYPECODE = "Q"
+except ValueError:
+    TYPECODE = "L"
+
+# Largest value that fits in the arrays
+_MAX = 2 ** 64 - 1
+
+# int and long in Python 2, int in Python 3
+_INTEGERS = (int, type(_MAX))
+
+# Marks a field that was not present in the entry
+_MISSING = object()
+
+
+
+class FlowTable(object):
+
+    def __init__(self, flows=(), DPID=None):
+        # DPID of the switch the flows were read from
+        self.DPID = DPID
+
+        # Field name -> array of values, one per entry
+        self._columns = dict((field, array(TYPECODE)) for field in COUNTERS)
+
+        # Per entry: interned tuple of match field names, and where its match values start in _match_values.
+        # The values of every entry are kept in one flat list, in the same order as the field names.
+        self._match_fields = []
+        self._match_start = array(TYPECODE)
+        self._match_values = []
+
+        # Per entry: interned actions list
+        self._actions = []
+
+        # Entry index -> dictionary of fields that could not be stored compactly. Only entries that need it have one.
+        self._extras = {}
+
+        # (type, value) -> the single shared copy of that value
+        self._interned = {}
+
+        # Tuple of actions -> the single shared actions list
+        self._action_lists = {}
+
+        for flow in flows:
+            self.append(flow)
+
+        # Most match values are unique to one entry. Dropping the lookup tables once the table is built
+        # frees their memory; the values already shared stay shared.
+        self._interned = {}
+        self._action_lists = {}
+
+
+
+    ## Build a FlowTable from the result of get_flows() ##
+    @classmethod
+    def from_flows(cls, flows):
+
+        '''
+        Description:
+        Build a FlowTable from the dictionary returned by get_flows().
+
+        Arguments:
+        flows: Return value of get_flows(), e.g. {"123917682136708": [ {flow}, {flow}, ... ]}
+
+        Return value:
+        FlowTable containing the flows of the (first) switch in the dictionary.
+
+        Usage:
+        table = FlowTable.from_flows(switch1.get_flows())
+        '''
+
+        for DPID, entries in flows.items():
+            return cls(entries, DPID)
+        return cls()
+
+
+
+    def _intern(self, value):
+        try:
+            # Keyed by type as well, so that e.g. 1, 1.0 and True stay distinct
+            return self._interned.setdefault((type(value), value), value)
+        except TypeError:
+            # Unhashable (e.g. nested dictionaries): stored as is
+            return value
+
+
+
+    ## Add a flow entry (in the get_flows() format) to the table ##
+    def append(self, flow):
+        index = len(self._actions)
+        extras = {}
+
+        for field in COUNTERS:
+            value = flow.get(field, _MISSING)
+            if isinstance(value, bool) or not isinstance(value, _INTEGERS) or not 0 <= value <= _MAX:
+                # Missing, or cannot be stored in the array
+                extras[field] = value
+                value = 0
+            self._columns[field].append(value)
+
+        match = flow.get("match", _MISSING)
+        self._match_start.append(len(self._match_values))
+        if isinstance(match, dict):
+            fields = sorted(match)
+            self._match_fields.append(self._intern(tuple(fields)))
+            self._match_values.extend(self._intern(match[field]) for field in fields)
+        else:
+            extras["match"] = match
+            self._match_fields.append(())
+
+        actions = flow.get("actions", _MISSING)
+        if isinstance(actions, list):
+            try:
+                # Share one list per distinct actions list
+                key = tuple(actions)
+                actions = self._action_lists.setdefault(key, actions)
+            except TypeError:
+                # Unhashable actions (e.g. nested dictionaries): stored as is
+                pass
+            self._actions.append(actions)
+        else:
+            extras["actions"] = actions
+            self._actions.append(None)
+
+        for field, value in flow.items():
+            if field not in COUNTERS and field not in ("match", "actions"):
+                extras[field] = value
+
+        if extras:
+            self._extras[index] = extras
+
+
+
+    ## Return all values of a numeric field ##
+    def column(self, field):
+
+        '''
+        Description:
+        Return the values of a numeric field (see COUNTERS) for every entry, in table order.
+
+        Arguments:
+        field: Name of the field, e.g. "byte_count".
+
+        Return value:
+        array.array of the values. Entries where the field is missing or not a number hold 0.
+
+        Usage:
+        total_bytes = sum(table.column("byte_count"))
+        '''
+
+        return self._columns[field]
+
+
+
+    ## Return the numeric fields as NumPy arrays ##
+    def as_arrays(self, fields=COUNTERS):
+
+        '''
+        Description:
+        Copy numeric fields (see COUNTERS) into NumPy uint64 arrays, for vectorised processing. Requires NumPy.
+
+        Arguments:
+        fields: [OPTIONAL] Names of the fields to copy. Defaults to every field in COUNTERS.
+
+        Return value:
+        Dictionary of field name -> NumPy array, in table order. Entries where the field is missing or not a number hold 0.
+
+        Usage:
+        arrays = table.as_arrays()
+        top_talkers = arrays["byte_count"].argsort()[::-1][:10]
+        '''
+
+        np = ryucolumns._numpy()
+
+        # A straight memory copy of each array. The copy stays valid if more entries are appended later.
+        return dict((field, np.frombuffer(self._columns[field], dtype=np.uint64).copy()) for field in fields)
+
+
+
+    def __len__(self):
+        return len(self._actions)
+
+
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("FlowTable index out of range")
+        return FlowEntry(self, index)
+
+
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield FlowEntry(self, index)
+
+
+
+    ## Convert back to the get_flows() format ##
+    def to_list(self):
+        return [entry.to_dict() for entry in self]
+
+
+
+    def to_flows(self):
+        return {str(self.DPID): self.to_list()}
+
+
+
+class FlowEntry(object):
+
+    # A FlowEntry only holds its position in the table; the values live in the FlowTable.
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+
+
+    ## Dictionary-style access: entry["priority"] ##
+    def __getitem__(self, field):
+        table = self._table
+        extras = table._extras.get(self._index)
+
+        if extras is not None and field in extras:
+            value = extras[field]
+            if value is _MISSING:
+                raise KeyError(field)
+            return value
+
+        if field in table._columns:
+            return table._columns[field][self._index]
+        if field == "match":
+            fields = table._match_fields[self._index]
+            start = table._match_start[self._index]
+            return dict(zip(fields, table._match_values[start:start + len(fields)]))
+        if field == "actions":
+            return table._actions[self._index]
+        raise KeyError(field)
+
+
+
+    ## Attribute access: entry.priority ##
+    def __getattr__(self, field):
+        try:
+            return self[field]
+        except KeyError:
+            raise AttributeError(field)
+
+
+
+    def get(self, field, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+
+
+    def __contains__(self, field):
+        return field in self.keys()
+
+
+
+    def keys(self):
+        extras = self._table._extras.get(self._index, {})
+        fields = [field for field in COUNTERS if extras.get(field) is not _MISSING]
+        fields += [field for field in ("match", "actions") if field not in extras]
+        fields += [field for field in extras if field not in fields and extras[field] is not _MISSING]
+        return fields
+
+
+
+    ## Convert to a dictionary in the get_flows() format ##
+    def to_dict(self):
+        return dict((field, self[field]) for field in self.keys())
+
+
+
+    def __repr__(self):
+        return "FlowEntry(%r)" % (self.to_dict(),)
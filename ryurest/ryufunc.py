@@ -27,13 +27,14 @@
 #   This a Python module that provides easy functional access to the Ryu REST API.
 #   The module uses the Requests framework to interact with the RYU REST API.
 #   For an Object-Orientated approach, use the ryu_switch.py module which will instantiate switches as objects.
+#   Every function makes its call through the endpoint table in ryuendpoints.py, shared with the ryuswitch and ryuasync modules.
 
 ### REQUIREMENTS ###
 #   "Requests" library: http://docs.python-requests.org/en/master/
 #   Install using: pip install requests
 
 ### INSTALLATION ###
-#   Place this file at the root of your project. PIP support is WIP.
+#   Place this file and ryusession.py at the root of your project. PIP support is WIP.
 
 ### USAGE INSTRUCTIONS ###
 #   1. Import this module into your script, for example:
@@ -66,8 +67,25 @@
 #   Warning: DO NOT add a trailing '/' at the end or API will fail.
 API = "http://localhost:8080"
 
-# Use Requests library (required)
-import requests
+# Use the shared pooled session (required)
+try:
+    from . import ryusession
+    from . import ryustream
+    from . import ryuflows
+    from . import ryuindex
+    from . import ryuendpoints
+except (ImportError, ValueError):
+    import ryusession
+    import ryustream
+    import ryuflows
+    import ryuindex
+    import ryuendpoints
+
+### HTTP SESSION ###
+#   All functions share the pooled connections of this session.
+#   To use a separate session (e.g. with a different pool size), override this by setting:
+#       >> ryufunc.SESSION = ryusession.RyuSession(pool_size=50)
+SESSION = ryusession.SESSION
 
 
 
@@ -94,22 +112,12 @@ def get_switches():
     Returns an ARRAY of Datapath IDs (DPID) - one for each connected switch.
 
     Usage:
-    content = ryufunc.list_switches()
+    content = ryufunc.get_switches()
     print content[0]
     '''
 
     # Path: /stats/switches
-    rest_uri = API + "/stats/switches"
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["switches"].call(SESSION, API)
 
 
 
@@ -144,17 +152,12 @@ def get_switch_stats(DPID):
     '''
 
     # Path: /stats/desc/<DPID>
-    rest_uri = API + "/stats/desc/" + str(DPID)
+    return ryuendpoints.ENDPOINTS["desc"].call(SESSION, API, DPID)
 
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
 
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+
+## Same as get_switch_stats(), under the name used by RyuSwitch ##
+get_stats = get_switch_stats
 
 
 
@@ -182,24 +185,115 @@ def get_flows(DPID, filters={}):
     '''
 
     # Path: /stats/flow/<DPID>
-    rest_uri = API + "/stats/flow/" + str(DPID)
+    # If no filter defined, use GET. If filter defined, use POST.
+    return ryuendpoints.ENDPOINTS["flow"].call(SESSION, API, DPID, filters=filters)
+
+
+
+## Stream the flow table of a specified switch (DPID) one entry at a time. Optionally give a filter. ##
+def iter_flows(DPID, filters={}, chunk_size=ryustream.CHUNK_SIZE):
+
+    '''
+    Description:
+    Get all flows stats of the switch, parsing the response as it is downloaded instead of all at once.
+    Memory use stays bounded however many flow entries the switch has.
+
+    Link:
+    http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#get-all-flows-stats
 
+    Arguments:
+    DPID: Datapath ID (DPID) of the target switch.
+    filters: [OPTIONAL] dictionary to filter the results returned, as for get_flows(). See above link.
+    chunk_size: [OPTIONAL] Number of bytes downloaded at a time.
+
+    Return value:
+    Generator yielding one flow entry (dictionary) at a time, in the same format as the entries returned by get_flows().
+    False if the REST API call failed.
+
+    Usage:
+    flows = ryufunc.iter_flows('123917682136708')
+    if flows is not False:
+        for flow in flows:
+            print flow["priority"], flow["match"]
+    '''
+
+    # Path: /stats/flow/<DPID>
     # If no filter defined, use GET. If filter defined, use POST.
-    if not filters:
-        # No filter specified, dump ALL flows.
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
+    method, rest_uri, kwargs = ryuendpoints.ENDPOINTS["flow"].prepare(API, DPID, filters=filters)
 
-        return r.json()
+    # Make call to REST API, leaving the body to be downloaded as it is parsed
+    r = SESSION.request(method, rest_uri, stream=True, **kwargs)
+
+    # Ryu returns HTTP 200 status if successful
+    if r.status_code == 200:
+        return ryustream.iter_entries(r, chunk_size, SESSION)
     else:
-        # Filter is present, dump only matched flows.
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, data=filters)
+        r.close()
+        return False
+        # If submission fails, Ryu returns HTTP 400 status.
+        # Catch all for HTTP errors.
+
+
+
+## Get the flow table of a specified switch (DPID) as a compact FlowTable. Optionally give a filter. ##
+def get_flow_table(DPID, filters={}):
+
+    '''
+    Description:
+    Get all flows stats of the switch as a FlowTable, which uses several times less memory than the result of get_flows().
+    The response is streamed into the table, so the full get_flows() result is never held in memory.
+
+    Link:
+    http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#get-all-flows-stats
 
-        # DEBUG MODE
-        if debug: debug_dump(rest_uri, r, "GET FLOWS")
+    Arguments:
+    DPID: Datapath ID (DPID) of the target switch.
+    filters: [OPTIONAL] dictionary to filter the results returned, as for get_flows(). See above link.
+
+    Return value:
+    ryuflows.FlowTable of FlowEntry records. False if the REST API call failed.
+
+    Usage:
+    table = ryufunc.get_flow_table('123917682136708')
+    print table[0].priority, table[0]["match"]
+    '''
+
+    flows = iter_flows(DPID, filters)
+    if flows is False:
+        return False
+
+    return ryuflows.FlowTable(flows, DPID)
+
+
+
+## Get the flow table of the switch as a FlowIndex, which can be queried locally. Optionally give a filter. ##
+def get_flow_index(DPID, filters={}):
+
+    '''
+    Description:
+    Get all flows stats of the switch as a FlowIndex, which finds flows by match field, cookie, table_id, priority or
+    output port without calling the REST API again. See ryuindex.py for more info.
+
+    Link:
+    http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#get-all-flows-stats
+
+    Arguments:
+    DPID: Datapath ID (DPID) of the target switch.
+    filters: [OPTIONAL] dictionary to filter the results returned, as for get_flows(). See above link.
+
+    Return value:
+    ryuindex.FlowIndex of the flows. False if the REST API call failed.
 
-        return r.json()
+    Usage:
+    index = ryufunc.get_flow_index('123917682136708')
+    print index.find(in_port=3)
+    '''
+
+    flows = iter_flows(DPID, filters)
+    if flows is False:
+        return False
+
+    return ryuindex.FlowIndex(flows, DPID)
 
 
 
@@ -225,24 +319,8 @@ def get_flow_stats(DPID, filters={}):
     '''
 
     # Path: /stats/aggregateflow/<DPID>
-    rest_uri = API + "/stats/aggregateflow/" + str(DPID)
-
     # If no filter defined, use GET. If filter defined, use POST.
-    if not filters:
-        # No filter specified, dump ALL flows.
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        return r.json()
-    else:
-        # Filter is present, dump only matched flows.
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, data=filters)
-
-        # DEBUG MODE
-        if debug: debug_dump(rest_uri, r)
-
-        return r.json()
+    return ryuendpoints.ENDPOINTS["aggregateflow"].call(SESSION, API, DPID, filters=filters)
 
 
 
@@ -270,17 +348,7 @@ def get_table_stats(DPID):
     '''
 
     # Path: /stats/table/<DPID>
-    rest_uri = API + "/stats/table/" + str(DPID)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["table"].call(SESSION, API, DPID)
 
 
 
@@ -306,17 +374,7 @@ def get_table_features(DPID):
     '''
 
     # Path: /stats/tablefeatures/<DPID>
-    rest_uri = API + "/stats/tablefeatures/" + str(DPID)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["tablefeatures"].call(SESSION, API, DPID)
 
 
 
@@ -349,24 +407,10 @@ def get_port_stats(DPID, port=None):
     '''
 
     # Path: /stats/port/<DPID>[/portnumber]
-    rest_uri = API + "/stats/port/" + str(DPID)
 
     ########## SPECIFYING A PORT IS DISABLED DUE TO BUG ##########
-    # # If ID is specified to filter/match results, alter URI accordingly.
-    # if port is not None:
-    #     # Modify URI to filter port
-    #     rest_uri = rest_uri + '/' + str(port)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    # The port is not passed on: values=(port,) would filter the results.
+    return ryuendpoints.ENDPOINTS["port"].call(SESSION, API, DPID)
 
 
 
@@ -396,27 +440,7 @@ def get_port_description(DPID, port=None, openflow=None):
     '''
 
     # Path: /stats/portdesc/<DPID>[/portnumber] (Port number usage restricted to OpenFlow v1.5+)
-    rest_uri = API + "/stats/portdesc/" + str(DPID)
-
-    if port is not None and openflow is None:
-        print "[ WARNING ]: Port filter specified, but OpenFlow version was not. Filtering is only compatible with OpenFlow v1.5+. Defaulting to no filter & dumping all ports."
-    elif port is not None and openflow < 1.5:
-        print "[ WARNING ]: Port filter specified, but REST API does not allow filtering with specified OpenFlow version (v" + str(openflow) + "). Filtering is only compatible with OpenFlow v1.5+. Defaulting to no filter & dumping all ports."
-    elif port is not None and openflow >= 1.5:
-        # If ID is specified to filter/match results, and compatible OpenFlow version...
-        # Modify URI to filter port
-        rest_uri = rest_uri + '/' + str(port)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["portdesc"].call(SESSION, API, DPID, values=(port,), openflow=openflow)
 
 
 
@@ -447,44 +471,8 @@ def get_queue_stats(DPID, port=None, queue=None):
     content = ryufunc.get_queue_stats('123917682136708')                # Will get stats for ALL Queue IDs on ALL ports.
     '''
 
-    # Path: /stats/queue/<DPID>[/portnumber[/<queue_id>]]
-    rest_uri = API + "/stats/queue/" + str(DPID)
-
-    # Set URI based on which parameters/filters have been passed in
-    if any(arg is None for arg in [port, queue]):
-        # Only one of either queueID# or port# has been specified...
-
-        if port is not None:
-            # Port# has been specified. QueueID# has NOT been specified. Dump ALL queue stats for specified port.
-
-            # Modify URI to filter port only
-                # Example (DPID == 1, Port == 2): http://localhost:8080/stats/queuedesc/1/2
-            rest_uri = rest_uri + '/' + str(port)
-
-        elif queue is not None:
-            # QueueID has been specified. Port# has NOT been specified. Dump matched QueueID for ALL ports.
-
-            # Modify URI to filter QueueID only
-                # Example (DPID == 1, QueueID == 4): http://localhost:8080/stats/queuedesc/1/ALL/4
-            rest_uri = rest_uri + '/ALL/' + str(queue)
-
-    elif all(arg is not None for arg in [port, queue]):
-        # Both Port# AND QueueID have been specified. Dump required data only.
-
-        # Modify URI to filter both Port# and QueueID#
-            # Example (DPID == 1, Port == 2, QueueID == 4): http://localhost:8080/stats/queuedesc/1/2/4
-        rest_uri = rest_uri + '/' + str(port) + '/' + str(queue)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    # Path: /stats/queue/<DPID>[/portnumber[/<queue_id>]] (/ALL/<queue_id> if only the queue is given)
+    return ryuendpoints.ENDPOINTS["queue"].call(SESSION, API, DPID, values=(port, queue))
 
 
 
@@ -515,23 +503,7 @@ def get_queue_config(DPID, port=None):
     '''
 
     # Path: /stats/queueconfig/<DPID>[/portnumber] (API is DEPRECIATED in OpenFlow v1.4+)
-    rest_uri = API + "/stats/queueconfig/" + str(DPID)
-
-    # If ID is specified to filter/match results, alter URI accordingly.
-    if port is not None:
-        # Modify URI to filter port
-        rest_uri = rest_uri + '/' + str(port)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["queueconfig"].call(SESSION, API, DPID, values=(port,))
 
 
 
@@ -564,44 +536,8 @@ def get_queue_description(DPID, port=None, queue=None):
     This API is only compatible with OpenFlow v1.4+. For v1.0 - v1.3, use: get_queue_config()
     '''
 
-    # Path: /stats/queuedesc/<DPID>[/portnumber[/<queue_id>]]
-    rest_uri = API + "/stats/queuedesc/" + str(DPID)
-
-    # Set URI based on which parameters/filters have been passed in
-    if any(arg is None for arg in [port, queue]):
-        # Only one of either queueID# or port# has been specified...
-
-        if port is not None:
-            # Port# has been specified. QueueID# has NOT been specified. Dump ALL queue descriptions for specified port.
-
-            # Modify URI to filter port only
-                # Example (DPID == 1, Port == 2): http://localhost:8080/stats/queuedesc/1/2
-            rest_uri = rest_uri + '/' + str(port)
-
-        elif queue is not None:
-            # QueueID has been specified. Port# has NOT been specified. Dump matched QueueID for ALL ports.
-
-            # Modify URI to filter QueueID only
-                # Example (DPID == 1, QueueID == 4): http://localhost:8080/stats/queuedesc/1/ALL/4
-            rest_uri = rest_uri + '/ALL/' + str(queue)
-
-    elif all(arg is not None for arg in [port, queue]):
-        # Both Port# AND QueueID have been specified. Dump required data only.
-
-        # Modify URI to filter both Port# and QueueID#
-            # Example (DPID == 1, Port == 2, QueueID == 4): http://localhost:8080/stats/queuedesc/1/2/4
-        rest_uri = rest_uri + '/' + str(port) + '/' + str(queue)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    # Path: /stats/queuedesc/<DPID>[/portnumber[/<queue_id>]] (/ALL/<queue_id> if only the queue is given)
+    return ryuendpoints.ENDPOINTS["queuedesc"].call(SESSION, API, DPID, values=(port, queue))
 
 
 
@@ -629,29 +565,13 @@ def get_group_stats(DPID, group=None):
     content = ryufunc.get_group_stats('123917682136708')       # Will get stats for ALL groups
     '''
 
-    # Path: /stats/group/<DPID>[/portnumber]
-    rest_uri = API + "/stats/group/" + str(DPID)
-
-    # If ID is specified to filter/match results, alter URI accordingly.
-    if group is not None:
-        # Modify URI to filter meters
-        rest_uri = rest_uri + '/' + str(group)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    # Path: /stats/group/<DPID>[/groupID]
+    return ryuendpoints.ENDPOINTS["group"].call(SESSION, API, DPID, values=(group,))
 
 
 
 ## ##
-def get_group_description(DPID, port=None, openflow=None):
+def get_group_description(DPID, group=None, openflow=None, port=None):
 
     '''
     Description:
@@ -662,41 +582,23 @@ def get_group_description(DPID, port=None, openflow=None):
 
     Arguments:
     DPID: Datapath ID (DPID) of the target switch.
-    port: [OPTIONAL] Specific group# to grab description for. If not specfied, info for all groups is returned. (Restricted to OpenFlow v1.5+)
+    group: [OPTIONAL] Specific group ID# to grab description for. If not specfied, info for all groups is returned. (Restricted to OpenFlow v1.5+)
+    openflow: [OPTIONAL] The OpenFlow version of the switch. Required to filter by group ID.
+    port: [OPTIONAL] Former name of the group argument. Use group instead.
 
     Return value:
     JSON structure containing the group decription. See link above for example message body.
 
     Usage:
-    content = ryufunc.get_group_description('123917682136708', 3)    # Will get desc for ONLY Group ID #3. Switch must be OpenFlow v1.5+
+    content = ryufunc.get_group_description('123917682136708', group=3, openflow=1.5)    # Will get desc for ONLY Group ID #3. Switch must be OpenFlow v1.5+
     content = ryufunc.get_group_description('123917682136708')       # Will get desc for ALL groups. OpenFlow v1.0 - v1.4
 
     Restrictions:
     Specifying a specific groupID is limited to OpenFlow v1.5 and later.
     '''
 
-    # Path: /stats/groupdesc/<DPID>[/portnumber] (Port number usage restricted to OpenFlow v1.5+)
-    rest_uri = API + "/stats/groupdesc/" + str(DPID)
-
-    if port is not None and openflow is None:
-        print "[ WARNING ]: Port filter specified, but OpenFlow version was not. Filtering is only compatible with OpenFlow v1.5+. Defaulting to no filter & dumping all ports."
-    elif port is not None and openflow < 1.5:
-        print "[ WARNING ]: Port filter specified, but REST API does not allow filtering with specified OpenFlow version (v" + str(openflow) + "). Filtering is only compatible with OpenFlow v1.5+. Defaulting to no filter & dumping all ports."
-    elif port is not None and openflow >= 1.5:
-        # If ID is specified to filter/match results, and compatible OpenFlow version...
-        # Modify URI to filter port
-        rest_uri = rest_uri + '/' + str(port)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    # Path: /stats/groupdesc/<DPID>[/groupID] (Group ID usage restricted to OpenFlow v1.5+)
+    return ryuendpoints.ENDPOINTS["groupdesc"].call(SESSION, API, DPID, values=(group if group is not None else port,), openflow=openflow)
 
 
 
@@ -721,18 +623,7 @@ def get_group_features(DPID):
     '''
 
     # Path: /stats/groupfeatures/<DPID>
-    rest_uri = API + "/stats/groupfeatures/" + str(DPID)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["groupfeatures"].call(SESSION, API, DPID)
 
 
 
@@ -760,24 +651,8 @@ def get_meter_stats(DPID, meter=None):
     content1 = ryufunc.get_meter_stats('123917682136708')       # Will get stats for ALL meters
     '''
 
-    # Path: /stats/group/<DPID>[/portnumber]
-    rest_uri = API + "/stats/meter/" + str(DPID)
-
-    # If ID is specified to filter/match results, alter URI accordingly.
-    if meter is not None:
-        # Modify URI to filter meters
-        rest_uri = rest_uri + '/' + str(meter)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    # Path: /stats/meter/<DPID>[/meterID]
+    return ryuendpoints.ENDPOINTS["meter"].call(SESSION, API, DPID, values=(meter,))
 
 
 
@@ -812,31 +687,8 @@ def get_meter_description(DPID, meter=None, openflow=1.0):
     Pass in OpenFlow version as argument if using 1.5+, else method will execute v1.0-1.4 call.
     '''
 
-    # Set URI based on OpenFlow version
-    if openflow < 1.5:
-        # OpenFlow v1.0 - 1.4
-        # REST API path: /stats/meterconfig/<dpid>[/<meter_id>]
-        rest_uri = API + "/stats/meterconfig/" + str(DPID)
-    else:
-        # OpenFlow v1.5+
-        # REST API path: /stats/meterdesc/<dpid>[/<meter_id>]
-        rest_uri = API + "/stats/meterdesc/" + str(DPID)
-
-    # If ID is specified to filter/match results, alter URI accordingly.
-    if meter is not None:
-        # Modify URI to filter meters
-        rest_uri = rest_uri + '/' + str(meter)   # TODO: Add try/catch in case meter does not exist.
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    # Path: /stats/meterconfig/<DPID>[/meterID] (OpenFlow v1.0 - 1.4), /stats/meterdesc/<DPID>[/meterID] (OpenFlow 1.5+)
+    return ryuendpoints.ENDPOINTS["meterconfig"].call(SESSION, API, DPID, values=(meter,), openflow=openflow)
 
 
 
@@ -861,18 +713,7 @@ def get_meter_features(DPID):
     '''
 
     # Path: /stats/meterfeatures/<DPID>
-    rest_uri = API + "/stats/meterfeatures/" + str(DPID)
-
-    # Make call to REST API (GET)
-    r = requests.get(rest_uri)
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return r.json()
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["meterfeatures"].call(SESSION, API, DPID)
 
 
 
@@ -907,11 +748,11 @@ def get_role(DPID):
     # rest_uri = API + "/stats/role/" + str(DPID)
     #
     # # Make call to REST API (GET)
-    # r = requests.get(rest_uri)
+    # r = SESSION.get(rest_uri)
     #
     # # Ryu returns HTTP 200 status if successful
     # if r.status_code == 200:
-    #     return r.json()
+    #     return SESSION.decode(r)
     # else:
     #     return False
     #     # If submission fails, Ryu returns HTTP 400 status.
@@ -947,6 +788,7 @@ def add_flow(payload):
             "actions":[{ "type":"OUTPUT", "port": 2 }]
          }
      See link for details on how to construct payload.
+     A filled in ryutemplate.FlowTemplate may be given instead of a dictionary.
 
     Return value:
     Boolean. True if successful, False if error.
@@ -956,18 +798,7 @@ def add_flow(payload):
     '''
 
     # Path: /stats/flowentry/add
-    rest_uri = API + "/stats/flowentry/add"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["flowentry/add"].call(SESSION, API, payload=payload)
 
 
 
@@ -993,6 +824,7 @@ def modify_flow(payload):
             "actions":[{ "type":"OUTPUT", "port": 2 }]
          }
     See link for details on how to construct payload.
+    A filled in ryutemplate.FlowTemplate may be given instead of a dictionary.
 
     Return value:
     Boolean. True if successful, False if error.
@@ -1002,18 +834,7 @@ def modify_flow(payload):
     '''
 
     # Path: /stats/flowentry/modify
-    rest_uri = API + "/stats/flowentry/modify"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["flowentry/modify"].call(SESSION, API, payload=payload)
 
 
 
@@ -1039,6 +860,7 @@ def modify_flow_strict(payload):
             "actions":[{ "type":"OUTPUT", "port": 2 }]
         }
     See link for details on how to construct payload.
+    A filled in ryutemplate.FlowTemplate may be given instead of a dictionary.
 
     Return value:
     Boolean. True if successful, False if error.
@@ -1048,18 +870,7 @@ def modify_flow_strict(payload):
     '''
 
     # Path: /stats/flowentry/modify_strict
-    rest_uri = API + "/stats/flowentry/modify_strict"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["flowentry/modify_strict"].call(SESSION, API, payload=payload)
 
 
 
@@ -1085,6 +896,7 @@ def delete_flow(payload):
             "actions":[{ "type":"OUTPUT", "port": 2 }]
         }
     See link for details on how to construct payload.
+    A filled in ryutemplate.FlowTemplate may be given instead of a dictionary.
 
     Return value:
     Boolean. True if successful, False if error.
@@ -1093,19 +905,8 @@ def delete_flow(payload):
     R.delete_flow(payload)   # Use if statement to check if successful.
     '''
 
-    # Path: /stats/flowentry/modify_strict
-    rest_uri = API + "/stats/flowentry/delete"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    # Path: /stats/flowentry/delete
+    return ryuendpoints.ENDPOINTS["flowentry/delete"].call(SESSION, API, payload=payload)
 
 
 
@@ -1131,6 +932,7 @@ def delete_flow_strict(payload):
             "actions":[{ "type":"OUTPUT", "port": 2 }]
         }
     See link for details on how to construct payload.
+    A filled in ryutemplate.FlowTemplate may be given instead of a dictionary.
 
     Return value:
     Boolean. True if successful, False if error.
@@ -1139,19 +941,8 @@ def delete_flow_strict(payload):
     R.delete_flow_strict(payload)   # Use if statement to check if successful.
     '''
 
-    # Path: /stats/flowentry/modify_strict
-    rest_uri = API + "/stats/flowentry/delete_strict"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    # Path: /stats/flowentry/delete_strict
+    return ryuendpoints.ENDPOINTS["flowentry/delete_strict"].call(SESSION, API, payload=payload)
 
 
 
@@ -1175,19 +966,106 @@ def delete_flow_all(DPID):
     R.delete_flow_all(DPID)   # Use if statement to check if successful.
     '''
 
-    # Path: /stats/flowentry/modify_strict
-    rest_uri = API + "/stats/flowentry/clear/" + str(DPID)
+    # Path: /stats/flowentry/clear/<DPID>
+    return ryuendpoints.ENDPOINTS["flowentry/clear"].call(SESSION, API, DPID)
 
-    # Make call to REST API (DELETE)
-    r = requests.delete(rest_uri)
 
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
+
+###### Modify Flow Entries in Bulk ######
+
+## ##
+def add_flows(payloads, window=ryusession.WINDOW):
+
+    '''
+    Description:
+    Add many flow entries, keeping several calls in flight at once over pooled connections.
+
+    Link:
+    http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#add-a-flow-entry
+
+    Arguments:
+    payloads: List of data payloads, each in the same format as for add_flow().
+    window: [OPTIONAL] Maximum number of calls in flight at once. Defaults to ryusession.WINDOW.
+
+    Return value:
+    List of booleans, one per payload and in the same order. True if that flow was added, False if error.
+
+    Usage:
+    status = ryufunc.add_flows(payloads, window=64)
+    failed = [payload for payload, ok in zip(payloads, status) if not ok]
+    '''
+
+    # Path: /stats/flowentry/add
+    rest_uri = ryuendpoints.ENDPOINTS["flowentry/add"].uri(API)
+
+    # Make calls to REST API (POST)
+    return SESSION.post_many(rest_uri, payloads, window)
+
+
+
+## ##
+def modify_flows(payloads, strict=False, window=ryusession.WINDOW):
+
+    '''
+    Description:
+    Modify flow entries for many payloads, keeping several calls in flight at once over pooled connections.
+
+    Link:
+    http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#modify-all-matching-flow-entries
+
+    Arguments:
+    payloads: List of data payloads, each in the same format as for modify_flow().
+    strict: [OPTIONAL] If True, each payload is applied as modify_flow_strict(). Otherwise as modify_flow().
+    window: [OPTIONAL] Maximum number of calls in flight at once. Defaults to ryusession.WINDOW.
+
+    Return value:
+    List of booleans, one per payload and in the same order. True if successful, False if error.
+
+    Usage:
+    status = ryufunc.modify_flows(payloads, strict=True)
+    '''
+
+    # Path: /stats/flowentry/modify or /stats/flowentry/modify_strict
+    if strict:
+        rest_uri = ryuendpoints.ENDPOINTS["flowentry/modify_strict"].uri(API)
     else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+        rest_uri = ryuendpoints.ENDPOINTS["flowentry/modify"].uri(API)
+
+    # Make calls to REST API (POST)
+    return SESSION.post_many(rest_uri, payloads, window)
+
+
+
+## ##
+def delete_flows(payloads, strict=False, window=ryusession.WINDOW):
+
+    '''
+    Description:
+    Delete flow entries for many payloads, keeping several calls in flight at once over pooled connections.
+
+    Link:
+    http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#delete-all-matching-flow-entries
+
+    Arguments:
+    payloads: List of data payloads, each in the same format as for delete_flow().
+    strict: [OPTIONAL] If True, each payload is applied as delete_flow_strict(). Otherwise as delete_flow().
+    window: [OPTIONAL] Maximum number of calls in flight at once. Defaults to ryusession.WINDOW.
+
+    Return value:
+    List of booleans, one per payload and in the same order. True if successful, False if error.
+
+    Usage:
+    status = ryufunc.delete_flows(payloads, strict=True)
+    '''
+
+    # Path: /stats/flowentry/delete or /stats/flowentry/delete_strict
+    if strict:
+        rest_uri = ryuendpoints.ENDPOINTS["flowentry/delete_strict"].uri(API)
+    else:
+        rest_uri = ryuendpoints.ENDPOINTS["flowentry/delete"].uri(API)
+
+    # Make calls to REST API (POST)
+    return SESSION.post_many(rest_uri, payloads, window)
 
 
 
@@ -1226,18 +1104,7 @@ def add_group(payload):
     '''
 
     # Path: /stats/groupentry/add
-    rest_uri = API + "/stats/groupentry/add"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["groupentry/add"].call(SESSION, API, payload=payload)
 
 
 
@@ -1274,18 +1141,7 @@ def modify_group(payload):
     '''
 
     # Path: /stats/groupentry/modify
-    rest_uri = API + "/stats/groupentry/modify"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["groupentry/modify"].call(SESSION, API, payload=payload)
 
 
 
@@ -1316,18 +1172,7 @@ def delete_group(payload):
     '''
 
     # Path: /stats/groupentry/delete
-    rest_uri = API + "/stats/groupentry/delete"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["groupentry/delete"].call(SESSION, API, payload=payload)
 
 
 
@@ -1361,18 +1206,7 @@ def modify_port(payload):
     '''
 
     # Path: /stats/portdesc/modify
-    rest_uri = API + "/stats/portdesc/modify"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["portdesc/modify"].call(SESSION, API, payload=payload)
 
 
 
@@ -1409,18 +1243,7 @@ def add_meter(payload):
     '''
 
     # Path: /stats/meterentry/add
-    rest_uri = API + "/stats/meterentry/add"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["meterentry/add"].call(SESSION, API, payload=payload)
 
 
 
@@ -1455,18 +1278,7 @@ def modify_meter(payload):
     '''
 
     # Path: /stats/meterentry/modify
-    rest_uri = API + "/stats/meterentry/modify"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["meterentry/modify"].call(SESSION, API, payload=payload)
 
 
 
@@ -1497,18 +1309,7 @@ def delete_meter(payload):
     '''
 
     # Path: /stats/meterentry/delete
-    rest_uri = API + "/stats/meterentry/delete"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["meterentry/delete"].call(SESSION, API, payload=payload)
 
 
 
@@ -1541,18 +1342,7 @@ def modify_role(payload):
     '''
 
     # Path: /stats/role
-    rest_uri = API + "/stats/role"
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    return ryuendpoints.ENDPOINTS["role"].call(SESSION, API, payload=payload)
 
 
 
@@ -1588,19 +1378,8 @@ def send_experimenter(DPID, payload):
     Boolean. True if successful, False if error.
 
     Usage:
-    R.add_flow(payload)   # Use if statement to check if successful.
+    ryufunc.send_experimenter(DPID, payload)   # Use if statement to check if successful.
     '''
 
-    # Path: /stats/experimenter/<dpid>
-    rest_uri = API + "/stats/flowentry/add/" + str(DPID)
-
-    # Make call to REST API (POST)
-    r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-    # Ryu returns HTTP 200 status if successful
-    if r.status_code == 200:
-        return True
-    else:
-        return False
-        # If submission fails, Ryu returns HTTP 400 status.
-        # Catch all for HTTP errors.
+    # Path: /stats/experimenter/<DPID>
+    return ryuendpoints.ENDPOINTS["experimenter"].call(SESSION, API, DPID, payload=payload)
@@ -0,0 +1,313 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##                FLOW INDEX MODULE                ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides FlowIndex, a local copy of a switch's flow table that can be queried without calling the REST API.
+#   Each flow is indexed by:
+#       * Every field of its match, e.g. in_port, eth_type, ipv4_dst (Ryu's OpenFlow v1.0 names are accepted too).
+#       * Its table_id, priority and cookie.
+#       * The ports it outputs to ("output"), including outputs inside WRITE_ACTIONS.
+#   A query looks up each given field in a hash table and intersects the results, so it takes time proportional to the
+#   number of flows returned, not the size of the table.
+#   Flows are identified the same way as by the switch (and by ryureconcile): by table_id, priority and match.
+#   Refreshing with a newer snapshot only re-indexes the flows that were added, removed or changed.
+
+### USAGE INSTRUCTIONS ###
+#   1. Build an index from the flow table of a switch:
+#           >> index = switch1.get_flow_index()
+#           >> index = ryufunc.get_flow_index(DPID)
+#      * Or from the result of get_flows(), a list of flows or a FlowTable:
+#           >> index = FlowIndex.from_flows(switch1.get_flows())
+#
+#   2. Query it. Every given field must match. A list of values matches any of them:
+#           >> index.find(in_port=3)
+#           >> index.find(output=7, table_id=0)
+#           >> index.find(cookie=0x10, eth_type=0x800)
+#           >> index.find(in_port=[1, 2])
+#      * Only flows that match on the field are returned: find(in_port=3) does not return flows that match any in_port.
+#      * Results are in lookup order: by table_id, then highest priority first.
+#
+#   3. Keep it up to date with a newer snapshot, or with your own changes:
+#           >> added, changed, removed = index.refresh(switch1.get_flows())
+#           >> index.add(flow)
+#           >> index.remove(flow)
+#
+#   4. List the values in use for a field, with the number of flows using each:
+#           >> index.values("output")         # e.g. {1: 120, 2: 98, 'controller': 1}
+
+
+import re
+
+try:
+    from . import ryureconcile
+except (ImportError, ValueError):
+    import ryureconcile
+
+
+### FLOW FIELDS ###
+#   Fields of a flow entry (outside its match) that are indexed.
+FIELDS = ("table_id", "priority", "cookie")
+
+# Port of each OUTPUT action in a normalised action string (matches inside WRITE_ACTIONS too)
+_OUTPUT = re.compile(r"OUTPUT:([^,\]\}\)\s]+)")
+
+
+
+## Return the indexed (field, value) pairs of a flow ##
+def flow_terms(flow):
+    terms = set()
+    for field in FIELDS:
+        terms.add((field, int(flow.get(field, ryureconcile.DEFAULTS[field]))))
+
+    match = flow.get("match") or {}
+    for field, value in match.items():
+        terms.add((ryureconcile.MATCH_ALIASES.get(field, field), ryureconcile._match_value(value)))
+
+    for action in flow.get("actions") or ():
+        for port in _OUTPUT.findall(ryureconcile._action(action)):
+            terms.add(("output", ryureconcile._match_value(port)))
+    return terms
+
+
+
+## Sort key of a flow key (table_id, priority, match): lookup order of the switch ##
+def _order(key):
+    return (key[0], -key[1])
+
+
+
+class FlowIndex(object):
+
+    def __init__(self, flows=(), DPID=None):
+        # DPID of the switch the flows were read from
+        self.DPID = DPID
+
+        # Flow key (table_id, priority, match) -> flow
+        self.flows = {}
+
+        # Field -> value -> set of flow keys
+        self._index = {}
+
+        for flow in flows:
+            self.add(flow)
+
+
+
+    ## Build a FlowIndex from the result of get_flows() ##
+    @classmethod
+    def from_flows(cls, flows):
+
+        '''
+        Description:
+        Build a FlowIndex from the dictionary returned by get_flows().
+
+        Arguments:
+        flows: Return value of get_flows(), e.g. {"123917682136708": [ {flow}, {flow}, ... ]}
+
+        Return value:
+        FlowIndex containing the flows of the (first) switch in the dictionary.
+
+        Usage:
+        index = FlowIndex.from_flows(switch1.get_flows())
+        '''
+
+        for DPID, entries in flows.items():
+            return cls(entries, DPID)
+        return cls()
+
+
+
+    def _insert(self, key, terms):
+        for term in terms:
+            field, value = term
+            values = self._index.get(field)
+            if values is None:
+                values = self._index[field] = {}
+            keys = values.get(value)
+            if keys is None:
+                keys = values[value] = set()
+            keys.add(key)
+
+
+
+    def _discard(self, key, terms):
+        for field, value in terms:
+            values = self._index[field]
+            keys = values[value]
+            keys.discard(key)
+            if not keys:
+                del values[value]
+
+
+
+    ## Add a flow, replacing the flow with the same table_id, priority and match ##
+    def add(self, flow):
+        key = ryureconcile.flow_key(flow)
+        old = self.flows.get(key)
+        terms = flow_terms(flow)
+        if old is not None:
+            old_terms = flow_terms(old)
+            self._discard(key, old_terms - terms)
+            terms = terms - old_terms
+        self.flows[key] = flow
+        self._insert(key, terms)
+
+
+
+    ## Remove the flow with the same table_id, priority and match. Returns False if there is none ##
+    def remove(self, flow):
+        key = ryureconcile.flow_key(flow)
+        old = self.flows.pop(key, None)
+        if old is None:
+            return False
+        self._discard(key, flow_terms(old))
+        return True
+
+
+
+    ## Bring the index in line with a newer snapshot of the flow table ##
+    def refresh(self, flows):
+
+        '''
+        Description:
+        Replace the indexed flows with a newer snapshot. Only flows that were added or removed, or whose cookie or
+        actions changed, are re-indexed. Flows whose counters changed are replaced without re-indexing.
+
+        Arguments:
+        flows: Return value of get_flows() (for this switch), a list of flows or a FlowTable.
+
+        Return value:
+        Tuple of the number of flows (added, changed, removed).
+
+        Usage:
+        added, changed, removed = index.refresh(switch1.get_flows())
+        '''
+
+        if isinstance(flows, dict):
+            # get_flows() result: the flows of the (first) switch in the dictionary
+            flows = next(iter(flows.values()), [])
+
+        added = changed = 0
+        seen = set()
+        for flow in flows:
+            key = ryureconcile.flow_key(flow)
+            seen.add(key)
+            old = self.flows.get(key)
+            if old is None:
+                added += 1
+                self._insert(key, flow_terms(flow))
+            elif old.get("cookie") != flow.get("cookie") or old.get("actions") != flow.get("actions"):
+                # Only the cookie and actions can change the terms of a flow with the same key
+                old_terms = flow_terms(old)
+                terms = flow_terms(flow)
+                if terms != old_terms:
+                    changed += 1
+                    self._discard(key, old_terms - terms)
+                    self._insert(key, terms - old_terms)
+            self.flows[key] = flow
+
+        removed = 0
+        for key in [key for key in self.flows if key not in seen]:
+            self._discard(key, flow_terms(self.flows.pop(key)))
+            removed += 1
+
+        return added, changed, removed
+
+
+
+    ## Return the keys of the flows with any of the given values of a field ##
+    def _lookup(self, field, value):
+        field = ryureconcile.MATCH_ALIASES.get(field, field)
+        values = self._index.get(field, {})
+        if isinstance(value, (list, tuple, set, frozenset)):
+            keys = set()
+            for v in value:
+                keys.update(values.get(ryureconcile._match_value(v), ()))
+            return keys
+        return values.get(ryureconcile._match_value(value), set())
+
+
+
+    ## Find the flows matching every given field ##
+    def find(self, **criteria):
+
+        '''
+        Description:
+        Return the flows with every given field equal to the given value (or to any of the values, if a list is given).
+
+        Arguments:
+        criteria: Field names and values. Any match field (e.g. in_port=3, ipv4_dst="10.0.0.0/24"), table_id, priority,
+                  cookie, or output (the port of an OUTPUT action). Values may be in any format Ryu accepts, e.g. 0x800 or "0x800".
+
+        Return value:
+        List of flows (as given to the index), by table_id and then highest priority first.
+        Every flow in the index if no criteria are given.
+
+        Usage:
+        index.find(in_port=3)
+        index.find(output=7, table_id=0)
+        index.find(cookie=0x10, in_port=[1, 2])
+        '''
+
+        if not criteria:
+            return [self.flows[key] for key in sorted(self.flows, key=_order)]
+
+        # Intersect the smallest sets first, so the work is bounded by the most selective field
+        matches = sorted((self._lookup(field, value) for field, value in criteria.items()), key=len)
+        keys = matches[0]
+        for other in matches[1:]:
+            if not keys:
+                break
+            keys = keys & other
+
+        return [self.flows[key] for key in sorted(keys, key=_order)]
+
+
+
+    ## Count the flows matching every given field ##
+    def count(self, **criteria):
+        if not criteria:
+            return len(self.flows)
+        matches = sorted((self._lookup(field, value) for field, value in criteria.items()), key=len)
+        return len(matches[0].intersection(*matches[1:]))
+
+
+
+    ## Return the values in use for a field, with the number of flows using each ##
+    def values(self, field):
+        field = ryureconcile.MATCH_ALIASES.get(field, field)
+        return dict((value, len(keys)) for value, keys in self._index.get(field, {}).items())
+
+
+
+    def __len__(self):
+        return len(self.flows)
+
+
+
+    def __iter__(self):
+        return iter(self.flows.values())
+
+
+
+    def __contains__(self, flow):
+        return ryureconcile.flow_key(flow) in self.flows
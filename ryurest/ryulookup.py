@@ -0,0 +1,435 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##                FLOW LOOKUP MODULE               ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides FlowLookup, which answers "which flow will this packet hit?" from a snapshot of a flow table,
+#   without scanning every flow.
+#       * Flows matching an IPv4 or IPv6 destination prefix (ipv4_dst/nw_dst, ipv6_dst) are kept in a prefix trie.
+#         Each level of the trie (prefix length) is a hash table, so a lookup only visits the prefix lengths in use
+#         (at most 33 for IPv4 and 129 for IPv6), however many flows the table has.
+#       * At each trie node, flows are grouped by the set of other fields (and masks) they match on. Each group is a
+#         hash table of match values, so the flows matching the packet in a group are found with a single lookup.
+#       * The flows found are compared by priority: the highest priority flow wins, as on the switch.
+#   Lookups are per table_id. trace() follows GOTO_TABLE instructions from table 0.
+
+### USAGE INSTRUCTIONS ###
+#   1. Build a lookup from the flow table of a switch:
+#           >> lookup = FlowLookup.from_flows(switch1.get_flows())
+#      * A list of flows, a FlowTable or a FlowIndex may also be given: FlowLookup(switch1.get_flow_table())
+#
+#   2. Describe the packet headers as a dictionary of match fields, in any format Ryu accepts:
+#           >> packet = {"in_port": 1, "eth_type": 0x800, "ipv4_src": "10.0.0.1", "ipv4_dst": "10.1.2.3", "ip_proto": 6}
+#
+#   3. Find the flow the packet hits in a table, every flow it matches, or the flows it hits through the pipeline:
+#           >> flow = lookup.lookup(packet, table_id=0)       # None if no flow matches (table miss)
+#           >> flows = lookup.matches(packet, table_id=0)     # Highest priority first
+#           >> path = lookup.trace(packet)                    # Follows GOTO_TABLE from table 0
+#
+#   Only the fields given are known about the packet: a flow matching on a field missing from the packet does not match.
+#   OpenFlow prerequisites (e.g. eth_type=0x800 for ipv4_dst) are not checked, so include them in the packet.
+
+
+import binascii
+import bisect
+import re
+import socket
+
+try:
+    from . import ryureconcile
+except (ImportError, ValueError):
+    import ryureconcile
+
+
+### PREFIX FIELDS ###
+#   Match fields kept in the prefix trie (after renaming with ryureconcile.MATCH_ALIASES), with their width in bits.
+PREFIX_FIELDS = {
+    "nw_dst": 32,
+    "ipv6_dst": 128,
+}
+
+# Table of each GOTO_TABLE instruction in a normalised action string
+_GOTO = re.compile(r"GOTO_TABLE:(\d+)")
+
+# MAC address, e.g. 00:00:00:00:00:04
+_MAC = re.compile(r"^[0-9a-f]{2}(:[0-9a-f]{2}){5}$")
+
+# int and long in Python 2, int in Python 3
+_INTEGERS = (int, type(2 ** 64))
+
+# str and unicode in Python 2, str in Python 3
+try:
+    _STRINGS = (str, unicode)
+except NameError:
+    _STRINGS = (str,)
+
+_MISSING = object()
+
+
+
+## Convert packed address bytes to an integer ##
+def _packed(address):
+    return int(binascii.hexlify(address), 16)
+
+
+
+## Parse one match value. Returns (value, width in bits or None) ##
+def _parse(value):
+    if not isinstance(value, _STRINGS):
+        return value, None
+
+    value = value.strip().lower()
+    try:
+        return int(value, 0), None
+    except ValueError:
+        pass
+    if _MAC.match(value):
+        return int(value.replace(":", ""), 16), 48
+    try:
+        return _packed(socket.inet_pton(socket.AF_INET, value)), 32
+    except (socket.error, ValueError):
+        pass
+    try:
+        return _packed(socket.inet_pton(socket.AF_INET6, value)), 128
+    except (socket.error, ValueError):
+        pass
+    return value, None
+
+
+
+## Parse a (possibly masked) match value. Returns (value, mask or None, width in bits or None) ##
+def match_value(value):
+
+    '''
+    Description:
+    Parse a match value as reported by Ryu, e.g. 1, "0x800", "10.0.0.0/24", "10.0.0.0/255.255.255.0",
+    "2001:db8::/32", "00:00:00:00:00:04/ff:ff:ff:00:00:00".
+
+    Return value:
+    Tuple of (value, mask, width). Addresses and numbers are returned as integers, with the mask applied.
+    mask is None if the value is not masked. width is the number of bits of an address (None for numbers).
+    Values that cannot be parsed are returned as lower case strings.
+    '''
+
+    mask = None
+    if isinstance(value, _STRINGS) and "/" in value:
+        value, mask = value.split("/", 1)
+
+    value, width = _parse(value)
+    if mask is None:
+        return value, None, width
+
+    if mask.strip().isdigit() and width:
+        # Prefix length, e.g. /24
+        length = int(mask)
+        mask = ((1 << width) - 1) ^ ((1 << (width - length)) - 1)
+    else:
+        mask, _ = _parse(mask)
+
+    if not isinstance(value, _INTEGERS) or not isinstance(mask, _INTEGERS):
+        return value, None, width
+    return value & mask, mask, width
+
+
+
+## Return the prefix length of a contiguous mask, or None ##
+def _prefix_length(mask, width):
+    if mask is None:
+        return width
+    length = bin(mask).count("1")
+    if mask != ((1 << width) - 1) ^ ((1 << (width - length)) - 1):
+        return None
+    return length
+
+
+
+class _Node(object):
+
+    '''
+    Flows at one node of the trie (or the flows without a prefix), grouped by the other fields they match on.
+    '''
+
+    __slots__ = ("groups",)
+
+    def __init__(self):
+        # ((field, mask), ...) -> tuple of masked values -> list of (-priority, sequence number, flow)
+        self.groups = {}
+
+
+
+    def add(self, fields, values, entry):
+        group = self.groups.get(fields)
+        if group is None:
+            group = self.groups[fields] = {}
+        entries = group.get(values)
+        if entries is None:
+            group[values] = [entry]
+        else:
+            bisect.insort(entries, entry)
+
+
+
+    ## Yield the (-priority, sequence number, flow) lists matching the packet ##
+    def find(self, packet):
+        for fields, group in self.groups.items():
+            values = []
+            for field, mask in fields:
+                value = packet.get(field, _MISSING)
+                if value is _MISSING:
+                    break
+                if mask is not None:
+                    if not isinstance(value, _INTEGERS):
+                        break
+                    value &= mask
+                values.append(value)
+            else:
+                entries = group.get(tuple(values))
+                if entries:
+                    yield entries
+
+
+
+class _Table(object):
+
+    '''
+    Trie of the flows of one table.
+    '''
+
+    def __init__(self):
+        # Flows without a usable prefix
+        self.root = _Node()
+
+        # Prefix field -> prefix length -> masked address -> _Node
+        self.levels = dict((field, {}) for field in PREFIX_FIELDS)
+
+        # Prefix field -> prefix lengths in use
+        self.lengths = dict((field, []) for field in PREFIX_FIELDS)
+
+
+
+    def node(self, field, length, prefix):
+        level = self.levels[field].get(length)
+        if level is None:
+            level = self.levels[field][length] = {}
+            bisect.insort(self.lengths[field], length)
+        node = level.get(prefix)
+        if node is None:
+            node = level[prefix] = _Node()
+        return node
+
+
+
+    ## Yield every node whose prefix contains the packet's address ##
+    def nodes(self, packet):
+        yield self.root
+        for field, width in PREFIX_FIELDS.items():
+            address = packet.get(field)
+            if not isinstance(address, _INTEGERS):
+                continue
+            for length in self.lengths[field]:
+                node = self.levels[field][length].get(address >> (width - length) << (width - length))
+                if node is not None:
+                    yield node
+
+
+
+class FlowLookup(object):
+
+    def __init__(self, flows=(), DPID=None):
+        # DPID of the switch the flows were read from
+        self.DPID = DPID
+
+        # table_id -> _Table
+        self.tables = {}
+
+        # Number of flows, also used to keep flows of equal priority in the order they were added
+        self._count = 0
+
+        for flow in flows:
+            self.add(flow)
+
+
+
+    ## Build a FlowLookup from the result of get_flows() ##
+    @classmethod
+    def from_flows(cls, flows):
+
+        '''
+        Description:
+        Build a FlowLookup from the dictionary returned by get_flows().
+
+        Arguments:
+        flows: Return value of get_flows(), e.g. {"123917682136708": [ {flow}, {flow}, ... ]}
+
+        Return value:
+        FlowLookup containing the flows of the (first) switch in the dictionary.
+
+        Usage:
+        lookup = FlowLookup.from_flows(switch1.get_flows())
+        '''
+
+        for DPID, entries in flows.items():
+            return cls(entries, DPID)
+        return cls()
+
+
+
+    ## Add a flow (in the get_flows() format) ##
+    def add(self, flow):
+        table_id = int(flow.get("table_id", ryureconcile.DEFAULTS["table_id"]))
+        priority = int(flow.get("priority", ryureconcile.DEFAULTS["priority"]))
+
+        table = self.tables.get(table_id)
+        if table is None:
+            table = self.tables[table_id] = _Table()
+
+        node = None
+        fields = []
+        for field, value in (flow.get("match") or {}).items():
+            field = ryureconcile.MATCH_ALIASES.get(field, field)
+            value, mask, width = match_value(value)
+            if node is None and field in PREFIX_FIELDS and width == PREFIX_FIELDS[field]:
+                length = _prefix_length(mask, width)
+                if length is not None:
+                    node = table.node(field, length, value)
+                    continue
+            fields.append((field, mask, value))
+
+        fields.sort(key=lambda field: field[0])
+        if node is None:
+            node = table.root
+        node.add(
+            tuple((field, mask) for field, mask, _ in fields),
+            tuple(value for _, _, value in fields),
+            (-priority, self._count, flow),
+        )
+        self._count += 1
+
+
+
+    ## Parse the fields of a packet ##
+    def _packet(self, packet):
+        parsed = {}
+        for field, value in packet.items():
+            parsed[ryureconcile.MATCH_ALIASES.get(field, field)] = match_value(value)[0]
+        return parsed
+
+
+
+    ## Find the flow a packet hits in a table ##
+    def lookup(self, packet, table_id=0):
+
+        '''
+        Description:
+        Return the highest priority flow of a table matching the packet, i.e. the flow the switch would apply.
+
+        Arguments:
+        packet: Dictionary of packet header fields, named and formatted as in flow matches,
+                e.g. {"in_port": 1, "eth_type": 0x800, "ipv4_dst": "10.1.2.3"}
+        table_id: [OPTIONAL] Table to look in.
+
+        Return value:
+        The flow (as given to the lookup), or None if no flow matches.
+
+        Usage:
+        flow = lookup.lookup({"in_port": 1, "eth_type": 0x800, "ipv4_dst": "10.1.2.3"})
+        '''
+
+        table = self.tables.get(int(table_id))
+        if table is None:
+            return None
+
+        packet = self._packet(packet)
+        best = None
+        for node in table.nodes(packet):
+            for entries in node.find(packet):
+                if best is None or entries[0] < best:
+                    best = entries[0]
+        return best[2] if best is not None else None
+
+
+
+    ## Find every flow of a table that matches a packet ##
+    def matches(self, packet, table_id=0):
+
+        '''
+        Description:
+        Return every flow of a table matching the packet, highest priority first. The first one is the flow the switch applies.
+
+        Arguments:
+        Same as lookup().
+
+        Return value:
+        List of flows.
+        '''
+
+        table = self.tables.get(int(table_id))
+        if table is None:
+            return []
+
+        packet = self._packet(packet)
+        found = []
+        for node in table.nodes(packet):
+            for entries in node.find(packet):
+                found.extend(entries)
+        found.sort(key=lambda entry: entry[:2])
+        return [flow for _, _, flow in found]
+
+
+
+    ## Follow a packet through the pipeline ##
+    def trace(self, packet, table_id=0):
+
+        '''
+        Description:
+        Look the packet up in table 0 (or table_id), then in each table a GOTO_TABLE instruction of the hit flow leads to.
+        Changes that actions would make to the packet (e.g. SET_FIELD) are not applied.
+
+        Arguments:
+        Same as lookup().
+
+        Return value:
+        List of (table_id, flow) pairs, one per table visited. The last flow is None if the packet missed a table.
+
+        Usage:
+        for table_id, flow in lookup.trace(packet):
+            print table_id, flow and flow["actions"]
+        '''
+
+        path = []
+        visited = set()
+        while table_id is not None and table_id not in visited:
+            visited.add(table_id)
+            flow = self.lookup(packet, table_id)
+            path.append((table_id, flow))
+            if flow is None:
+                break
+            table_id = None
+            for action in flow.get("actions") or ():
+                goto = _GOTO.search(ryureconcile._action(action))
+                if goto:
+                    table_id = int(goto.group(1))
+        return path
+
+
+
+    def __len__(self):
+        return self._count
@@ -0,0 +1,320 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##              INSTRUMENTATION MODULE             ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides instruments for a RyuSession, which are told about every REST API call made through it
+#   (i.e. by every RyuSwitch method and ryufunc function using that session).
+#       * RyuMetrics records, per endpoint: call counts, status codes, errors, a latency histogram,
+#         request/response sizes and the time spent decoding JSON.
+#       * Hooks calls your own functions before and after each request, e.g. to start and end tracing spans.
+#   Instruments are only called while added to a session. A session without instruments does not time anything.
+#
+#   Endpoints are named by the REST API path without the DPID or other arguments, e.g. "flow", "port", "flowentry/add",
+#   and recorded together with the HTTP method, e.g. ("GET", "flow").
+
+### USAGE INSTRUCTIONS ###
+#   1. Record metrics for every call made through the shared session:
+#           >> metrics = ryusession.SESSION.instrument( RyuMetrics() )
+#           >> ...
+#           >> for (method, endpoint), stats in metrics.snapshot().items():
+#           ..     print method, endpoint, stats["count"], stats["latency_mean"], stats["status"]
+#
+#   2. Attach your own pre/post hooks:
+#           >> def before(method, rest_uri, kwargs):
+#           ..     return tracer.start_span(rest_uri)              # Whatever is returned is passed to after()
+#           >> def after(span, method, rest_uri, response, elapsed, error):
+#           ..     span.finish()
+#           >> ryusession.SESSION.instrument( Hooks(before=before, after=after) )
+#
+#   3. Stop recording with .uninstrument(), or clear the recorded metrics with metrics.reset():
+#           >> ryusession.SESSION.uninstrument(metrics)
+#
+#   4. Any object with before_request(), after_request() and after_decode() methods may be used as an instrument.
+#      after_read() is optional: it is told the size of streamed bodies (e.g. RyuSwitch.iter_flows()) once read.
+#      Subclass Instrument to only override the ones you need.
+
+
+import bisect
+import threading
+
+
+### LATENCY HISTOGRAM BUCKETS (seconds) ###
+#   Upper bounds of the latency histogram buckets. Calls slower than the last bound are counted in a final "+Inf" bucket.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+### PATH ACTIONS ###
+#   Second part of the path that belongs to the endpoint name, e.g. /stats/flowentry/add, /stats/portdesc/modify
+ACTIONS = ("add", "modify", "modify_strict", "delete", "delete_strict", "clear")
+
+
+
+## Name the endpoint of a REST API URI, without its DPID or other arguments ##
+def endpoint(rest_uri):
+
+    '''
+    Description:
+    Return the endpoint name of a REST API URI: the path after /stats/, without the DPID or other arguments.
+
+    Usage:
+    endpoint("http://localhost:8080/stats/flow/1")              # "flow"
+    endpoint("http://localhost:8080/stats/flowentry/add")       # "flowentry/add"
+    endpoint("http://localhost:8080/stats/queue/1/ALL/2")       # "queue"
+    '''
+
+    parts = rest_uri.split("?", 1)[0].split("/stats/", 1)[-1].split("/")
+    if len(parts) > 1 and parts[1] in ACTIONS:
+        return parts[0] + "/" + parts[1]
+    return parts[0]
+
+
+
+class Instrument(object):
+
+    '''
+    Base class for instruments. Every method does nothing.
+    '''
+
+    ## Called before a request is made. Whatever is returned is passed to after_request() ##
+    def before_request(self, method, rest_uri, kwargs):
+        return None
+
+
+
+    ## Called once a request has completed (response is None and error is set if it raised) ##
+    def after_request(self, token, method, rest_uri, response, elapsed, error):
+        pass
+
+
+
+    ## Called once the JSON body of a response has been decoded ##
+    def after_decode(self, method, rest_uri, response, elapsed):
+        pass
+
+
+
+    ## Called once the body of a streamed response has been read, with its size in bytes ##
+    def after_read(self, method, rest_uri, response, size):
+        pass
+
+
+
+class Hooks(Instrument):
+
+    '''
+    Instrument calling the given functions.
+    before(method, rest_uri, kwargs) -> token
+    after(token, method, rest_uri, response, elapsed, error)
+    decoded(method, rest_uri, response, elapsed)
+    read(method, rest_uri, response, size)
+    '''
+
+    def __init__(self, before=None, after=None, decoded=None, read=None):
+        self.before = before
+        self.after = after
+        self.decoded = decoded
+        self.read = read
+
+
+
+    def before_request(self, method, rest_uri, kwargs):
+        if self.before is not None:
+            return self.before(method, rest_uri, kwargs)
+
+
+
+    def after_request(self, token, method, rest_uri, response, elapsed, error):
+        if self.after is not None:
+            self.after(token, method, rest_uri, response, elapsed, error)
+
+
+
+    def after_decode(self, method, rest_uri, response, elapsed):
+        if self.decoded is not None:
+            self.decoded(method, rest_uri, response, elapsed)
+
+
+
+    def after_read(self, method, rest_uri, response, size):
+        if self.read is not None:
+            self.read(method, rest_uri, response, size)
+
+
+
+class EndpointStats(object):
+
+    '''
+    Metrics recorded for one (method, endpoint).
+    '''
+
+    __slots__ = (
+        "count", "errors", "status", "latency_sum", "latency_max", "latency_buckets",
+        "request_bytes", "response_bytes", "decode_count", "decode_sum", "decode_max",
+    )
+
+    def __init__(self, buckets):
+        # Completed calls, and calls that raised (e.g. connection errors)
+        self.count = 0
+        self.errors = 0
+
+        # HTTP status code -> number of calls
+        self.status = {}
+
+        # Latency: total and worst (seconds), and calls per histogram bucket (the last bucket is "+Inf")
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.latency_buckets = [0] * (len(buckets) + 1)
+
+        # Total request and response body sizes (bytes)
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+        # JSON decoding: number of bodies decoded, total and worst time (seconds)
+        self.decode_count = 0
+        self.decode_sum = 0.0
+        self.decode_max = 0.0
+
+
+
+class RyuMetrics(Instrument):
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        # Upper bounds of the latency histogram buckets (seconds)
+        self.buckets = tuple(buckets)
+
+        # (method, endpoint) -> EndpointStats
+        self.endpoints = {}
+
+        self._lock = threading.Lock()
+
+
+
+    def _stats(self, method, rest_uri):
+        key = (method, endpoint(rest_uri))
+        stats = self.endpoints.get(key)
+        if stats is None:
+            stats = self.endpoints.setdefault(key, EndpointStats(self.buckets))
+        return stats
+
+
+
+    ## The token tells after_request() whether the body is streamed ##
+    def before_request(self, method, rest_uri, kwargs):
+        return bool(kwargs.get("stream"))
+
+
+
+    def after_request(self, streamed, method, rest_uri, response, elapsed, error):
+        request_bytes = response_bytes = 0
+        if response is not None:
+            body = response.request.body if response.request is not None else None
+            request_bytes = len(body) if body else 0
+            # Streamed bodies have not been read yet: they are counted by after_read()
+            if not streamed:
+                response_bytes = len(response.content or b"")
+
+        with self._lock:
+            stats = self._stats(method, rest_uri)
+            stats.count += 1
+            if error is not None:
+                stats.errors += 1
+            else:
+                stats.status[response.status_code] = stats.status.get(response.status_code, 0) + 1
+
+            stats.latency_sum += elapsed
+            stats.latency_max = max(stats.latency_max, elapsed)
+            stats.latency_buckets[bisect.bisect_left(self.buckets, elapsed)] += 1
+
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+
+
+
+    def after_decode(self, method, rest_uri, response, elapsed):
+        with self._lock:
+            stats = self._stats(method, rest_uri)
+            stats.decode_count += 1
+            stats.decode_sum += elapsed
+            stats.decode_max = max(stats.decode_max, elapsed)
+
+
+
+    def after_read(self, method, rest_uri, response, size):
+        with self._lock:
+            self._stats(method, rest_uri).response_bytes += size
+
+
+
+    ## Return the recorded metrics ##
+    def snapshot(self):
+
+        '''
+        Description:
+        Return a copy of the metrics recorded so far.
+
+        Arguments:
+        None.
+
+        Return value:
+        Dictionary of (method, endpoint) -> dictionary with:
+        count, errors, status (status code -> calls), latency_sum, latency_mean, latency_max (seconds),
+        latency_histogram (list of (upper bound, calls at or below it), ending with ("+Inf", count)),
+        request_bytes, response_bytes, decode_count, decode_sum, decode_mean, decode_max (seconds).
+
+        Usage:
+        metrics = ryusession.SESSION.instrument( RyuMetrics() )
+        ...
+        for (method, endpoint), stats in metrics.snapshot().items():
+            print method, endpoint, stats["count"], stats["latency_mean"]
+        '''
+
+        with self._lock:
+            snapshot = {}
+            for key, stats in self.endpoints.items():
+                cumulative = 0
+                histogram = []
+                for bound, calls in zip(self.buckets + ("+Inf",), stats.latency_buckets):
+                    cumulative += calls
+                    histogram.append((bound, cumulative))
+
+                snapshot[key] = {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "status": dict(stats.status),
+                    "latency_sum": stats.latency_sum,
+                    "latency_mean": stats.latency_sum / stats.count if stats.count else 0.0,
+                    "latency_max": stats.latency_max,
+                    "latency_histogram": histogram,
+                    "request_bytes": stats.request_bytes,
+                    "response_bytes": stats.response_bytes,
+                    "decode_count": stats.decode_count,
+                    "decode_sum": stats.decode_sum,
+                    "decode_mean": stats.decode_sum / stats.decode_count if stats.decode_count else 0.0,
+                    "decode_max": stats.decode_max,
+                }
+            return snapshot
+
+
+
+    ## Clear the recorded metrics ##
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
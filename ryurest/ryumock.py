@@ -0,0 +1,983 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##              MOCK REST API MODULE               ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides MockController, a stand-in for "ryu-manager ryu.app.ofctl_rest" that runs inside your own process.
+#   It serves every /stats/... path used by ryuswitch and ryufunc, backed by synthetic switches (MockSwitch), so the
+#   library can be run, tested and benchmarked without Ryu or any OpenFlow switches.
+#       * Replies follow the format of ofctl_rest for OpenFlow v1.3 (v1.4+ only paths such as queuedesc are also served).
+#         Flows are held the way the switch holds them (OXM match fields, masked values, instructions in switch order), and
+#         reported the way ofctl_v1_3 does: match fields by their v1.0 names, IPv4 masks as netmasks, actions as strings.
+#         Fields left out of a flow payload get the defaults of ofctl (priority 0, or 32768 for an OpenFlow v1.0 switch).
+#         This is done independently of ryureconcile and the other modules, so that they can be tested against it.
+#       * Flow, group, meter and port writes change the state of the switch, so they show up in later reads.
+#       * Table sizes (flows, ports, groups, meters, queues, tables) are set per switch.
+#       * A latency can be added to every reply, to simulate a remote controller.
+#       * Connections are kept alive (HTTP/1.1), like ryu-manager.
+
+### USAGE INSTRUCTIONS ###
+#   1. Start a mock controller with 4 switches of 1000 flows each, and point the library at it:
+#           >> mock = MockController(4, flows=1000)
+#           >> API = mock.start()           # e.g. "http://127.0.0.1:45321"
+#           >> switch1 = RyuSwitch(1)
+#           >> switch1.API = API
+#           >> ryufunc.API = API
+#
+#   2. [OPTIONAL] Add latency (in seconds) to every reply. A function taking the request path may be given instead:
+#           >> mock = MockController(4, latency=0.005)
+#           >> mock.latency = lambda path: 0.05 if "/stats/flow/" in path else 0.001
+#
+#   3. [OPTIONAL] Build the switches yourself, e.g. of different sizes:
+#           >> mock = MockController([MockSwitch(1, flows=100000), MockSwitch(2, ports=48, groups=10, meters=10)])
+#           >> mock.add_switch(MockSwitch(3))
+#
+#   4. Stop the server when done. The controller can also be used in a 'with' block:
+#           >> mock.stop()
+#           >> with MockController(2) as API:
+#           ..     ...
+#
+#   5. The mock can also be run from the command line, in place of ryu-manager:
+#           $ python ryumock.py --switches 4 --flows 1000 --port 8080 --latency 0.005
+
+
+import argparse
+import json
+import socket
+import sys
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qsl
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qsl
+
+
+### DEFAULT SWITCH SIZES ###
+FLOWS = 100
+PORTS = 4
+TABLES = 1
+GROUPS = 0
+METERS = 0
+QUEUES = 0
+
+### DEFAULT PORT TRAFFIC (bytes/sec per port) ###
+#   Port and queue counters grow at this rate from the time the switch is created.
+PORT_RATE = 125000
+
+### SPECIAL VALUES ###
+OFPTT_ALL = 0xff
+
+### OPENFLOW VERSION ###
+#   Version spoken by the mock switches, unless given per switch. 1.0 and 1.3 differ only in the default flow priority.
+OPENFLOW = 1.3
+
+### FLOW DEFAULTS ###
+#   Values ryu.lib.ofctl_v1_3 gives the fields left out of a flow entry payload.
+#   ryu.lib.ofctl_v1_0 gives the priority OFP_DEFAULT_PRIORITY instead.
+FLOW_DEFAULTS = {"table_id": 0, "priority": 0, "cookie": 0, "idle_timeout": 0, "hard_timeout": 0, "flags": 0}
+OFP_DEFAULT_PRIORITY = 32768
+
+### MATCH FIELDS ###
+#   OpenFlow v1.0 names accepted in a payload match besides the OXM names (ofctl to_match) -> OXM name
+OLD_FIELDS = {
+    "dl_src": "eth_src", "dl_dst": "eth_dst", "dl_type": "eth_type", "dl_vlan": "vlan_vid",
+    "nw_src": "ipv4_src", "nw_dst": "ipv4_dst", "nw_proto": "ip_proto",
+}
+
+# tp_src and tp_dst are TCP or UDP ports, depending on ip_proto
+TRANSPORT_FIELDS = {6: {"tp_src": "tcp_src", "tp_dst": "tcp_dst"}, 17: {"tp_src": "udp_src", "tp_dst": "udp_dst"}}
+
+#   OXM name -> name the field is reported by. ofctl_v1_3 match_to_str still reports these by their OpenFlow v1.0 names.
+REPORTED_FIELDS = {
+    "eth_src": "dl_src", "eth_dst": "dl_dst", "eth_type": "dl_type", "vlan_vid": "dl_vlan",
+    "ipv4_src": "nw_src", "ipv4_dst": "nw_dst", "ip_proto": "nw_proto",
+    "tcp_src": "tp_src", "tcp_dst": "tp_dst", "udp_src": "tp_src", "udp_dst": "tp_dst",
+}
+
+# IPv4 address fields. A mask may be given as a prefix length, but is reported as a netmask.
+IPV4_FIELDS = ("ipv4_src", "ipv4_dst", "arp_spa", "arp_tpa")
+
+### RESERVED PORTS ###
+#   Port number -> name, as ofctl reports output ports and in_port
+RESERVED_PORTS = {
+    0xfffffff8: "IN_PORT", 0xfffffff9: "TABLE", 0xfffffffa: "NORMAL", 0xfffffffb: "FLOOD",
+    0xfffffffc: "ALL", 0xfffffffd: "CONTROLLER", 0xfffffffe: "LOCAL", 0xffffffff: "ANY",
+}
+
+### ACTIONS ###
+#   Action type -> payload field reported after the ':' (ofctl_v1_3 actions_to_str), e.g. "OUTPUT:2"
+ACTION_FIELDS = {
+    "OUTPUT": "port", "GOTO_TABLE": "table_id", "METER": "meter_id", "GROUP": "group_id", "SET_QUEUE": "queue_id",
+    "SET_MPLS_TTL": "mpls_ttl", "SET_NW_TTL": "nw_ttl", "PUSH_VLAN": "ethertype", "PUSH_MPLS": "ethertype",
+    "POP_MPLS": "ethertype", "PUSH_PBB": "ethertype",
+}
+
+# Instructions, in the order the switch reports them. Every other action is part of the apply-actions instruction.
+INSTRUCTIONS = ("METER", None, "CLEAR_ACTIONS", "WRITE_ACTIONS", "WRITE_METADATA", "GOTO_TABLE")
+
+# str and unicode in Python 2, str in Python 3
+_STRINGS = (str, type(u""))
+
+
+
+## Format an integer as a MAC address ##
+def _mac(value):
+    return ":".join("%02x" % ((value >> shift) & 0xff) for shift in (40, 32, 24, 16, 8, 0))
+
+
+
+## Parse a number given as an integer or a string, e.g. "0x800" ##
+def _number(value):
+    if isinstance(value, _STRINGS):
+        return int(value, 0)
+    return int(value)
+
+
+
+## Parse a port number, or the name of a reserved port ##
+def _port(value):
+    if isinstance(value, _STRINGS):
+        for number, name in RESERVED_PORTS.items():
+            if value.upper() == name:
+                return number
+    return _number(value)
+
+
+
+## Parse an IPv4 address into an integer ##
+def _ipv4(address):
+    octets = [int(octet) for octet in address.split(".")]
+    return (octets[0] << 24) | (octets[1] << 16) | (octets[2] << 8) | octets[3]
+
+
+
+## Format an integer as an IPv4 address ##
+def _dotted(value):
+    return ".".join(str((value >> shift) & 0xff) for shift in (24, 16, 8, 0))
+
+
+
+## Parse the value of a match field into (value, mask), as the switch holds it. mask is None for an exact match. ##
+def _match_value(field, value):
+    if field == "in_port":
+        return _port(value), None
+
+    mask = None
+    if isinstance(value, _STRINGS) and "/" in value:
+        value, mask = value.split("/", 1)
+
+    if field in IPV4_FIELDS:
+        value = _ipv4(value)
+        if mask is None:
+            return value, None
+        mask = (0xffffffff << (32 - int(mask))) & 0xffffffff if mask.isdigit() else _ipv4(mask)
+        # The switch keeps only the masked bits. A full mask is an exact match.
+        return value & mask, (None if mask == 0xffffffff else mask)
+
+    if isinstance(value, _STRINGS):
+        try:
+            value = int(value, 0)
+        except ValueError:
+            # e.g. a MAC address
+            value = value.lower()
+    if mask is not None:
+        try:
+            mask = int(mask, 0)
+        except ValueError:
+            mask = mask.lower()
+    return value, mask
+
+
+
+## Parse the match of a payload into a dictionary of OXM name -> (value, mask) ##
+def _parse_match(match):
+    match = match or {}
+    parsed = {}
+    for field, value in match.items():
+        field = OLD_FIELDS.get(field, field)
+        if field in ("tp_src", "tp_dst"):
+            # An unknown ip_proto is a KeyError: the request is rejected, as by ofctl
+            field = TRANSPORT_FIELDS[_number(match.get("nw_proto", match.get("ip_proto", 0)))][field]
+        parsed[field] = _match_value(field, value)
+    return parsed
+
+
+
+## Report a match the way ofctl_v1_3 does ##
+def _report_match(parsed):
+    match = {}
+    for field, (value, mask) in parsed.items():
+        if field in IPV4_FIELDS:
+            value = _dotted(value)
+            mask = None if mask is None else _dotted(mask)
+        elif field == "in_port":
+            value = RESERVED_PORTS.get(value, value)
+        if mask is not None:
+            value = "%s/%s" % (value, mask)
+        match.setdefault(REPORTED_FIELDS.get(field, field), value)
+    return match
+
+
+
+## Report a payload action the way ofctl_v1_3 does, e.g. {"type": "OUTPUT", "port": 2} -> "OUTPUT:2" ##
+def _report_action(action):
+    action_type = action["type"]
+    if action_type == "OUTPUT":
+        port = _port(action["port"])
+        return "OUTPUT:%s" % RESERVED_PORTS.get(port, port)
+    if action_type == "SET_FIELD":
+        return "SET_FIELD: {%s:%s}" % (action["field"], action["value"])
+    if action_type == "WRITE_METADATA":
+        return "WRITE_METADATA:0x%x/0x%x" % (_number(action["metadata"]), _number(action.get("metadata_mask", 0xffffffffffffffff)))
+    if action_type == "WRITE_ACTIONS":
+        return {"WRITE_ACTIONS": [_report_action(inner) for inner in action["actions"]]}
+    if action_type in ACTION_FIELDS:
+        return "%s:%d" % (action_type, _number(action[ACTION_FIELDS[action_type]]))
+    return action_type
+
+
+
+## Report the actions of a payload, with the instructions in the order the switch reports them ##
+def _report_actions(actions):
+    def order(action):
+        action_type = action["type"]
+        return INSTRUCTIONS.index(action_type if action_type in INSTRUCTIONS else None)
+    return [_report_action(action) for action in sorted(actions or (), key=order)]
+
+
+class MockSwitch(object):
+
+    def __init__(self, DPID, flows=FLOWS, ports=PORTS, tables=TABLES, groups=GROUPS, meters=METERS, queues=QUEUES, port_rate=PORT_RATE, openflow=OPENFLOW):
+        self.DPID = int(DPID)
+        self.openflow = openflow
+        self.tables = tables
+        self.queues = queues
+        self.port_rate = port_rate
+
+        # Counters and durations are measured from this time
+        self.started = time.time()
+
+        # Writes are made under this lock
+        self._lock = threading.Lock()
+
+        # Unfiltered flow table reply, encoded. Cleared on every flow write.
+        self._flow_body = None
+
+        # Port number -> port description
+        self.ports = {}
+        for port_no in range(1, ports + 1):
+            self.ports[port_no] = {
+                "port_no": port_no, "hw_addr": _mac((self.DPID << 16) + port_no), "name": "s%d-eth%d" % (self.DPID, port_no),
+                "config": 0, "state": 4, "curr": 2112, "advertised": 0, "supported": 0, "peer": 0,
+                "curr_speed": 10000000, "max_speed": 0,
+            }
+
+        # (table_id, priority, match) -> flow as reported, in installation order.
+        # A table-miss flow is installed first, like simple_switch_13.
+        self.flows = {}
+        self._order = []
+        if flows:
+            self._install({"priority": 0, "match": {}, "actions": [{"type": "OUTPUT", "port": "CONTROLLER"}]})
+        for i in range(flows - 1):
+            self._install({
+                "table_id": 0, "priority": 1, "cookie": i,
+                "match": {"in_port": i % max(ports, 1) + 1, "eth_dst": _mac(i)},
+                "actions": [{"type": "OUTPUT", "port": (i + 1) % max(ports, 1) + 1}],
+            }, byte_count=64 * i, packet_count=i, duration_sec=i % 3600)
+
+        # Group ID -> group description
+        self.groups = {}
+        for group_id in range(1, groups + 1):
+            self.groups[group_id] = {
+                "type": "ALL", "group_id": group_id,
+                "buckets": [{"weight": 0, "watch_port": 4294967295, "watch_group": 4294967295, "actions": ["OUTPUT:%d" % port_no]} for port_no in sorted(self.ports)],
+            }
+
+        # Meter ID -> meter configuration
+        self.meters = {}
+        for meter_id in range(1, meters + 1):
+            self.meters[meter_id] = {"flags": ["KBPS"], "meter_id": meter_id, "bands": [{"type": "DROP", "rate": 1000 * meter_id, "burst_size": 0}]}
+
+
+
+    ## Return the identity of a flow entry payload in the flow table: (table_id, priority, match) ##
+    def _key(self, payload):
+        if self.openflow < 1.2:
+            priority = payload.get("priority", OFP_DEFAULT_PRIORITY)
+        else:
+            priority = payload.get("priority", FLOW_DEFAULTS["priority"])
+        match = frozenset(_parse_match(payload.get("match")).items())
+        return _number(payload.get("table_id", FLOW_DEFAULTS["table_id"])), _number(priority), match
+
+
+
+    ## Add or replace a flow (OpenFlow add semantics: same table, priority and match replaces) ##
+    def _install(self, payload, **counters):
+        key = self._key(payload)
+        flow = {
+            "table_id": key[0], "priority": key[1],
+            "match": _report_match(dict(key[2])),
+            "actions": _report_actions(payload.get("actions")),
+            "byte_count": 0, "packet_count": 0, "duration_sec": 0, "duration_nsec": 0, "length": 96,
+        }
+        for field in ("cookie", "idle_timeout", "hard_timeout", "flags"):
+            flow[field] = _number(payload.get(field, FLOW_DEFAULTS[field]))
+        flow.update(counters)
+
+        if key not in self.flows:
+            self._order.append(key)
+        self.flows[key] = flow
+
+
+
+    ## Remove the flows for which remove(key, flow) is True ##
+    def _remove(self, remove):
+        keys = [key for key in self._order if remove(key, self.flows[key])]
+        for key in keys:
+            del self.flows[key]
+        if keys:
+            removed = set(keys)
+            self._order = [key for key in self._order if key not in removed]
+
+
+
+    ## Time since the switch was created, as (seconds, duration_sec, duration_nsec) ##
+    def _uptime(self):
+        uptime = time.time() - self.started
+        return uptime, int(uptime), int(uptime % 1 * 1e9)
+
+
+
+    ## True if a flow is selected by a read, modify or delete request (non-strict) ##
+    # Priority is only compared when reading: non-strict modify and delete ignore it.
+    def _selected(self, key, flow, request, default_table=OFPTT_ALL, priority=False):
+        table_id = int(request.get("table_id", default_table))
+        if table_id != OFPTT_ALL and key[0] != table_id:
+            return False
+        if priority and "priority" in request and key[1] != int(request["priority"]):
+            return False
+        cookie_mask = int(request.get("cookie_mask", 0))
+        if cookie_mask and (flow["cookie"] & cookie_mask) != (int(request.get("cookie", 0)) & cookie_mask):
+            return False
+        return frozenset(_parse_match(request.get("match")).items()) <= key[2]
+
+
+
+    ###### Statistics (GET) ######
+
+    def desc(self):
+        return {"mfr_desc": "ryurest", "hw_desc": "MockSwitch", "sw_desc": "ryumock", "serial_num": str(self.DPID), "dp_desc": "mock switch %d" % self.DPID}
+
+
+
+    def flow(self, filters=None):
+        if filters:
+            return [self.flows[key] for key in self._order if self._selected(key, self.flows[key], filters, priority=True)]
+        return [self.flows[key] for key in self._order]
+
+
+
+    def aggregateflow(self, filters=None):
+        flows = self.flow(filters)
+        return [{
+            "packet_count": sum(flow["packet_count"] for flow in flows),
+            "byte_count": sum(flow["byte_count"] for flow in flows),
+            "flow_count": len(flows),
+        }]
+
+
+
+    def table(self):
+        active = {}
+        for key in self._order:
+            active[key[0]] = active.get(key[0], 0) + 1
+        return [{"table_id": table_id, "active_count": active.get(table_id, 0), "lookup_count": 0, "matched_count": 0} for table_id in range(self.tables)]
+
+
+
+    def tablefeatures(self):
+        return [{
+            "table_id": table_id, "name": "table_%d" % table_id, "metadata_match": 0, "metadata_write": 0,
+            "config": 0, "max_entries": 1000000, "properties": [],
+        } for table_id in range(self.tables)]
+
+
+
+    def port(self, port=None):
+        uptime, sec, nsec = self._uptime()
+        stats = []
+        for port_no in self._ports(port):
+            count = int(uptime * self.port_rate)
+            packets = count // 1000
+            stats.append({
+                "port_no": port_no, "rx_packets": packets, "tx_packets": packets, "rx_bytes": count, "tx_bytes": count,
+                "rx_dropped": 0, "tx_dropped": 0, "rx_errors": 0, "tx_errors": 0, "rx_frame_err": 0, "rx_over_err": 0,
+                "rx_crc_err": 0, "collisions": 0, "duration_sec": sec, "duration_nsec": nsec,
+            })
+        return stats
+
+
+
+    def portdesc(self, port=None):
+        return [self.ports[port_no] for port_no in self._ports(port)]
+
+
+
+    def _ports(self, port):
+        if port is None or port == "ALL":
+            return sorted(self.ports)
+        port = int(port)
+        return [port] if port in self.ports else []
+
+
+
+    def _queue_ids(self, queue):
+        if queue is None or queue == "ALL":
+            return list(range(self.queues))
+        queue = int(queue)
+        return [queue] if 0 <= queue < self.queues else []
+
+
+
+    def queue(self, port=None, queue=None):
+        uptime, sec, nsec = self._uptime()
+        stats = []
+        for port_no in self._ports(port):
+            for queue_id in self._queue_ids(queue):
+                count = int(uptime * self.port_rate) // max(self.queues, 1)
+                stats.append({
+                    "port_no": port_no, "queue_id": queue_id, "tx_bytes": count, "tx_packets": count // 1000,
+                    "tx_errors": 0, "duration_sec": sec, "duration_nsec": nsec,
+                })
+        return stats
+
+
+
+    def queueconfig(self, port=None):
+        return [{
+            "port": port_no,
+            "queues": [{"queue_id": queue_id, "port": port_no, "properties": [{"property": "MIN_RATE", "rate": 0}]} for queue_id in self._queue_ids(None)],
+        } for port_no in self._ports(port)]
+
+
+
+    def queuedesc(self, port=None, queue=None):
+        return [{
+            "port_no": port_no, "queue_id": queue_id, "properties": [{"type": "MIN_RATE", "rate": 0}],
+        } for port_no in self._ports(port) for queue_id in self._queue_ids(queue)]
+
+
+
+    def group(self, group=None):
+        uptime, sec, nsec = self._uptime()
+        return [{
+            "group_id": group_id, "ref_count": 0, "packet_count": 0, "byte_count": 0,
+            "duration_sec": sec, "duration_nsec": nsec,
+            "bucket_stats": [{"packet_count": 0, "byte_count": 0} for _ in self.groups[group_id].get("buckets", [])],
+        } for group_id in self._ids(self.groups, group)]
+
+
+
+    def groupdesc(self, group=None):
+        return [self.groups[group_id] for group_id in self._ids(self.groups, group)]
+
+
+
+    def groupfeatures(self):
+        return [{
+            "types": [{"ALL": []}, {"SELECT": []}, {"INDIRECT": []}, {"FF": []}],
+            "capabilities": ["SELECT_WEIGHT", "SELECT_LIVENESS", "CHAINING"],
+            "max_groups": [{"ALL": 4294967040}, {"SELECT": 4294967040}, {"INDIRECT": 4294967040}, {"FF": 4294967040}],
+            "actions": [{"ALL": ["OUTPUT", "SET_FIELD", "PUSH_VLAN", "POP_VLAN", "GROUP"]}],
+        }]
+
+
+
+    def meter(self, meter=None):
+        uptime, sec, nsec = self._uptime()
+        return [{
+            "meter_id": meter_id, "flow_count": 0, "packet_in_count": 0, "byte_in_count": 0,
+            "duration_sec": sec, "duration_nsec": nsec,
+            "band_stats": [{"packet_band_count": 0, "byte_band_count": 0} for _ in self.meters[meter_id].get("bands", [])],
+        } for meter_id in self._ids(self.meters, meter)]
+
+
+
+    def meterconfig(self, meter=None):
+        return [self.meters[meter_id] for meter_id in self._ids(self.meters, meter)]
+
+
+
+    def meterfeatures(self):
+        return [{"max_meter": 4294967295, "band_types": ["DROP", "DSCP_REMARK"], "capabilities": ["KBPS", "PKTPS", "BURST", "STATS"], "max_bands": 16, "max_color": 0}]
+
+
+
+    def _ids(self, entries, entry_id):
+        if entry_id is None or entry_id == "ALL":
+            return sorted(entries)
+        entry_id = int(entry_id)
+        return [entry_id] if entry_id in entries else []
+
+
+
+    ###### Writes (POST/DELETE) ######
+
+    ## Apply a /stats/flowentry/<command> request ##
+    def flowentry(self, command, payload):
+        with self._lock:
+            self._flow_body = None
+
+            if command == "add":
+                self._install(payload)
+
+            elif command == "modify_strict":
+                key = self._key(payload)
+                if key in self.flows:
+                    self.flows[key]["actions"] = _report_actions(payload.get("actions"))
+
+            elif command == "modify":
+                actions = _report_actions(payload.get("actions"))
+                for key in self._order:
+                    if self._selected(key, self.flows[key], payload, default_table=0):
+                        self.flows[key]["actions"] = actions
+
+            elif command == "delete_strict":
+                key = self._key(payload)
+                self._remove(lambda flow_key, flow: flow_key == key)
+
+            elif command == "delete":
+                self._remove(lambda key, flow: self._selected(key, flow, payload))
+
+            elif command == "clear":
+                self.flows = {}
+                self._order = []
+
+            else:
+                return False
+        return True
+
+
+
+    ## Apply a /stats/groupentry/<command> or /stats/meterentry/<command> request ##
+    def _entry(self, entries, id_field, command, payload):
+        with self._lock:
+            entry_id = int(payload.get(id_field, 0))
+            entry = dict(payload)
+            entry.pop("dpid", None)
+
+            if command == "add" or command == "modify":
+                if command == "modify" and entry_id not in entries:
+                    return False
+                entries[entry_id] = entry
+            elif command == "delete":
+                entries.pop(entry_id, None)
+            else:
+                return False
+        return True
+
+
+
+    def groupentry(self, command, payload):
+        return self._entry(self.groups, "group_id", command, payload)
+
+
+
+    def meterentry(self, command, payload):
+        return self._entry(self.meters, "meter_id", command, payload)
+
+
+
+    ## Apply a /stats/portdesc/modify request ##
+    def port_modify(self, payload):
+        with self._lock:
+            port = self.ports.get(int(payload.get("port_no", 0)))
+            if port is None:
+                return False
+            mask = int(payload.get("mask", 0))
+            port["config"] = (port["config"] & ~mask) | (int(payload.get("config", 0)) & mask)
+            if "advertise" in payload:
+                port["advertised"] = int(payload["advertise"])
+        return True
+
+
+
+### REQUEST ROUTES ###
+#   /stats/<endpoint>/<DPID>[/<argument>...] -> (MockSwitch method, maximum number of arguments after the DPID)
+GETTERS = {
+    "desc": ("desc", 0),
+    "flow": ("flow", 0),
+    "aggregateflow": ("aggregateflow", 0),
+    "table": ("table", 0),
+    "tablefeatures": ("tablefeatures", 0),
+    "port": ("port", 1),
+    "portdesc": ("portdesc", 1),
+    "queue": ("queue", 2),
+    "queueconfig": ("queueconfig", 1),
+    "queuedesc": ("queuedesc", 2),
+    "group": ("group", 1),
+    "groupdesc": ("groupdesc", 1),
+    "groupfeatures": ("groupfeatures", 0),
+    "meter": ("meter", 1),
+    "meterconfig": ("meterconfig", 1),
+    "meterdesc": ("meterconfig", 1),
+    "meterfeatures": ("meterfeatures", 0),
+}
+
+# Getters that accept a filter in the request body
+FILTERED = ("flow", "aggregateflow")
+
+# /stats/<endpoint>/<command> writes carrying the DPID in a JSON payload -> MockSwitch method
+WRITERS = {
+    "flowentry": "flowentry",
+    "groupentry": "groupentry",
+    "meterentry": "meterentry",
+}
+
+
+
+## Decode a request body: JSON, or form-encoded (values that look like numbers become numbers) ##
+def _decode(body):
+    if not body:
+        return {}
+    if not isinstance(body, str):
+        body = body.decode("utf-8")
+    try:
+        return json.loads(body)
+    except ValueError:
+        pass
+
+    decoded = {}
+    for field, value in parse_qsl(body):
+        try:
+            decoded[field] = int(value, 0)
+        except ValueError:
+            decoded[field] = value
+    return decoded
+
+
+
+class MockController(object):
+
+    def __init__(self, switches=1, latency=0.0, host="127.0.0.1", port=0, **options):
+        # DPID -> MockSwitch
+        self.switches = {}
+
+        # Seconds added before every reply, or a function taking the request path and returning the seconds
+        self.latency = latency
+
+        # Address to listen on. Port 0 picks a free port.
+        self.host = host
+        self.port = port
+
+        # Number of requests served
+        self.requests = 0
+
+        self._server = None
+        self._thread = None
+
+        if isinstance(switches, int):
+            switches = [MockSwitch(DPID, **options) for DPID in range(1, switches + 1)]
+        for switch in switches:
+            self.add_switch(switch)
+
+
+
+    ## Connect a switch to the controller ##
+    def add_switch(self, switch):
+        self.switches[switch.DPID] = switch
+        return switch
+
+
+
+    ## Disconnect a switch from the controller ##
+    def remove_switch(self, DPID):
+        return self.switches.pop(int(DPID), None)
+
+
+
+    ## Start serving the REST API in a background thread ##
+    def start(self):
+
+        '''
+        Description:
+        Start the HTTP server in a background (daemon) thread.
+
+        Arguments:
+        None.
+
+        Return value:
+        Base REST API URI of the mock controller, e.g. "http://127.0.0.1:45321". Use it as RyuSwitch.API or ryufunc.API.
+
+        Usage:
+        mock = MockController(4, flows=1000)
+        switch1 = RyuSwitch(1)
+        switch1.API = mock.start()
+        '''
+
+        if self._server is None:
+            self._server = _Server((self.host, self.port), _Handler)
+            self._server.controller = self
+            self.port = self._server.server_address[1]
+            self._thread = threading.Thread(target=self._server.serve_forever)
+            self._thread.daemon = True
+            self._thread.start()
+        return self.API
+
+
+
+    ## Stop the HTTP server ##
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server.close_connections()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+
+
+    @property
+    def API(self):
+        return "http://%s:%d" % (self.host, self.port)
+
+
+
+    def __enter__(self):
+        return self.start()
+
+
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+
+    ## Answer a request ##
+    def handle(self, method, path, body=b""):
+
+        '''
+        Description:
+        Answer a REST API request the way ofctl_rest would. Called by the HTTP server, but may also be called directly.
+
+        Arguments:
+        method: HTTP method, e.g. "GET".
+        path: Request path, e.g. "/stats/flow/1".
+        body: [OPTIONAL] Request body (JSON or form-encoded).
+
+        Return value:
+        Tuple of (HTTP status, reply body as bytes).
+
+        Usage:
+        status, body = mock.handle("GET", "/stats/switches")
+        '''
+
+        self.requests += 1
+
+        latency = self.latency(path) if callable(self.latency) else self.latency
+        if latency:
+            time.sleep(latency)
+
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if len(parts) < 2 or parts[0] != "stats":
+            return 404, b""
+        endpoint, arguments = parts[1], parts[2:]
+
+        try:
+            request = _decode(body)
+        except ValueError:
+            return 400, b""
+
+        try:
+            if endpoint == "switches" and not arguments:
+                return 200, self._encode(sorted(self.switches))
+
+            # Writes with the DPID in the payload
+            if method == "POST" and endpoint in WRITERS and len(arguments) == 1:
+                return self._write(request, WRITERS[endpoint], arguments[0], request)
+            if method == "POST" and endpoint == "portdesc" and arguments == ["modify"]:
+                return self._write(request, "port_modify", request)
+            if method == "DELETE" and endpoint == "flowentry" and len(arguments) == 2 and arguments[0] == "clear":
+                return self._write({"dpid": arguments[1]}, "flowentry", "clear", {})
+            if method == "POST" and endpoint == "experimenter" and len(arguments) == 1:
+                return (200, b"") if self._switch(arguments[0]) is not None else (404, b"")
+
+            # Statistics: GET, or POST with a filter in the body
+            if endpoint in GETTERS and arguments and method in ("GET", "POST"):
+                name, max_arguments = GETTERS[endpoint]
+                if len(arguments) - 1 > max_arguments:
+                    return 404, b""
+                switch = self._switch(arguments[0])
+                if switch is None:
+                    return 404, b""
+
+                with switch._lock:
+                    if endpoint == "flow" and not request:
+                        # The full flow table is encoded once and reused until it changes
+                        if switch._flow_body is None:
+                            switch._flow_body = self._encode({str(switch.DPID): switch.flow()})
+                        return 200, switch._flow_body
+                    if endpoint in FILTERED:
+                        reply = getattr(switch, name)(request)
+                    else:
+                        reply = getattr(switch, name)(*arguments[1:])
+                return 200, self._encode({str(switch.DPID): reply})
+
+        except (ValueError, TypeError, KeyError, AttributeError):
+            return 400, b""
+
+        return 404, b""
+
+
+
+    def _switch(self, DPID):
+        try:
+            return self.switches.get(int(DPID))
+        except (TypeError, ValueError):
+            return None
+
+
+
+    def _write(self, request, name, *arguments):
+        if "dpid" not in request:
+            return 400, b""
+        switch = self._switch(request["dpid"])
+        if switch is None:
+            return 404, b""
+        return (200, b"") if getattr(switch, name)(*arguments) else (400, b"")
+
+
+
+    def _encode(self, reply):
+        return json.dumps(reply).encode("utf-8")
+
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    # Allow many clients (e.g. a RyuFleet) to connect at once
+    request_queue_size = 256
+
+    def __init__(self, *args, **kwargs):
+        HTTPServer.__init__(self, *args, **kwargs)
+
+        # Open (kept alive) client connections
+        self.connections = set()
+        self.connections_lock = threading.Lock()
+
+    ## Clients closing their connections is not an error ##
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], socket.error):
+            HTTPServer.handle_error(self, request, client_address)
+
+    ## Close kept-alive connections, so their handler threads end ##
+    def close_connections(self):
+        with self.connections_lock:
+            connections = list(self.connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    # Keep connections alive between requests
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+
+        # Send small replies straight away. Otherwise the body, written after the headers, waits for the client's delayed ACK.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        with self.server.connections_lock:
+            self.server.connections.add(self.connection)
+
+    def finish(self):
+        with self.server.connections_lock:
+            self.server.connections.discard(self.connection)
+        BaseHTTPRequestHandler.finish(self)
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        status, reply = self.server.controller.handle(self.command, self.path, body)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    do_GET = do_POST = do_DELETE = do_PUT = _reply
+
+    # Do not log every request
+    def log_message(self, format, *args):
+        pass
+
+
+
+## Run a mock controller from the command line ##
+def main():
+    parser = argparse.ArgumentParser(description="Mock Ryu ofctl_rest REST API, backed by synthetic switches.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--switches", type=int, default=1, help="number of switches (DPIDs 1 to N)")
+    parser.add_argument("--flows", type=int, default=FLOWS, help="flows per switch")
+    parser.add_argument("--ports", type=int, default=PORTS, help="ports per switch")
+    parser.add_argument("--tables", type=int, default=TABLES, help="tables per switch")
+    parser.add_argument("--groups", type=int, default=GROUPS, help="groups per switch")
+    parser.add_argument("--meters", type=int, default=METERS, help="meters per switch")
+    parser.add_argument("--queues", type=int, default=QUEUES, help="queues per port")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every reply")
+    parser.add_argument("--openflow", type=float, default=OPENFLOW, help="OpenFlow version of the switches (1.0 or 1.3)")
+    args = parser.parse_args()
+
+    mock = MockController(
+        args.switches, latency=args.latency, host=args.host, port=args.port,
+        flows=args.flows, ports=args.ports, tables=args.tables, groups=args.groups, meters=args.meters, queues=args.queues,
+        openflow=args.openflow,
+    )
+    print("Mock Ryu REST API serving " + str(args.switches) + " switch(es) on " + mock.start())
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+
+if __name__ == "__main__":
+    main()
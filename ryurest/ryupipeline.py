@@ -0,0 +1,463 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##              PIPELINED WRITER MODULE            ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides PipelinedWriter, an HTTP/1.1 transport that sends flow, group and meter writes
+#   (/stats/flowentry/*, /stats/groupentry/*, /stats/meterentry/*) without waiting for the previous response.
+#   Requests works one request at a time per connection: each call waits a full round trip before the connection
+#   can be used again. PipelinedWriter instead keeps up to 'depth' requests in flight on each of its connections.
+#   The controller answers them in the order they were sent, so each response is matched to the oldest unanswered request.
+#   Write throughput to a controller is then limited by how fast it processes writes, not by the round trip time.
+#
+#   Once added to a RyuSession, it is used for every write to those paths made through the session (add_flow(),
+#   add_flows(), delete_group(), ...). Every other call still goes through Requests. Timeouts, retries, caching and
+#   instruments apply as usual.
+#   If a connection fails, every request in flight on it fails with a ConnectionError (and may be retried by the session's
+#   call policy), and a new connection is opened for the next requests.
+
+### USAGE INSTRUCTIONS ###
+#   1. Turn on pipelining for every write made through the shared session:
+#           >> ryusession.SESSION.pipeline = PipelinedWriter(connections=2, depth=32)
+#
+#   2. Writes from many threads (e.g. add_flows(), which keeps 'window' writes in flight) now share the pipelined connections:
+#           >> status = switch1.add_flows(payloads, window=64)
+#
+#   3. Turn it off again, closing its connections:
+#           >> ryusession.SESSION.pipeline.close()
+#           >> ryusession.SESSION.pipeline = None
+
+
+import json as _json
+import socket
+import threading
+from collections import deque
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    from urllib.parse import urlsplit, urlencode
+except ImportError:
+    from urlparse import urlsplit
+    from urllib import urlencode
+
+try:
+    import ssl
+except ImportError:
+    ssl = None
+
+
+### DEFAULT CONNECTIONS ###
+#   Number of pipelined connections opened to each controller.
+CONNECTIONS = 2
+
+### DEFAULT PIPELINE DEPTH ###
+#   Maximum number of requests in flight at once on each connection. Further requests wait for a response.
+DEPTH = 32
+
+### PIPELINED PATHS ###
+#   REST API paths whose POST requests are pipelined.
+PATHS = ("/stats/flowentry/", "/stats/groupentry/", "/stats/meterentry/")
+
+### DEFAULT TIMEOUT (seconds) ###
+#   Used to open connections and wait for responses when the caller gives no timeout.
+TIMEOUT = 30
+
+
+
+class PipelinedResponse(object):
+
+    '''
+    Response to a pipelined request. Has the parts of a Requests response used by this library.
+    '''
+
+    def __init__(self, request, status_code, reason, headers, content):
+        self.request = request
+        self.url = request.url
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.encoding = "utf-8"
+
+
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, "replace")
+
+
+
+    def json(self, **kwargs):
+        return _json.loads(self.text, **kwargs)
+
+
+
+    def close(self):
+        pass
+
+
+
+class _Request(object):
+
+    '''
+    A request waiting for its response.
+    '''
+
+    def __init__(self, method, url, body):
+        self.method = method
+        self.url = url
+        self.body = body
+
+        self.response = None
+        self.error = None
+        self.done = threading.Event()
+
+
+
+    def finish(self, response=None, error=None):
+        self.response = response
+        self.error = error
+        self.done.set()
+
+
+
+class _Connection(object):
+
+    '''
+    One pipelined connection. Requests are sent by the calling threads and responses read by a background thread.
+    '''
+
+    def __init__(self, scheme, host, port, depth, timeout):
+        self.host = host
+        self.port = port
+
+        # Requests sent and not yet answered, oldest first
+        self.pending = deque()
+
+        # Limits the requests in flight
+        self.slots = threading.BoundedSemaphore(depth)
+
+        # Keeps requests in the same order in 'pending' and on the wire
+        self._send_lock = threading.Lock()
+
+        # Guards 'closed'. Nothing is added to 'pending' once closed.
+        self.closed = False
+        self._lock = threading.Lock()
+
+        try:
+            sock = socket.create_connection((host, port), timeout)
+        except socket.timeout as e:
+            raise requests.exceptions.ConnectTimeout(e)
+        except socket.error as e:
+            raise requests.exceptions.ConnectionError(e)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if scheme == "https":
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+
+        # Responses are read without a timeout: a request that takes too long closes the connection instead
+        sock.settimeout(None)
+        self.sock = sock
+        self.rfile = sock.makefile("rb")
+
+        self._reader = threading.Thread(target=self._read)
+        self._reader.daemon = True
+        self._reader.start()
+
+
+
+    ## Send a request. Its response is set by the reader thread ##
+    def send(self, request, data):
+        self.slots.acquire()
+        with self._send_lock:
+            with self._lock:
+                if self.closed:
+                    self.slots.release()
+                    raise requests.exceptions.ConnectionError("Pipelined connection to %s:%s closed" % (self.host, self.port))
+                self.pending.append(request)
+
+            # The reader never waits for this lock, so responses keep being read while a large write blocks
+            try:
+                self.sock.sendall(data)
+            except socket.error as e:
+                self.close(e)
+
+
+
+    ## Read responses, in the order the requests were sent ##
+    def _read(self):
+        try:
+            while True:
+                status = _read_response(self.rfile)
+                if status is None:
+                    raise requests.exceptions.ConnectionError(
+                        "Pipelined connection to %s:%s closed by the controller" % (self.host, self.port)
+                    )
+                status_code, reason, headers, content = status
+                request = self.pending.popleft()
+                self.slots.release()
+                request.finish(PipelinedResponse(request, status_code, reason, headers, content))
+                if headers.get("Connection", "").lower() == "close":
+                    raise requests.exceptions.ConnectionError(
+                        "Pipelined connection to %s:%s closed by the controller" % (self.host, self.port)
+                    )
+        except Exception as e:
+            self.close(e)
+
+
+
+    ## Close the connection, failing every request in flight ##
+    def close(self, error=None):
+        if error is None:
+            error = requests.exceptions.ConnectionError("Pipelined connection to %s:%s closed" % (self.host, self.port))
+        elif not isinstance(error, requests.exceptions.RequestException):
+            error = requests.exceptions.ConnectionError(error)
+
+        with self._lock:
+            if not self.closed:
+                self.closed = True
+                try:
+                    self.sock.shutdown(socket.SHUT_RDWR)
+                except socket.error:
+                    pass
+                self.sock.close()
+
+            while self.pending:
+                try:
+                    request = self.pending.popleft()
+                except IndexError:
+                    # Answered by the reader in the meantime
+                    break
+                request.finish(error=error)
+                self.slots.release()
+
+
+
+## Read one HTTP response. Returns (status code, reason, headers, body), or None if the connection closed first ##
+def _read_response(rfile):
+    line = rfile.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+    status_code = int(parts[1])
+    reason = parts[2] if len(parts) > 2 else ""
+
+    headers = CaseInsensitiveDict()
+    while True:
+        line = rfile.readline()
+        if not line:
+            return None
+        line = line.decode("latin-1").rstrip("\r\n")
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip()] = value.strip()
+
+    if headers.get("Transfer-Encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int(rfile.readline().split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                # Trailers end with an empty line
+                while rfile.readline().strip():
+                    pass
+                break
+            chunks.append(_read_exactly(rfile, size))
+            rfile.readline()
+        content = b"".join(chunks)
+    elif "Content-Length" in headers:
+        content = _read_exactly(rfile, int(headers["Content-Length"]))
+    elif status_code in (204, 304) or 100 <= status_code < 200:
+        content = b""
+    else:
+        # No length given: the body ends when the connection closes
+        content = rfile.read()
+        headers["Connection"] = "close"
+    return status_code, reason, headers, content
+
+
+
+def _read_exactly(rfile, size):
+    content = rfile.read(size)
+    if len(content) != size:
+        raise requests.exceptions.ConnectionError("Pipelined connection closed in the middle of a response")
+    return content
+
+
+
+class PipelinedWriter(object):
+
+    def __init__(self, connections=CONNECTIONS, depth=DEPTH, paths=PATHS):
+        # Connections per controller, and requests in flight per connection
+        self.connections = connections
+        self.depth = depth
+
+        # REST API paths whose POST requests are pipelined
+        self.paths = tuple(paths)
+
+        # (scheme, host, port) -> list of _Connection
+        self._pools = {}
+
+        # Round robin position per controller
+        self._next = {}
+
+        # (scheme, host, port) -> lock held while opening a connection to that controller
+        self._connecting = {}
+
+        self._lock = threading.Lock()
+
+
+
+    ## True if this writer sends the given request ##
+    def handles(self, method, rest_uri):
+        if method != "POST":
+            return False
+        path = urlsplit(rest_uri).path
+        return any(path.startswith(prefix) for prefix in self.paths)
+
+
+
+    ## Return a usable connection to a controller, opening one if needed ##
+    def _connection(self, scheme, host, port, timeout):
+        key = (scheme, host, port)
+        with self._lock:
+            connection = self._pick(key)
+            if connection is not None:
+                return connection
+            connecting = self._connecting.setdefault(key, threading.Lock())
+
+        # Connect without holding the writer-wide lock, so that calls to other controllers are not held up by it.
+        # Connections to one controller are opened one at a time, so the pool is not filled past its size.
+        with connecting:
+            with self._lock:
+                connection = self._pick(key)
+            if connection is not None:
+                return connection
+
+            connection = _Connection(scheme, host, port, self.depth, timeout)
+            with self._lock:
+                self._pools.setdefault(key, []).append(connection)
+            return connection
+
+
+
+    ## Return the connection to use for a controller, or None if another should be opened. Called holding _lock ##
+    def _pick(self, key):
+        pool = self._pools.setdefault(key, [])
+        pool[:] = [connection for connection in pool if not connection.closed]
+        if len(pool) < self.connections:
+            return None
+
+        # Use the connection with the fewest requests in flight, starting from the next one in turn
+        start = self._next.get(key, 0) % len(pool)
+        self._next[key] = (start + 1) % len(pool)
+        ordered = pool[start:] + pool[:start]
+        return min(ordered, key=lambda connection: len(connection.pending))
+
+
+
+    ## Send a request and wait for its response ##
+    def request(self, method, rest_uri, data=None, json=None, timeout=None, headers=None, **kwargs):
+
+        '''
+        Description:
+        Send a request over a pipelined connection and wait for its response. Takes the same main arguments as Requests.
+
+        Arguments:
+        method: HTTP method.
+        rest_uri: Full URI of the REST API call.
+        data: [OPTIONAL] Body, as bytes, a string or a dictionary (form encoded).
+        json: [OPTIONAL] Body, encoded to JSON.
+        timeout: [OPTIONAL] Seconds, or (connect, read) seconds. Defaults to TIMEOUT.
+        headers: [OPTIONAL] Extra request headers.
+
+        Return value:
+        PipelinedResponse. Raises requests.exceptions.ConnectionError or Timeout on failure.
+        '''
+
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+        else:
+            connect_timeout = read_timeout = timeout if timeout is not None else TIMEOUT
+
+        url = urlsplit(rest_uri)
+        scheme = url.scheme or "http"
+        host = url.hostname
+        port = url.port or (443 if scheme == "https" else 80)
+        path = url.path + ("?" + url.query if url.query else "")
+
+        content_type = None
+        if json is not None:
+            body = _json.dumps(json).encode("utf-8")
+            content_type = "application/json"
+        elif isinstance(data, dict):
+            body = urlencode(data).encode("utf-8")
+            content_type = "application/x-www-form-urlencoded"
+        elif data is None:
+            body = b""
+        elif isinstance(data, bytes):
+            body = data
+        else:
+            body = data.encode("utf-8")
+
+        head = [
+            "%s %s HTTP/1.1" % (method, path),
+            "Host: %s" % url.netloc,
+            "Content-Length: %d" % len(body),
+        ]
+        if content_type is not None:
+            head.append("Content-Type: %s" % content_type)
+        for name, value in (headers or {}).items():
+            head.append("%s: %s" % (name, value))
+        data = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+
+        request = _Request(method, rest_uri, body)
+        connection = self._connection(scheme, host, port, connect_timeout)
+        connection.send(request, data)
+
+        if not request.done.wait(read_timeout):
+            # The requests after this one are stuck behind it: give up on the connection
+            connection.close()
+            request.done.wait()
+            if request.response is None:
+                raise requests.exceptions.ReadTimeout("Pipelined request to %s timed out" % rest_uri)
+        if request.error is not None:
+            raise request.error
+        return request.response
+
+
+
+    ## Close every connection. Requests in flight fail ##
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            for connection in pool:
+                connection.close()
+
@@ -0,0 +1,345 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##                CALL POLICY MODULE               ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides CallPolicy, which a RyuSession applies to every REST API call made through it
+#   (i.e. by every RyuSwitch method and ryufunc function using that session):
+#       * Timeouts: every call gives up if the controller does not connect within 'connect_timeout' seconds.
+#         There is no 'read_timeout' by default, so a slow reply (e.g. get_flows() of a large flow table) is waited for,
+#         as without a policy. Set one to also give up on controllers that stop sending data.
+#       * Retries: calls that fail with a connection error, a timeout or an HTTP 5xx status are retried up to 'retries'
+#         times, waiting an exponentially growing (randomised) time between attempts.
+#         Only calls that are safe to repeat are retried once they may have reached the controller: GETs, filtered
+#         stats POSTs and idempotent writes (SAFE_WRITES). Any call is retried if the connection could not be opened.
+#       * Circuit breaker: once 'failure_threshold' calls in a row to a controller have failed, further calls to it fail
+#         at once with CircuitOpenError for 'reset_timeout' seconds. A single trial call is then let through:
+#         if it succeeds calls resume as normal, otherwise the breaker stays open for another 'reset_timeout'.
+#   Every RyuSession has a CallPolicy with the defaults below, unless another one is given.
+
+### USAGE INSTRUCTIONS ###
+#   1. Change the policy of the shared session (used by every RyuSwitch and ryufunc function by default):
+#           >> ryusession.SESSION.policy = CallPolicy(connect_timeout=2, read_timeout=10, retries=3)
+#
+#   2. Calls to a controller that is down raise CircuitOpenError without waiting for a timeout.
+#      It is a subclass of requests.exceptions.ConnectionError, so existing error handling still catches it:
+#           >> try:
+#           ..     flows = switch1.get_flows()
+#           .. except CircuitOpenError:
+#           ..     print("Controller is down")
+#
+#   3. Check or reset the state of a controller's breaker:
+#           >> ryusession.SESSION.policy.state("http://192.168.1.30:8080")     # "closed", "open" or "half-open"
+#           >> ryusession.SESSION.policy.reset("http://192.168.1.30:8080")
+#
+#   4. [OPTIONAL] Turn off retries or the breaker (failure_threshold=0), or the whole policy:
+#           >> ryusession.SESSION.policy = CallPolicy(retries=0, failure_threshold=0)
+#           >> ryusession.SESSION.policy = None         # No timeouts, retries or breaker
+
+
+import random
+import threading
+import time
+import requests
+
+try:
+    from urllib3.exceptions import NewConnectionError
+except ImportError:
+    from requests.packages.urllib3.exceptions import NewConnectionError
+
+try:
+    from . import ryumetrics
+except (ImportError, ValueError):
+    import ryumetrics
+
+
+### DEFAULT TIMEOUTS (seconds) ###
+#   Time allowed to open a connection to the controller, and to wait for data once connected (None: no limit).
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = None
+
+### DEFAULT RETRIES ###
+#   Number of times a failed call is retried. The wait before retry N is random, between 0 and BACKOFF * 2^N seconds
+#   (at most MAX_BACKOFF).
+RETRIES = 2
+BACKOFF = 0.1
+MAX_BACKOFF = 2.0
+
+### RETRIED STATUS CODES ###
+#   Server errors worth retrying. Ryu returns 400/404 for bad arguments or unknown switches, which are not retried.
+RETRY_STATUSES = (500, 502, 503, 504)
+
+### IDEMPOTENT POSTS ###
+#   Endpoints that give the same result when repeated, so can be retried even if the first call reached the controller.
+#   'flow' and 'aggregateflow' are stats requests with filters. OpenFlow flow adds replace an identical existing flow.
+#   Group/meter adds fail if the ID already exists, and experimenter messages are opaque, so these are never retried.
+SAFE_WRITES = (
+    "flow", "aggregateflow",
+    "flowentry/add", "flowentry/modify", "flowentry/modify_strict", "flowentry/delete", "flowentry/delete_strict",
+    "groupentry/modify", "groupentry/delete",
+    "meterentry/modify", "meterentry/delete",
+    "portdesc/modify",
+)
+
+### DEFAULT CIRCUIT BREAKER ###
+#   Failed calls in a row before a controller's breaker opens, and seconds before a trial call is let through.
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30.0
+
+# Clock used by the breakers
+_clock = getattr(time, "monotonic", time.time)
+
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+
+    '''
+    Raised instead of making a call while the breaker for its controller is open.
+    '''
+
+    pass
+
+
+
+class CircuitBreaker(object):
+
+    '''
+    Failure count and state for the calls to one controller.
+    '''
+
+    def __init__(self, API, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.API = API
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        # Failed calls in a row, and when the breaker opened (None while closed)
+        self.failures = 0
+        self.opened = None
+
+        # True while the single trial call of the half-open state is in flight
+        self._trial = False
+
+        self._lock = threading.Lock()
+
+
+
+    ## "closed", "open" or "half-open" ##
+    @property
+    def state(self):
+        if self.opened is None:
+            return "closed"
+        if _clock() - self.opened < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+
+
+    ## Called before each attempt. Raises CircuitOpenError if the call must not be made ##
+    def before(self):
+        with self._lock:
+            if self.opened is None:
+                return
+            remaining = self.reset_timeout - (_clock() - self.opened)
+            if remaining <= 0 and not self._trial:
+                # Half-open: let one trial call through
+                self._trial = True
+                return
+        raise CircuitOpenError(
+            "Circuit open for %s after %d failed calls, retrying in %.1fs" % (self.API, self.failures, max(0, remaining))
+        )
+
+
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened = None
+            self._trial = False
+
+
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                # Open, or open again after a failed trial
+                self.opened = _clock()
+                self._trial = False
+
+
+
+    ## Called when an attempt ended without telling whether the controller works ##
+    def cancel(self):
+        with self._lock:
+            self._trial = False
+
+
+
+    def reset(self):
+        self.success()
+
+
+
+class CallPolicy(object):
+
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT, retries=RETRIES, backoff=BACKOFF,
+                 max_backoff=MAX_BACKOFF, retry_statuses=RETRY_STATUSES, safe_writes=SAFE_WRITES,
+                 failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        ### Timeouts (seconds). None waits forever ###
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+        ### Retries and backoff (seconds) ###
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        # HTTP status codes retried, and POST endpoints that are safe to repeat
+        self.retry_statuses = frozenset(retry_statuses)
+        self.safe_writes = frozenset(safe_writes)
+
+        ### Circuit breaker. A failure_threshold of 0 turns it off ###
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        # Controller URL -> CircuitBreaker
+        self.breakers = {}
+
+        self._lock = threading.Lock()
+
+
+
+    ## Return the breaker of a controller, creating it if needed ##
+    def breaker(self, API):
+        breaker = self.breakers.get(API)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.setdefault(API, CircuitBreaker(API, self.failure_threshold, self.reset_timeout))
+        return breaker
+
+
+
+    ## State of a controller's breaker: "closed", "open" or "half-open" ##
+    def state(self, API):
+        breaker = self.breakers.get(API)
+        return breaker.state if breaker is not None else "closed"
+
+
+
+    ## Close a controller's breaker, or every breaker ##
+    def reset(self, API=None):
+        for key, breaker in list(self.breakers.items()):
+            if API is None or key == API:
+                breaker.reset()
+
+
+
+    ## True if a call can be repeated without changing the result ##
+    def idempotent(self, method, rest_uri):
+        if method in ("GET", "HEAD", "OPTIONS"):
+            return True
+        return ryumetrics.endpoint(rest_uri) in self.safe_writes
+
+
+
+    ## Make a call under this policy ##
+    def call(self, send, method, rest_uri, kwargs):
+
+        '''
+        Description:
+        Make a call with the policy's timeouts, retries and circuit breaker.
+
+        Arguments:
+        send: Function making the call, e.g. requests.Session().request.
+        method: HTTP method.
+        rest_uri: Full URI of the REST API call.
+        kwargs: Passed through to send(). A timeout given here replaces the policy's timeouts.
+
+        Return value:
+        The response of the last attempt.
+        Raises the error of the last attempt if it raised one, or CircuitOpenError if the controller's breaker was open
+        before the first attempt.
+        '''
+
+        if "timeout" not in kwargs:
+            kwargs = dict(kwargs, timeout=(self.connect_timeout, self.read_timeout))
+
+        breaker = None
+        if self.failure_threshold:
+            breaker = self.breaker(rest_uri.split("/stats/", 1)[0])
+
+        idempotent = self.idempotent(method, rest_uri)
+        attempt = 0
+
+        # Error raised, or 5xx response returned, by the previous attempt
+        last = None
+        while True:
+            if breaker is not None:
+                try:
+                    breaker.before()
+                except CircuitOpenError:
+                    # The failures of this call opened the breaker: report the last of them, not the breaker
+                    if last is None:
+                        raise
+                    if isinstance(last, Exception):
+                        raise last
+                    return last
+
+            r = None
+            try:
+                r = send(method, rest_uri, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                # A call that never connected did not reach the controller, so it is always safe to retry
+                retry = idempotent or _not_sent(e)
+                if breaker is not None:
+                    breaker.failure()
+                if not retry or attempt >= self.retries:
+                    raise
+                last = e
+            except Exception:
+                # Not a controller failure (e.g. an invalid URL)
+                if breaker is not None:
+                    breaker.cancel()
+                raise
+            else:
+                if r.status_code not in self.retry_statuses:
+                    if breaker is not None:
+                        breaker.success()
+                    return r
+                if breaker is not None:
+                    breaker.failure()
+                if not idempotent or attempt >= self.retries:
+                    return r
+                # Give the connection back to the pool before retrying
+                r.close()
+                last = r
+
+            time.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+            attempt += 1
+
+
+
+# True if a call failed before it could be sent
+def _not_sent(error):
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
@@ -0,0 +1,257 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##                PORT RATES MODULE                ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides the PortRateTracker class, which turns successive get_port_stats() results into per-port rates.
+#   get_port_stats() only returns cumulative counters. The tracker keeps the previous sample of every port in NumPy arrays
+#   and, on each new sample, works out bits/sec, packets/sec, errors/sec and drops/sec for all ports at once.
+#       * The interval between samples is taken from the port's own duration_sec/duration_nsec when the switch reports it,
+#         so delays in polling or in the REST API do not distort the rates. Otherwise the local clock is used.
+#       * A counter that goes down after passing 2^63 has wrapped around 2^64; the difference is taken modulo 2^64.
+#       * A port whose duration goes down, or whose counters go down without wrapping, has been reset.
+#         Its counters are counted from zero, over the time since the reset when it is known.
+#       * Counters reported as 0xffffffffffffffff (not supported by the switch) give NaN rates.
+
+### REQUIREMENTS ###
+#   "NumPy" library: http://www.numpy.org/
+#   Install using: pip install numpy
+
+### USAGE INSTRUCTIONS ###
+#   1. Create a tracker, then pass it every get_port_stats() result as it is polled:
+#           >> tracker = PortRateTracker()
+#           >> tracker.update(switch1.get_port_stats())
+#           >> time.sleep(10)
+#           >> rates = tracker.update(switch1.get_port_stats())
+#
+#   2. The rates of every port seen in both samples are returned as NumPy arrays keyed by name, one element per port:
+#           >> rates["dpid"], rates["port_no"], rates["rx_bps"], rates["tx_pps"], rates["rx_errors_ps"], rates["tx_dropped_ps"]
+#           >> busiest = rates["port_no"][rates["tx_bps"].argmax()]
+#      * Ports seen for the first time have no rates until the next sample.
+#
+#   3. Results of many switches can be given at once (e.g. from RyuFleet), or each switch can be updated separately:
+#           >> results, errors = RyuFleet().get_port_stats()
+#           >> rates = tracker.update(results)
+#
+#   4. Call .forget(DPID) when a switch disconnects, so its next sample is not compared with a stale one.
+
+
+import time
+
+try:
+    from . import ryucolumns
+except (ImportError, ValueError):
+    import ryucolumns
+
+
+### COUNTERS ###
+#   get_port_stats() counter -> name of the rate calculated from it, and the factor applied (8 bits per byte)
+COUNTERS = (
+    ("rx_bytes", "rx_bps", 8),
+    ("tx_bytes", "tx_bps", 8),
+    ("rx_packets", "rx_pps", 1),
+    ("tx_packets", "tx_pps", 1),
+    ("rx_errors", "rx_errors_ps", 1),
+    ("tx_errors", "tx_errors_ps", 1),
+    ("rx_dropped", "rx_dropped_ps", 1),
+    ("tx_dropped", "tx_dropped_ps", 1),
+)
+
+# Value of a counter the switch does not support
+UNSUPPORTED = 2 ** 64 - 1
+
+# A counter that goes down from at least this value is taken to have wrapped around 2^64 rather than reset
+WRAP_THRESHOLD = 2 ** 63
+
+
+
+class PortRateTracker(object):
+
+    def __init__(self):
+        self._np = ryucolumns._numpy()
+
+        # (DPID, port_no) -> row in the arrays below
+        self._rows = {}
+
+        # Previous sample of every port: counters (one column per COUNTERS entry), port duration and local time
+        self._counters = self._np.zeros((0, len(COUNTERS)), dtype=self._np.uint64)
+        self._durations = self._np.zeros(0, dtype=self._np.float64)
+        self._times = self._np.zeros(0, dtype=self._np.float64)
+
+
+
+    ## Return the rows of the given ports, adding rows for new ports ##
+    def _get_rows(self, keys):
+        np = self._np
+        rows = np.empty(len(keys), dtype=np.intp)
+        new = np.zeros(len(keys), dtype=bool)
+
+        for i, key in enumerate(keys):
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = len(self._rows)
+                new[i] = True
+            rows[i] = row
+
+        # Grow the arrays (doubling) to make room for the new rows
+        size = len(self._times)
+        if len(self._rows) > size:
+            grow = max(len(self._rows), 2 * size) - size
+            self._counters = np.vstack((self._counters, np.zeros((grow, len(COUNTERS)), dtype=np.uint64)))
+            self._durations = np.concatenate((self._durations, np.zeros(grow)))
+            self._times = np.concatenate((self._times, np.zeros(grow)))
+
+        return rows, new
+
+
+
+    ## Add a new get_port_stats() sample and calculate the rates since the previous one ##
+    def update(self, result, timestamp=None):
+
+        '''
+        Description:
+        Store a new sample of port counters and calculate the rate of every port since its previous sample.
+
+        Arguments:
+        result: Return value of get_port_stats(). The combined results of several switches (e.g. from RyuFleet) are also accepted.
+        timestamp: [OPTIONAL] Time the sample was taken, in seconds (time.time()). Defaults to now.
+                   Only used for ports that do not report duration_sec/duration_nsec.
+
+        Return value:
+        Dictionary of NumPy arrays, one element per port that was also in the previous sample:
+        "dpid", "port_no", "interval" (seconds), "reset" (True if the port was reset since the previous sample),
+        and "rx_bps", "tx_bps", "rx_pps", "tx_pps", "rx_errors_ps", "tx_errors_ps", "rx_dropped_ps", "tx_dropped_ps".
+
+        Usage:
+        tracker = PortRateTracker()
+        tracker.update(switch1.get_port_stats())
+        rates = tracker.update(switch1.get_port_stats())
+        '''
+
+        np = self._np
+        if timestamp is None:
+            timestamp = time.time()
+
+        keys = []
+        samples = []
+        durations = []
+        for DPID, entry in ryucolumns._entries(result):
+            keys.append((ryucolumns._dpid(DPID), entry.get("port_no")))
+            samples.append([_counter(entry.get(counter)) for counter, _, _ in COUNTERS])
+            if "duration_sec" in entry:
+                durations.append(entry["duration_sec"] + entry.get("duration_nsec", 0) / 1e9)
+            else:
+                durations.append(np.nan)
+
+        rows, new = self._get_rows(keys)
+        current = np.array(samples, dtype=np.uint64).reshape(len(keys), len(COUNTERS))
+        durations = np.array(durations, dtype=np.float64)
+
+        previous = self._counters[rows]
+        previous_durations = self._durations[rows]
+        elapsed = timestamp - self._times[rows]
+
+        # Interval between samples: from the port's duration if reported, else the local clock
+        interval = durations - previous_durations
+        by_clock = np.isnan(interval)
+        interval[by_clock] = elapsed[by_clock]
+
+        # Port reset: its duration went down. Count from zero over the time since the reset.
+        port_reset = durations < previous_durations
+        interval[port_reset] = np.minimum(durations[port_reset], elapsed[port_reset])
+
+        # Counters that went down: wrapped around 2^64 if they were past WRAP_THRESHOLD, else reset
+        went_down = current < previous
+        counter_reset = went_down & (previous < WRAP_THRESHOLD)
+        reset = counter_reset | port_reset[:, None]
+
+        # uint64 subtraction is modulo 2^64, which is exactly the difference across a wrap
+        delta = np.where(reset, current, current - previous).astype(np.float64)
+        delta[(current == UNSUPPORTED) | (previous == UNSUPPORTED)] = np.nan
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = delta / interval[:, None]
+        rates[interval <= 0] = np.nan
+
+        # Store the new sample
+        self._counters[rows] = current
+        self._durations[rows] = durations
+        self._times[rows] = timestamp
+
+        # Only ports with a previous sample have rates
+        old = ~new
+        ports = [key for key, is_new in zip(keys, new) if not is_new]
+
+        output = {
+            "dpid": ryucolumns._column(np, [DPID for DPID, _ in ports]),
+            "port_no": ryucolumns._column(np, [port_no for _, port_no in ports]),
+            "interval": interval[old],
+            "reset": reset.any(axis=1)[old],
+        }
+        for i, (_, name, factor) in enumerate(COUNTERS):
+            output[name] = rates[old, i] * factor
+        return output
+
+
+
+    ## Drop the previous samples of a switch (or of every switch) ##
+    def forget(self, DPID=None):
+
+        '''
+        Description:
+        Drop the stored samples of a switch, e.g. after it disconnects. Its next sample starts a new series.
+
+        Arguments:
+        DPID: [OPTIONAL] DPID of the switch. If not specified, every switch is forgotten.
+
+        Return value:
+        None.
+
+        Usage:
+        tracker.forget(DPID)
+        '''
+
+        if DPID is None:
+            self.__init__()
+            return
+
+        DPID = ryucolumns._dpid(DPID)
+        keep = [key for key in sorted(self._rows, key=self._rows.get) if key[0] != DPID]
+        rows = self._np.array([self._rows[key] for key in keep], dtype=self._np.intp)
+
+        self._counters = self._counters[rows]
+        self._durations = self._durations[rows]
+        self._times = self._times[rows]
+        self._rows = dict((key, row) for row, key in enumerate(keep))
+
+
+
+    ## Number of ports tracked ##
+    def __len__(self):
+        return len(self._rows)
+
+
+
+## Counter value as stored: missing or invalid counters are treated as unsupported ##
+def _counter(value):
+    if isinstance(value, bool) or not isinstance(value, ryucolumns._INTEGERS) or not 0 <= value <= UNSUPPORTED:
+        return UNSUPPORTED
+    return value
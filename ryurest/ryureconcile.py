@@ -0,0 +1,355 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##            FLOW TABLE RECONCILER MODULE         ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides the FlowReconciler class, which brings the flow table of a switch in line with a desired list of flows.
+#   The current table is read once with get_flows() and compared to the desired flows. Only the difference is written:
+#       * Desired flows that are missing are added.
+#       * Flows whose actions differ are changed in place with modify_flow_strict() (their counters are kept).
+#       * Flows whose cookie, timeouts or flags differ are replaced with add_flow() (OpenFlow cannot modify these).
+#       * Flows that are not desired are removed with delete_flow_strict().
+#   Flows are identified the same way as by the switch: by table_id, priority and match.
+
+### USAGE INSTRUCTIONS ###
+#   1. Create a reconciler for a switch:
+#           >> reconciler = FlowReconciler( RyuSwitch(DPID) )
+#      * Desired flows must give their priority, unless the OpenFlow version of the switch is given (see DEFAULTS):
+#           >> reconciler = FlowReconciler(switch1, openflow=1.3)
+#      * To only manage part of the table (e.g. flows with your own cookie), pass filters in the same format as get_flows():
+#           >> reconciler = FlowReconciler(switch1, filters={"cookie": 7, "cookie_mask": 0xffff})
+#
+#   2. Converge the switch to the desired flows (payloads in the same format as add_flow()):
+#           >> diff = reconciler.reconcile(desired_flows)
+#           >> print len(diff.add), len(diff.modify), len(diff.replace), len(diff.delete)
+#           >> print diff.failed()        # Payloads that the REST API rejected
+#
+#   3. [OPTIONAL] Only calculate the difference, without changing the switch:
+#           >> diff = reconciler.diff(desired_flows)
+#           >> reconciler.apply(diff)
+
+
+try:
+    from . import ryusession
+except (ImportError, ValueError):
+    import ryusession
+
+
+### FLOW DEFAULTS ###
+#   Values used by Ryu when a field is left out of an add_flow() payload, for OpenFlow v1.2+ (ryu.lib.ofctl_v1_2 and later).
+#   Ryu's ofctl_v1_0 uses OFP_DEFAULT_PRIORITY instead of 0 for the priority: see default_priority().
+#   Flows read from a switch carry every field, so these only apply to payloads.
+DEFAULTS = {
+    "table_id": 0,
+    "priority": 0,
+    "cookie": 0,
+    "idle_timeout": 0,
+    "hard_timeout": 0,
+    "flags": 0,
+}
+
+### OPENFLOW v1.0 DEFAULT PRIORITY ###
+OFP_DEFAULT_PRIORITY = 32768
+
+### MATCH FIELD NAMES ###
+#   Ryu reports some match fields by their OpenFlow v1.0 names, whatever name was used when the flow was added.
+MATCH_ALIASES = {
+    "eth_dst": "dl_dst",
+    "eth_src": "dl_src",
+    "eth_type": "dl_type",
+    "vlan_vid": "dl_vlan",
+    "ipv4_src": "nw_src",
+    "ipv4_dst": "nw_dst",
+    "ip_proto": "nw_proto",
+    "tcp_src": "tp_src",
+    "tcp_dst": "tp_dst",
+    "udp_src": "tp_src",
+    "udp_dst": "tp_dst",
+}
+
+### ACTION ARGUMENTS ###
+#   Action type -> payload field shown after the ':' when Ryu reports the action as a string, e.g. "OUTPUT:2"
+ACTION_ARGUMENTS = {
+    "OUTPUT": "port",
+    "GOTO_TABLE": "table_id",
+    "METER": "meter_id",
+    "GROUP": "group_id",
+    "SET_QUEUE": "queue_id",
+    "SET_MPLS_TTL": "mpls_ttl",
+    "SET_NW_TTL": "nw_ttl",
+    "PUSH_VLAN": "ethertype",
+    "PUSH_MPLS": "ethertype",
+    "POP_MPLS": "ethertype",
+    "PUSH_PBB": "ethertype",
+}
+
+
+
+## Priority Ryu gives a flow whose add_flow() payload leaves it out, for a switch of the given OpenFlow version ##
+def default_priority(openflow):
+    if openflow < 1.2:
+        return OFP_DEFAULT_PRIORITY
+    return DEFAULTS["priority"]
+
+
+
+## Normalise a single match value so that equal values reported in different formats compare equal ##
+def _match_value(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return value
+
+    value = str(value).lower()
+
+    # Numbers may be given as strings, e.g. "0x800"
+    try:
+        return int(value, 0)
+    except ValueError:
+        pass
+
+    # IPv4 prefix lengths are reported as netmasks: "10.0.0.0/24" == "10.0.0.0/255.255.255.0"
+    if "/" in value and "." in value:
+        address, mask = value.split("/", 1)
+        if mask.isdigit():
+            bits = (0xffffffff << (32 - int(mask))) & 0xffffffff
+            mask = ".".join(str((bits >> shift) & 0xff) for shift in (24, 16, 8, 0))
+        if mask == "255.255.255.255":
+            return address
+        return address + "/" + mask
+
+    return value
+
+
+
+## Normalise an action so that payload actions ({"type": "OUTPUT", "port": 2}) and reported actions ("OUTPUT:2") compare equal ##
+def _action(action):
+    if not isinstance(action, dict):
+        return str(action).replace(" ", "")
+
+    action_type = action.get("type")
+    if action_type == "SET_FIELD":
+        return "SET_FIELD:{%s:%s}" % (action["field"], action["value"])
+    if action_type == "WRITE_METADATA":
+        return "WRITE_METADATA:0x%x/0x%x" % (int(action["metadata"]), int(action.get("metadata_mask", 0xffffffffffffffff)))
+    if action_type in ACTION_ARGUMENTS:
+        return "%s:%s" % (action_type, action[ACTION_ARGUMENTS[action_type]])
+    if action_type is not None and len(action) == 1:
+        return action_type
+
+    # Anything else (e.g. WRITE_ACTIONS) is compared structurally
+    return repr(sorted(action.items()))
+
+
+
+## Identity of a flow in its table: (table_id, priority, match) ##
+def flow_key(flow):
+    match = flow.get("match") or {}
+    return (
+        int(flow.get("table_id", DEFAULTS["table_id"])),
+        int(flow.get("priority", DEFAULTS["priority"])),
+        frozenset((MATCH_ALIASES.get(field, field), _match_value(value)) for field, value in match.items()),
+    )
+
+
+
+## Everything about a flow that reconciling may need to change, besides its identity ##
+def flow_state(flow):
+    return (
+        tuple(_action(action) for action in flow.get("actions") or ()),
+        int(flow.get("cookie", DEFAULTS["cookie"])),
+        int(flow.get("idle_timeout", DEFAULTS["idle_timeout"])),
+        int(flow.get("hard_timeout", DEFAULTS["hard_timeout"])),
+        int(flow.get("flags", DEFAULTS["flags"])),
+    )
+
+
+
+class FlowDiff(object):
+
+    def __init__(self):
+        # Payloads to send with add_flow(): desired flows missing from the switch
+        self.add = []
+
+        # Payloads to send with modify_flow_strict(): only the actions differ
+        self.modify = []
+
+        # Payloads to send with add_flow(), replacing the existing flow: the cookie, timeouts or flags differ
+        self.replace = []
+
+        # Payloads to send with delete_flow_strict(): flows on the switch that are not desired
+        self.delete = []
+
+        # Operation name -> list of booleans (one per payload), filled in by FlowReconciler.apply()
+        self.status = {}
+
+
+
+    ## Number of writes needed to converge ##
+    def __len__(self):
+        return len(self.add) + len(self.modify) + len(self.replace) + len(self.delete)
+
+
+
+    ## Return the payloads rejected by the REST API, as a dictionary of operation name -> list of payloads ##
+    def failed(self):
+        failed = {}
+        for operation, status in self.status.items():
+            payloads = [payload for payload, ok in zip(getattr(self, operation), status) if not ok]
+            if payloads:
+                failed[operation] = payloads
+        return failed
+
+
+
+class FlowReconciler(object):
+
+    def __init__(self, switch, filters={}, key=flow_key, state=flow_state, openflow=None):
+        # RyuSwitch whose flow table is managed
+        self.switch = switch
+
+        # [OPTIONAL] OpenFlow version of the switch, giving the priority of desired flows that leave it out.
+        # If not specified, every desired flow must give its priority.
+        self.openflow = openflow
+
+        # [OPTIONAL] get_flows() filter restricting which part of the table is managed
+        self.filters = filters
+
+        # Functions returning the identity and the state of a flow (payload or reported flow)
+        self.key = key
+        self.state = state
+
+
+
+    ## Compare the switch's flow table with the desired flows ##
+    def diff(self, desired):
+
+        '''
+        Description:
+        Read the flow table of the switch once and work out the writes needed to make it match the desired flows.
+
+        Arguments:
+        desired: List of flow payloads, in the same format as for add_flow(). The "dpid" field may be left out.
+
+        Return value:
+        FlowDiff containing the payloads to add, modify, replace and delete. False if the flow table could not be read.
+        Raises ValueError if a desired flow has no priority and the OpenFlow version of the reconciler was not given.
+
+        Usage:
+        diff = reconciler.diff(desired_flows)
+        print len(diff)    # Number of writes needed
+        '''
+
+        flows = self.switch.get_flows(self.filters)
+        if flows is False:
+            return False
+
+        current = {}
+        for flow in flows.get(str(self.switch.DPID), []):
+            current[self.key(flow)] = flow
+
+        diff = FlowDiff()
+        for payload in desired:
+            payload = dict(payload, dpid=self.switch.DPID)
+            if "priority" not in payload:
+                # Compare with the priority Ryu will give the flow, which depends on the OpenFlow version
+                if self.openflow is None:
+                    raise ValueError("Desired flow has no priority. Give it one, or give the OpenFlow version of the switch: FlowReconciler(switch, openflow=1.3)")
+                payload["priority"] = default_priority(self.openflow)
+
+            flow = current.pop(self.key(payload), None)
+
+            if flow is None:
+                diff.add.append(payload)
+                continue
+
+            state, current_state = self.state(payload), self.state(flow)
+            if state == current_state:
+                continue
+            elif state[1:] == current_state[1:]:
+                diff.modify.append(payload)
+            else:
+                diff.replace.append(payload)
+
+        # Whatever is left on the switch is not desired
+        for flow in current.values():
+            diff.delete.append({
+                "dpid": self.switch.DPID,
+                "table_id": flow.get("table_id", DEFAULTS["table_id"]),
+                "priority": flow.get("priority", DEFAULTS["priority"]),
+                "match": flow.get("match") or {},
+            })
+
+        return diff
+
+
+
+    ## Write a FlowDiff to the switch ##
+    def apply(self, diff, window=ryusession.WINDOW):
+
+        '''
+        Description:
+        Send the writes in a FlowDiff to the switch. New and replaced flows are written before anything is deleted.
+
+        Arguments:
+        diff: FlowDiff returned by diff().
+        window: [OPTIONAL] Maximum number of calls in flight at once. Defaults to ryusession.WINDOW.
+
+        Return value:
+        The same FlowDiff, with .status filled in. Use diff.failed() to get the rejected payloads.
+
+        Usage:
+        diff = reconciler.apply(reconciler.diff(desired_flows))
+        '''
+
+        diff.status["add"] = self.switch.add_flows(diff.add, window)
+        diff.status["replace"] = self.switch.add_flows(diff.replace, window)
+        diff.status["modify"] = self.switch.modify_flows(diff.modify, strict=True, window=window)
+        diff.status["delete"] = self.switch.delete_flows(diff.delete, strict=True, window=window)
+        return diff
+
+
+
+    ## Converge the switch to the desired flows ##
+    def reconcile(self, desired, window=ryusession.WINDOW):
+
+        '''
+        Description:
+        Read the flow table of the switch once, then write only the changes needed to make it match the desired flows.
+
+        Arguments:
+        desired: List of flow payloads, in the same format as for add_flow(). The "dpid" field may be left out.
+        window: [OPTIONAL] Maximum number of calls in flight at once. Defaults to ryusession.WINDOW.
+
+        Return value:
+        FlowDiff of the writes made, with .status filled in. False if the flow table could not be read.
+
+        Usage:
+        reconciler = FlowReconciler( RyuSwitch(DPID) )
+        diff = reconciler.reconcile(desired_flows)
+        if diff is not False and not diff.failed():
+            print "Converged with " + str(len(diff)) + " writes"
+        '''
+
+        diff = self.diff(desired)
+        if diff is False:
+            return False
+        return self.apply(diff, window)
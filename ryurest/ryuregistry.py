@@ -0,0 +1,431 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##            CONTROLLER REGISTRY MODULE           ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides the RyuRegistry class, for fabrics split across several Ryu controllers, each owning some of the switches.
+#   The registry asks every controller which DPIDs it reports (/stats/switches) and keeps a DPID -> controller map.
+#   Every per-DPID call is then sent to the controller owning that switch: getters, and writes whose payload carries the "dpid".
+#   A registry is a RyuFleet: calls on many switches run concurrently, and are interleaved across the controllers
+#   so that every controller is kept busy, rather than one controller at a time.
+
+### USAGE INSTRUCTIONS ###
+#   1. Create a registry from the base REST API URIs of the controllers. They are queried for their switches straight away:
+#           >> registry = RyuRegistry(["http://192.168.1.30:8080", "http://192.168.1.31:8080"])
+#           >> registry.controller(DPID)                                    # "http://192.168.1.31:8080"
+#
+#   2. Get a RyuSwitch pointed at the right controller:
+#           >> flows = registry.switch(DPID).get_flows()
+#
+#   3. Send writes. The controller is picked from the "dpid" of each payload (dictionary or ryutemplate.Payload):
+#           >> registry.add_flow(payload)
+#           >> status = registry.add_flows(payloads)          # One bulk call per controller, all controllers at once
+#
+#   4. Call a RyuSwitch getter, or any other method with .run(), on many switches of all controllers at once (as with RyuFleet):
+#           >> results, errors = registry.get_port_stats()
+#           >> results, errors = registry.run("delete_flow_all", DPIDs=[1, 2])
+#
+#   5. Call .refresh() to pick up switches that have connected or moved since, and .close() when done.
+#      A DPID that is not in the map is looked up again once (with .refresh()) before a KeyError is raised.
+#      .run() and the getters put that KeyError in their errors, like any other failure of a single switch.
+
+
+import threading
+from collections import OrderedDict
+
+try:
+    from . import ryusession
+    from .ryufleet import RyuFleet, WORKERS
+    from .ryuswitch import RyuSwitch
+except (ImportError, ValueError):
+    import ryusession
+    from ryufleet import RyuFleet, WORKERS
+    from ryuswitch import RyuSwitch
+
+
+### PAYLOAD WRITES ###
+#   RyuSwitch methods taking one payload carrying the "dpid", that can be called directly on a registry, e.g. registry.add_flow()
+WRITERS = (
+    "add_flow", "modify_flow", "modify_flow_strict", "delete_flow", "delete_flow_strict",
+    "add_group", "modify_group", "delete_group", "modify_port",
+    "add_meter", "modify_meter", "delete_meter", "modify_role",
+)
+
+
+
+## Return the DPID a payload is for, from a dictionary or ryutemplate.Payload ##
+def payload_dpid(payload):
+    if isinstance(payload, dict):
+        DPID = payload.get("dpid")
+    else:
+        DPID = getattr(payload, "dpid", None)
+
+    if DPID is None:
+        raise ValueError("Payload does not carry a dpid, so its controller is unknown: %r" % (payload,))
+    return DPID
+
+
+
+## Return the key of a DPID in the map. Controllers report DPIDs as integers, payloads and users may give strings. ##
+def _key(DPID):
+    try:
+        return int(DPID)
+    except (TypeError, ValueError):
+        return DPID
+
+
+
+## KeyError for DPIDs that no controller reports ##
+def _unknown(DPIDs):
+    return KeyError("DPID %s is not reported by any controller" % ", ".join(str(DPID) for DPID in DPIDs))
+
+
+
+class RyuRegistry(RyuFleet):
+
+    def __init__(self, APIs, workers=WORKERS, session=None):
+        ### Base REST API URIs of the controllers ###
+        # Warning: DO NOT add a trailing '/' at the end or API will fail.
+        # A switch reported by more than one controller is sent to the first one listed.
+        self.APIs = list(APIs)
+        if not self.APIs:
+            raise ValueError("RyuRegistry needs the base REST API URI of at least one controller")
+
+        # Only one refresh at a time
+        self._refresh_lock = threading.Lock()
+
+        # DPID -> base REST API URI of the controller owning it
+        self.controllers = {}
+
+        # Set up the fleet (its API is the first controller), which calls refresh() to find the switches of every controller
+        RyuFleet.__init__(self, API=self.APIs[0], workers=workers, session=session)
+
+        # Keep enough pooled connections open to each controller for every worker
+        for API in self.APIs[1:]:
+            self.session.ensure_pool_size(API, workers)
+
+
+
+    ## Re-read the switches of every controller ##
+    def refresh(self):
+
+        '''
+        Description:
+        Ask every controller (concurrently) which switches it reports, and rebuild the DPID -> controller map.
+        The switches of a controller that does not answer are kept as they were.
+
+        Arguments:
+        None.
+
+        Return value:
+        Tuple of two dictionaries: (results, errors).
+        results: controller API -> list of DPIDs, for every controller that answered.
+        errors: controller API -> the exception raised, or False if the REST API call failed.
+
+        Usage:
+        registry = RyuRegistry(["http://192.168.1.30:8080", "http://192.168.1.31:8080"])
+        results, errors = registry.refresh()
+        '''
+
+        def call(API):
+            switch = RyuSwitch(session=self.session)
+            switch.API = API
+            try:
+                return switch.get_switches(), None
+            except Exception as e:
+                return None, e
+
+        with self._refresh_lock:
+            results = {}
+            errors = {}
+            for API, (value, error) in zip(self.APIs, self._get_pool().map(call, self.APIs)):
+                if error is not None:
+                    errors[API] = error
+                elif value is False:
+                    errors[API] = False
+                else:
+                    results[API] = value
+
+            # DPIDs of each controller, in the order the controllers are listed
+            owned = []
+            for API in self.APIs:
+                if API in results:
+                    DPIDs = results[API]
+                else:
+                    DPIDs = [DPID for DPID, owner in self.controllers.items() if owner == API]
+                owned.append((API, [_key(DPID) for DPID in DPIDs]))
+
+            controllers = {}
+            for API, DPIDs in owned:
+                for DPID in DPIDs:
+                    controllers.setdefault(DPID, API)
+
+            # Take one switch of each controller in turn, so that fan-out calls are spread over all of them
+            owned = [[(DPID, API) for DPID in DPIDs if controllers[DPID] == API] for API, DPIDs in owned]
+            switches = OrderedDict()
+            for position in range(max([len(DPIDs) for DPIDs in owned] + [0])):
+                for DPIDs in owned:
+                    if position < len(DPIDs):
+                        DPID, API = DPIDs[position]
+                        switch = self.switches.get(DPID)
+                        if switch is None or switch.API != API:
+                            switch = RyuSwitch(DPID, session=self.session)
+                            switch.API = API
+                        switches[DPID] = switch
+
+            # Replaced at once, so calls made during a refresh see either the old or the new map
+            self.controllers = controllers
+            self.switches = switches
+
+        return results, errors
+
+
+
+    ## Return the controller owning a switch ##
+    def controller(self, DPID):
+
+        '''
+        Description:
+        Return the base REST API URI of the controller owning a switch.
+
+        Arguments:
+        DPID: Datapath ID (DPID) of the switch.
+
+        Return value:
+        Base REST API URI string. Raises KeyError if no controller reports the switch, even after a refresh.
+
+        Usage:
+        API = registry.controller(123917682136708)
+        '''
+
+        return self.switch(DPID).API
+
+
+
+    ## Return a RyuSwitch pointed at the controller owning a switch ##
+    def switch(self, DPID):
+
+        '''
+        Description:
+        Return the RyuSwitch object of a switch, with its API set to the controller owning it.
+
+        Arguments:
+        DPID: Datapath ID (DPID) of the switch.
+
+        Return value:
+        RyuSwitch object. Raises KeyError if no controller reports the switch, even after a refresh.
+
+        Usage:
+        flows = registry.switch(123917682136708).get_flows()
+        '''
+
+        DPID = _key(DPID)
+        switch = self.switches.get(DPID)
+        if switch is None:
+            # The switch may have connected (or moved) since the last refresh
+            self.refresh()
+            switch = self.switches.get(DPID)
+            if switch is None:
+                raise _unknown([DPID])
+        return switch
+
+
+
+    ## Switches come from the controllers: add() returns the switch of a DPID that a controller reports ##
+    def add(self, DPID):
+        return self.switch(DPID)
+
+
+
+    ## Return {DPID: RyuSwitch} for the DPIDs that a controller reports, refreshing at most once for all of them ##
+    def _find(self, DPIDs):
+        DPIDs = [_key(DPID) for DPID in DPIDs]
+        if any(DPID not in self.switches for DPID in DPIDs):
+            self.refresh()
+        switches = self.switches
+        return dict((DPID, switches[DPID]) for DPID in DPIDs if DPID in switches)
+
+
+
+    ## Used by RyuFleet.run(): the DPIDs that no controller reports get a KeyError in run()'s errors ##
+    def _lookup_all(self, DPIDs):
+        found = self._find(DPIDs)
+        switches = []
+        errors = {}
+        for DPID in DPIDs:
+            switch = found.get(_key(DPID))
+            if switch is None:
+                errors[DPID] = _unknown([DPID])
+            else:
+                switches.append((DPID, switch))
+        return switches, errors
+
+
+
+    ## Return the DPIDs of every controller ##
+    def get_switches(self):
+
+        '''
+        Description:
+        Return the DPIDs of the switches of every controller, as of the last refresh.
+
+        Arguments:
+        None.
+
+        Return value:
+        List of DPIDs.
+
+        Usage:
+        DPID_list = registry.get_switches()
+        '''
+
+        return list(self.switches)
+
+
+
+    ## Send one payload to the controller owning its switch ##
+    def write(self, method, payload):
+
+        '''
+        Description:
+        Call a RyuSwitch write method on the controller owning the switch given by the "dpid" of the payload.
+
+        Arguments:
+        method: Name of the RyuSwitch method to call, e.g. "add_flow".
+        payload: Data payload, as for that method. A dictionary or ryutemplate.Payload carrying the dpid.
+
+        Return value:
+        Boolean. True if successful, False if error.
+        Raises ValueError if the payload does not carry a dpid, KeyError if no controller reports the switch.
+
+        Usage:
+        registry.write("add_flow", payload)
+        '''
+
+        return getattr(self.switch(payload_dpid(payload)), method)(payload)
+
+
+
+    ## Send many flow payloads, each to the controller owning its switch ##
+    def add_flows(self, payloads, window=ryusession.WINDOW):
+
+        '''
+        Description:
+        Add many flow entries. The payloads are grouped by controller and each group is sent as one bulk
+        RyuSwitch.add_flows() call, with the calls to all controllers made at once.
+
+        Arguments:
+        payloads: List of data payloads, each in the same format as for add_flow().
+        window: [OPTIONAL] Maximum number of calls in flight at once to each controller. Defaults to ryusession.WINDOW.
+
+        Return value:
+        List of booleans, one per payload and in the same order. True if that flow was added, False if error.
+        Raises ValueError or KeyError (as write() does) before anything is sent if a payload cannot be routed.
+
+        Usage:
+        status = registry.add_flows(payloads, window=64)
+        '''
+
+        return self._write_many("add_flows", payloads, window=window)
+
+
+
+    ## ##
+    def modify_flows(self, payloads, strict=False, window=ryusession.WINDOW):
+
+        '''
+        Description:
+        Modify flow entries for many payloads, each on the controller owning its switch. See add_flows().
+
+        Arguments:
+        payloads: List of data payloads, each in the same format as for modify_flow().
+        strict: [OPTIONAL] If True, each payload is applied as modify_flow_strict(). Otherwise as modify_flow().
+        window: [OPTIONAL] Maximum number of calls in flight at once to each controller. Defaults to ryusession.WINDOW.
+
+        Return value:
+        List of booleans, one per payload and in the same order. True if successful, False if error.
+
+        Usage:
+        status = registry.modify_flows(payloads, strict=True)
+        '''
+
+        return self._write_many("modify_flows", payloads, strict=strict, window=window)
+
+
+
+    ## ##
+    def delete_flows(self, payloads, strict=False, window=ryusession.WINDOW):
+
+        '''
+        Description:
+        Delete flow entries for many payloads, each on the controller owning its switch. See add_flows().
+
+        Arguments:
+        payloads: List of data payloads, each in the same format as for delete_flow().
+        strict: [OPTIONAL] If True, each payload is applied as delete_flow_strict(). Otherwise as delete_flow().
+        window: [OPTIONAL] Maximum number of calls in flight at once to each controller. Defaults to ryusession.WINDOW.
+
+        Return value:
+        List of booleans, one per payload and in the same order. True if successful, False if error.
+
+        Usage:
+        status = registry.delete_flows(payloads, strict=True)
+        '''
+
+        return self._write_many("delete_flows", payloads, strict=strict, window=window)
+
+
+
+    def _write_many(self, method, payloads, **kwargs):
+        payloads = list(payloads)
+
+        DPIDs = [_key(payload_dpid(payload)) for payload in payloads]
+        found = self._find(DPIDs)
+        unknown = [DPID for DPID in OrderedDict.fromkeys(DPIDs) if DPID not in found]
+        if unknown:
+            raise _unknown(unknown)
+
+        # Controller API -> (a switch of that controller, [positions of its payloads])
+        groups = OrderedDict()
+        for position, DPID in enumerate(DPIDs):
+            switch = found[DPID]
+            groups.setdefault(switch.API, (switch, []))[1].append(position)
+
+        def call(group):
+            switch, positions = group
+            return getattr(switch, method)([payloads[position] for position in positions], **kwargs)
+
+        status = [False] * len(payloads)
+        groups = list(groups.values())
+        for (switch, positions), results in zip(groups, self._get_pool().map(call, groups)):
+            for position, ok in zip(positions, results):
+                status[position] = ok
+        return status
+
+
+
+    ## Allow registry.add_flow(payload) etc. as a shortcut for registry.write("add_flow", payload) ##
+    def __getattr__(self, name):
+        if name in WRITERS:
+            def writer(payload):
+                return self.write(name, payload)
+            return writer
+        return RyuFleet.__getattr__(self, name)
@@ -0,0 +1,384 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##              POLLING SCHEDULER MODULE           ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides RyuScheduler, which calls RyuSwitch getters on many switches at regular intervals.
+#   Instead of polling every switch at the same moment, calls are spread out:
+#       * Each (switch, getter) pair starts at a random point within its interval, and every run is moved by a random
+#         jitter, so calls to the controller are spread evenly over time instead of arriving in bursts.
+#       * Each getter has its own interval (e.g. ports every 5s, flows every 60s), or is called only once (e.g. features).
+#       * When a switch fails or responds slowly, its polls are spaced out (up to MAX_BACKOFF times the interval).
+#         The spacing shrinks back once it responds normally again.
+#       * No more than 'max_in_flight' calls are made at once to each controller URL, however many switches it has.
+#         Calls over the limit wait for a call to that controller to complete.
+
+### USAGE INSTRUCTIONS ###
+#   1. Create a scheduler for some switches (RyuSwitch objects or DPIDs):
+#           >> scheduler = RyuScheduler([1, 2, 3], API="http://192.168.1.30:8080")
+#           >> scheduler = RyuScheduler( [RyuSwitch(1), RyuSwitch(2)], max_in_flight=4 )
+#
+#   2. Schedule getters. The callback is called with (DPID, method, result, error) after every call:
+#           >> def store(DPID, method, result, error):
+#           ..     if result:
+#           ..         database.save(DPID, method, result)
+#           >> scheduler.every(5, "get_port_stats", store)
+#           >> scheduler.every(60, "get_flows", store)
+#           >> scheduler.once("get_table_features", store)
+#      * Arguments for the getter can be given after the callback: scheduler.every(10, "get_queue_stats", store, port=1)
+#      * result is False if the REST API call failed, and error is the exception if the call raised one (else None).
+#
+#   3. Start and stop polling:
+#           >> scheduler.start()
+#           >> scheduler.stop()
+#
+#   4. Switches can be added while running. Every scheduled getter is started for them:
+#           >> scheduler.add_switch(4)
+
+
+import heapq
+import random
+import threading
+import time
+from collections import deque
+from multiprocessing.pool import ThreadPool
+
+try:
+    from . import ryusession
+    from .ryuswitch import RyuSwitch
+except (ImportError, ValueError):
+    import ryusession
+    from ryuswitch import RyuSwitch
+
+
+### DEFAULT WORKER THREADS ###
+WORKERS = 16
+
+### DEFAULT IN-FLIGHT LIMIT ###
+#   Maximum number of calls in flight at once to a single controller URL.
+MAX_IN_FLIGHT = 8
+
+### DEFAULT JITTER ###
+#   Each run is moved by a random amount of up to this fraction of its interval, earlier or later.
+JITTER = 0.1
+
+### BACKOFF ###
+#   A switch is backed off when a call fails or takes longer than SLOW seconds.
+#   Its intervals are multiplied by 2 each time, up to MAX_BACKOFF, and divided by 2 after each normal response.
+SLOW = 2.0
+MAX_BACKOFF = 8
+
+### RETRY INTERVAL (seconds) ###
+#   Time before a failed one-off call (see once()) is retried, multiplied by the switch's backoff.
+RETRY = 5.0
+
+# Clock used for scheduling
+_clock = getattr(time, "monotonic", time.time)
+
+
+
+class _Task(object):
+
+    # A getter scheduled on every switch
+    def __init__(self, method, interval, callback, args, kwargs):
+        self.method = method
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+
+
+
+class _Job(object):
+
+    # A task on one switch
+    def __init__(self, task, switch, due):
+        self.task = task
+        self.switch = switch
+
+        # Time of the next run on the undisturbed schedule, and the time it is actually handed to a worker (moved by jitter)
+        self.base = due
+        self.due = due
+
+
+
+class RyuScheduler(object):
+
+    def __init__(self, switches=(), API="http://localhost:8080", max_in_flight=MAX_IN_FLIGHT, workers=WORKERS,
+                 jitter=JITTER, slow=SLOW, session=None):
+        ### Base REST API URI, for switches given as DPIDs ###
+        self.API = API
+
+        ### HTTP Session, for switches given as DPIDs ###
+        self.session = session if session is not None else ryusession.SESSION
+
+        # Maximum number of calls in flight at once per controller URL
+        self.max_in_flight = max_in_flight
+
+        # Number of worker threads making calls
+        self.workers = workers
+
+        # Fraction of the interval runs are moved by at random, and the response time above which a switch is backed off
+        self.jitter = jitter
+        self.slow = slow
+
+        # (API, DPID) -> RyuSwitch
+        self.switches = {}
+
+        # (API, DPID) -> current backoff factor (1 when healthy)
+        self.backoff = {}
+
+        # Scheduled tasks, started on every switch
+        self._tasks = []
+
+        # Heap of (due time, sequence number, job)
+        self._queue = []
+        self._sequence = 0
+
+        # Controller URL -> calls in flight, and jobs waiting for a call to that controller to complete
+        self._in_flight = {}
+        self._blocked = {}
+
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._pool = None
+
+        for switch in switches:
+            self.add_switch(switch)
+
+
+
+    ## Add a switch (RyuSwitch or DPID) and start every scheduled task on it ##
+    def add_switch(self, switch):
+        if not isinstance(switch, RyuSwitch):
+            DPID = switch
+            switch = RyuSwitch(DPID, session=self.session)
+            switch.API = self.API
+
+        # Keep enough pooled connections open for the calls allowed in flight
+        switch.session.ensure_pool_size(switch.API, self.max_in_flight)
+
+        with self._cond:
+            self.switches[(switch.API, switch.DPID)] = switch
+            self.backoff.setdefault((switch.API, switch.DPID), 1)
+            for task in self._tasks:
+                self._push(_Job(task, switch, self._first_due(task)))
+            self._cond.notify()
+        return switch
+
+
+
+    ## Stop polling a switch ##
+    def remove_switch(self, DPID, API=None):
+        key = (API or self.API, DPID)
+        with self._cond:
+            self.switches.pop(key, None)
+            self.backoff.pop(key, None)
+            # Its jobs are dropped when they next come due
+
+
+
+    ## Call a getter on every switch at a regular interval ##
+    def every(self, interval, method, callback, *args, **kwargs):
+
+        '''
+        Description:
+        Call a RyuSwitch getter on every switch every 'interval' seconds.
+        The first call to each switch is made at a random time within the first interval.
+
+        Arguments:
+        interval: Seconds between calls to each switch (before jitter and backoff).
+        method: Name of the RyuSwitch method, e.g. "get_port_stats".
+        callback: Function called as callback(DPID, method, result, error) after each call, in a worker thread.
+        args, kwargs: Any other arguments are passed to the RyuSwitch method.
+
+        Return value:
+        None.
+
+        Usage:
+        scheduler.every(5, "get_port_stats", store)
+        scheduler.every(30, "get_queue_stats", store, port=1)
+        '''
+
+        self._add_task(_Task(method, interval, callback, args, kwargs))
+
+
+
+    ## Call a getter once on every switch ##
+    def once(self, method, callback, *args, **kwargs):
+
+        '''
+        Description:
+        Call a RyuSwitch getter once on every switch (and on switches added later), e.g. for features that never change.
+        Failed calls are retried after RETRY seconds (times the switch's backoff) until one succeeds.
+
+        Arguments:
+        Same as every(), without the interval.
+
+        Return value:
+        None.
+
+        Usage:
+        scheduler.once("get_table_features", store)
+        '''
+
+        self._add_task(_Task(method, None, callback, args, kwargs))
+
+
+
+    def _add_task(self, task):
+        with self._cond:
+            self._tasks.append(task)
+            for switch in self.switches.values():
+                self._push(_Job(task, switch, self._first_due(task)))
+            self._cond.notify()
+
+
+
+    def _first_due(self, task):
+        if task.interval:
+            return _clock() + random.uniform(0, task.interval)
+        return _clock() + random.uniform(0, RETRY * self.jitter)
+
+
+
+    def _push(self, job):
+        self._sequence += 1
+        heapq.heappush(self._queue, (job.due, self._sequence, job))
+
+
+
+    ## Start polling in background threads ##
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._pool = ThreadPool(self.workers)
+            self._thread = threading.Thread(target=self._dispatch)
+            self._thread.daemon = True
+            self._thread.start()
+
+
+
+    ## Stop polling. Calls in flight are completed first ##
+    def stop(self):
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            self._cond.notify()
+        self._thread.join()
+        self._pool.close()
+        self._pool.join()
+        self._thread = None
+        self._pool = None
+
+
+
+    ## Hand jobs to the workers as they come due ##
+    def _dispatch(self):
+        with self._cond:
+            while self._running:
+                if not self._queue:
+                    self._cond.wait()
+                    continue
+
+                due, _, job = self._queue[0]
+                now = _clock()
+                if due > now:
+                    self._cond.wait(due - now)
+                    continue
+                heapq.heappop(self._queue)
+
+                key = (job.switch.API, job.switch.DPID)
+                if self.switches.get(key) is not job.switch:
+                    # Switch removed
+                    continue
+
+                API = job.switch.API
+                if self._in_flight.get(API, 0) >= self.max_in_flight:
+                    # Wait for a call to this controller to complete. Jobs for other controllers carry on.
+                    self._blocked.setdefault(API, deque()).append(job)
+                    continue
+
+                self._in_flight[API] = self._in_flight.get(API, 0) + 1
+                self._pool.apply_async(self._run, (job,))
+
+
+
+    ## Make one call, then schedule the next one ##
+    def _run(self, job):
+        task = job.task
+        switch = job.switch
+        key = (switch.API, switch.DPID)
+
+        result = None
+        error = None
+        start = _clock()
+        try:
+            result = getattr(switch, task.method)(*task.args, **task.kwargs)
+        except Exception as e:
+            error = e
+        elapsed = _clock() - start
+        ok = error is None and result is not False
+
+        try:
+            task.callback(switch.DPID, task.method, result, error)
+        except Exception:
+            # A failing callback must not stop the polling
+            pass
+
+        with self._cond:
+            API = switch.API
+            self._in_flight[API] -= 1
+            blocked = self._blocked.get(API)
+            if blocked:
+                job_waiting = blocked.popleft()
+                job_waiting.due = _clock()
+                self._push(job_waiting)
+
+            # Back off slow or failing switches, recover gradually
+            backoff = self.backoff.get(key, 1)
+            if ok and elapsed <= self.slow:
+                backoff = max(1, backoff // 2)
+            else:
+                backoff = min(MAX_BACKOFF, backoff * 2)
+            if key in self.backoff:
+                self.backoff[key] = backoff
+
+            now = _clock()
+            if task.interval:
+                # Keep to the original schedule (no drift). Runs that were missed are skipped.
+                interval = task.interval * backoff
+                job.base = job.base + interval
+                if job.base < now:
+                    job.base = job.base + (int((now - job.base) // interval) + 1) * interval
+
+                # Jitter only moves when this run is handed out. The next run is again counted from job.base.
+                job.due = max(now, job.base + random.uniform(-self.jitter, self.jitter) * task.interval)
+                self._push(job)
+            elif not ok:
+                job.due = now + RETRY * backoff
+                self._push(job)
+
+            self._cond.notify()
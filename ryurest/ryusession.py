@@ -0,0 +1,524 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##             SHARED HTTP SESSION MODULE          ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides the HTTP transport shared by the ryuswitch and ryufunc modules.
+#   Every call made by a RyuSwitch object or a ryufunc function is routed through a RyuSession,
+#   which keeps connections to the Ryu REST API alive and re-uses them between calls
+#   instead of opening a new TCP connection for every request.
+
+### REQUIREMENTS ###
+#   "Requests" library: http://docs.python-requests.org/en/master/
+#   Install using: pip install requests
+#   Requests (and ryupolicy) are only imported when the first call is made, so importing this module is fast.
+
+### USAGE INSTRUCTIONS ###
+#   1. Nothing needs to be done to use the shared session. Both ryuswitch and ryufunc use ryusession.SESSION by default.
+#
+#   2. [OPTIONAL] Change the number of pooled connections kept open to a controller. For example:
+#           >> ryusession.SESSION.set_pool_size("http://192.168.1.30:8080", 50)
+#      * The pool size should be at least the number of threads making calls to that controller at the same time.
+#      * Controllers without an explicit pool size use the session default (POOL_SIZE).
+#
+#   3. [OPTIONAL] Use a separate session for some switches (for example, to keep their connections isolated):
+#           >> session = ryusession.RyuSession(pool_size=4)
+#           >> switch1 = RyuSwitch( DPID, session=session )
+#           >> ryufunc.SESSION = session     # Applies to every ryufunc function
+#
+#   4. [OPTIONAL] Cache the responses of read-only calls. See ryucache.py for more info.
+#           >> ryusession.SESSION.cache = ryucache.RyuCache()
+#
+#   5. [OPTIONAL] Record per-endpoint latency, status codes and sizes, or attach your own tracing. See ryumetrics.py for more info.
+#           >> metrics = ryusession.SESSION.instrument( ryumetrics.RyuMetrics() )
+#
+#   6. [OPTIONAL] Change the timeouts, retries and circuit breaker applied to every call. See ryupolicy.py for more info.
+#           >> ryusession.SESSION.policy = ryupolicy.CallPolicy(read_timeout=10, retries=3)
+#
+#   7. [OPTIONAL] Pipeline flow, group and meter writes, keeping many in flight on each connection. See ryupipeline.py for more info.
+#           >> ryusession.SESSION.pipeline = ryupipeline.PipelinedWriter(connections=2, depth=32)
+#
+#   8. [OPTIONAL] Choose the JSON backend, or get response bodies undecoded (as bytes). See ryucodec.py for more info.
+#           >> ryusession.SESSION.codec = ryucodec.get("ujson")
+#           >> raw = ryusession.SESSION.as_raw()
+
+
+import copy
+import threading
+import time
+
+try:
+    from . import ryucodec
+except (ImportError, ValueError):
+    import ryucodec
+
+
+### DEFAULT POOL SIZE ###
+#   Number of keep-alive connections held open per controller URL.
+POOL_SIZE = 10
+
+### DEFAULT BULK WINDOW ###
+#   Number of calls kept in flight at once by post_many() (e.g. RyuSwitch.add_flows()).
+WINDOW = 32
+
+# Clock used to time requests for instruments
+_clock = getattr(time, "perf_counter", time.time)
+
+# Stands for the default call policy until it is created
+_DEFAULT = object()
+
+
+
+## Import ryupolicy (and so Requests) ##
+def _ryupolicy():
+    try:
+        from . import ryupolicy
+    except (ImportError, ValueError):
+        import ryupolicy
+    return ryupolicy
+
+
+
+## Whether a call's response may be served from and kept in the cache ##
+def _cacheable(method, kwargs):
+    # Streamed responses are read by the caller, so they cannot be kept
+    return method == "GET" and not kwargs.get("stream")
+
+
+
+class RyuSession(object):
+
+    def __init__(self, pool_size=POOL_SIZE, cache=None, policy=None, codec=None):
+        # Default number of pooled connections per controller
+        self.pool_size = pool_size
+
+        # [OPTIONAL] ryucache.RyuCache holding the responses of GET calls
+        self.cache = cache
+
+        # ryupolicy.CallPolicy applying timeouts, retries and a circuit breaker to every call (a default one if not given,
+        # created when first used). Set to None to make calls without any of these.
+        self._policy = policy if policy is not None else _DEFAULT
+
+        # ryucodec.Codec encoding payloads and decoding responses. None uses the fastest installed backend.
+        self.codec = codec
+
+        # If True, decode() returns the response body as bytes instead of decoding it (see as_raw())
+        self.raw = False
+
+        # [OPTIONAL] ryupipeline.PipelinedWriter sending the writes it handles, instead of Requests
+        self.pipeline = None
+
+        # Controller URL -> pool size, for controllers with their own setting
+        self.pool_sizes = {}
+
+        # Instruments (see ryumetrics.py) told about every request. Empty when instrumentation is off.
+        # Replaced, never changed in place, so requests in flight keep a consistent tuple.
+        self.instruments = ()
+
+        # Mounting adapters is not thread safe in Requests
+        self._lock = threading.Lock()
+
+        # Requests session, created by the first call (see _http())
+        self._session = None
+
+        # Worker threads of post_many(), created by its first call and grown to its largest window (see _get_pool()).
+        # Pools replaced by a larger one finish the calls they were given, and are joined by close().
+        self._pool = None
+        self._pool_workers = 0
+        self._retired_pools = []
+
+
+
+    ## Return the Requests session, creating it (and importing Requests) on first use ##
+    def _http(self):
+        session = self._session
+        if session is not None:
+            return session
+
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.mount("http://", HTTPAdapter(pool_maxsize=self.pool_size))
+                session.mount("https://", HTTPAdapter(pool_maxsize=self.pool_size))
+                for API, pool_size in self.pool_sizes.items():
+                    session.mount(API + "/", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+                self._session = session
+            return self._session
+
+
+
+    @property
+    def policy(self):
+        policy = self._policy
+        if policy is _DEFAULT:
+            with self._lock:
+                if self._policy is _DEFAULT:
+                    self._policy = _ryupolicy().CallPolicy()
+                policy = self._policy
+        return policy
+
+
+
+    @policy.setter
+    def policy(self, policy):
+        self._policy = policy
+
+
+
+    ## Set the connection pool size for a single controller ##
+    def set_pool_size(self, API, pool_size):
+
+        '''
+        Description:
+        Set the number of keep-alive connections held open to a single Ryu controller.
+
+        Arguments:
+        API: Base REST API URI of the controller, e.g. "http://192.168.1.30:8080" (no trailing '/').
+        pool_size: Maximum number of idle connections kept in the pool for that controller.
+
+        Return value:
+        None.
+
+        Usage:
+        ryusession.SESSION.set_pool_size("http://192.168.1.30:8080", 50)
+        '''
+
+        with self._lock:
+            self.pool_sizes[API] = pool_size
+
+            # Before the first call, the adapter is mounted when the Requests session is created
+            if self._session is None:
+                return
+
+            # Requests uses the adapter with the longest matching prefix, so this only affects the given controller.
+            # The trailing '/' stops "http://host:8080" from also matching "http://host:80801".
+            from requests.adapters import HTTPAdapter
+            self._session.mount(API + "/", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+
+
+    ## Make sure at least this many connections are pooled for a controller ##
+    def ensure_pool_size(self, API, pool_size):
+        if self.pool_sizes.get(API, self.pool_size) < pool_size:
+            self.set_pool_size(API, pool_size)
+
+
+
+    ## Add an instrument, called around every request made through this session ##
+    def instrument(self, instrument):
+
+        '''
+        Description:
+        Start telling an instrument about every request made through this session.
+
+        Arguments:
+        instrument: Object with before_request(), after_request() and after_decode() methods,
+                    e.g. ryumetrics.RyuMetrics() or ryumetrics.Hooks(). See ryumetrics.py.
+
+        Return value:
+        The instrument.
+
+        Usage:
+        metrics = ryusession.SESSION.instrument( ryumetrics.RyuMetrics() )
+        '''
+
+        with self._lock:
+            self.instruments = self.instruments + (instrument,)
+        return instrument
+
+
+
+    ## Remove an instrument ##
+    def uninstrument(self, instrument):
+        with self._lock:
+            self.instruments = tuple(i for i in self.instruments if i is not instrument)
+
+
+
+    ## Make a call to the REST API over a pooled connection ##
+    def request(self, method, rest_uri, **kwargs):
+
+        '''
+        Description:
+        Make an HTTP request to the Ryu REST API, re-using a pooled connection where possible.
+
+        Arguments:
+        method: HTTP method, e.g. "GET", "POST" or "DELETE".
+        rest_uri: Full URI of the REST API call.
+        kwargs: Passed through to Requests (e.g. data=, json=). A timeout= given here replaces the policy's timeouts.
+
+        Return value:
+        The Requests response object.
+        Calls are made under the session's call policy (see ryupolicy.py): failed calls may be retried,
+        and ryupolicy.CircuitOpenError is raised without making the call if the controller's breaker is open.
+        '''
+
+        # A GET served from the cache makes no call, so instruments are not told about it
+        cache = self.cache
+        if cache is not None and _cacheable(method, kwargs):
+            r = cache.get(rest_uri)
+            if r is not None:
+                return r
+
+        # With no instruments, nothing is timed or recorded
+        if self.instruments:
+            return self._instrumented_request(method, rest_uri, kwargs)
+        return self._request(method, rest_uri, kwargs)
+
+
+
+    def _instrumented_request(self, method, rest_uri, kwargs):
+        instruments = self.instruments
+        tokens = [instrument.before_request(method, rest_uri, kwargs) for instrument in instruments]
+
+        r = None
+        error = None
+        start = _clock()
+        try:
+            r = self._request(method, rest_uri, kwargs)
+            return r
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed = _clock() - start
+            for instrument, token in zip(instruments, tokens):
+                instrument.after_request(token, method, rest_uri, r, elapsed, error)
+
+
+
+    def _request(self, method, rest_uri, kwargs):
+        cache = self.cache
+        if cache is None:
+            return self._send(method, rest_uri, kwargs)
+
+        # Cache hits were returned by request()
+        cacheable = _cacheable(method, kwargs)
+        if cacheable:
+            generation = cache.generation()
+
+        r = self._send(method, rest_uri, kwargs)
+
+        # Ryu returns HTTP 200 status if successful
+        if r.status_code == 200:
+            if cacheable:
+                cache.put(rest_uri, r, generation)
+            elif method != "GET":
+                # Drop the cached entries this call may have changed (e.g. the flow table after add_flow)
+                cache.written(rest_uri, kwargs.get("json"))
+
+        return r
+
+
+
+    ## Send a request to the controller under the session's call policy ##
+    def _send(self, method, rest_uri, kwargs):
+        payload = kwargs.get("json")
+        if payload is not None:
+            # Encode the payload with the session's codec, instead of letting Requests use the standard library.
+            # Payloads already encoded (e.g. filled in ryutemplate.FlowTemplate) are sent as they are.
+            if not isinstance(payload, bytes):
+                payload = self._codec().dumps(payload)
+            headers = dict(kwargs.get("headers") or {}, **{"Content-Type": "application/json"})
+            kwargs = dict(kwargs, data=payload, headers=headers)
+            del kwargs["json"]
+
+        send = self._http().request
+        pipeline = self.pipeline
+        if pipeline is not None and pipeline.handles(method, rest_uri):
+            send = pipeline.request
+
+        policy = self.policy
+        if policy is None:
+            return send(method, rest_uri, **kwargs)
+        return policy.call(send, method, rest_uri, kwargs)
+
+
+
+    def get(self, rest_uri, **kwargs):
+        return self.request("GET", rest_uri, **kwargs)
+
+
+
+    def post(self, rest_uri, **kwargs):
+        return self.request("POST", rest_uri, **kwargs)
+
+
+
+    def delete(self, rest_uri, **kwargs):
+        return self.request("DELETE", rest_uri, **kwargs)
+
+
+
+    def _codec(self):
+        codec = self.codec
+        if codec is None:
+            codec = self.codec = ryucodec.default()
+        return codec
+
+
+
+    ## Decode the JSON body of a response ##
+    def decode(self, r):
+        if self.raw:
+            return r.content
+        if not self.instruments:
+            return self._codec().loads(r.content)
+
+        instruments = self.instruments
+        start = _clock()
+        content = self._codec().loads(r.content)
+        elapsed = _clock() - start
+        for instrument in instruments:
+            instrument.after_decode(r.request.method, r.url, r, elapsed)
+        return content
+
+
+
+    ## Tell the instruments about a streamed body once it has been read (see ryustream.iter_entries()) ##
+    def stream_read(self, r, elapsed, size):
+        for instrument in self.instruments:
+            instrument.after_decode(r.request.method, r.url, r, elapsed)
+            # Optional, so that instruments written before streaming still work
+            after_read = getattr(instrument, "after_read", None)
+            if after_read is not None:
+                after_read(r.request.method, r.url, r, size)
+
+
+
+    ## Return a session returning response bodies undecoded ##
+    def as_raw(self):
+
+        '''
+        Description:
+        Return a session whose decode() returns the response body (bytes) instead of decoding it.
+        Getters called through it (RyuSwitch(DPID, session=raw), or ryufunc.SESSION = raw) return the body as sent by Ryu,
+        e.g. to forward it elsewhere without decoding and re-encoding it.
+        It shares the connections, cache, policy and pipeline of this session. Instruments added later are not shared.
+
+        Arguments:
+        None.
+
+        Return value:
+        RyuSession.
+
+        Usage:
+        raw = ryusession.SESSION.as_raw()
+        body = RyuSwitch(DPID, session=raw).get_flows()     # b'{"1": [...]}'
+        '''
+
+        # Create the Requests session and policy first, so both sessions share them
+        self._http()
+        self.policy
+
+        session = copy.copy(self)
+        session.raw = True
+        return session
+
+
+
+    ## POST many payloads to the same REST API path, several at a time ##
+    def post_many(self, rest_uri, payloads, window=WINDOW):
+
+        '''
+        Description:
+        POST each payload (encoded to JSON) to the same REST API path, keeping up to 'window' calls in flight at once.
+
+        Arguments:
+        rest_uri: Full URI of the REST API call, e.g. "http://localhost:8080/stats/flowentry/add".
+        payloads: List of payloads (dictionaries) to send.
+        window: [OPTIONAL] Maximum number of calls in flight at once.
+
+        Return value:
+        List of booleans, one per payload and in the same order. True if that call was successful, False if error.
+
+        Usage:
+        status = ryusession.SESSION.post_many(API + "/stats/flowentry/add", payloads, window=64)
+        failed = [payload for payload, ok in zip(payloads, status) if not ok]
+        '''
+
+        payloads = list(payloads)
+        if not payloads:
+            return []
+
+        window = max(1, min(window, len(payloads)))
+
+        # Keep a pooled connection for every call in flight, so none are thrown away after each call.
+        self.ensure_pool_size(rest_uri.split("/stats/", 1)[0], window)
+
+        # The pool may have more workers than this call's window
+        slots = threading.BoundedSemaphore(window)
+
+        def post(payload):
+            with slots:
+                try:
+                    # Ryu returns HTTP 200 status if successful
+                    return self.post(rest_uri, json=payload).status_code == 200
+                except Exception:
+                    # Any failure (connection error, open circuit breaker, unencodable payload...) fails this payload only
+                    return False
+
+        return self._get_pool(window).map(post, payloads)
+
+
+
+    ## Return the worker threads of post_many(), with at least 'workers' of them ##
+    def _get_pool(self, workers):
+        from multiprocessing.pool import ThreadPool
+
+        with self._lock:
+            if self._pool_workers < workers:
+                if self._pool is not None:
+                    # Calls made by other threads may still be using it
+                    self._pool.close()
+                    self._retired_pools.append(self._pool)
+                self._pool = ThreadPool(workers)
+                self._pool_workers = workers
+            return self._pool
+
+
+
+    ## Close all pooled connections, and stop the worker threads of post_many() ##
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+        if self.pipeline is not None:
+            self.pipeline.close()
+
+        with self._lock:
+            pools = self._retired_pools
+            if self._pool is not None:
+                pools.append(self._pool)
+            self._pool = None
+            self._pool_workers = 0
+            self._retired_pools = []
+        for pool in pools:
+            pool.close()
+            pool.join()
+
+
+
+### SHARED SESSION ###
+#   Used by every RyuSwitch object and ryufunc function unless another session is given.
+SESSION = RyuSession()
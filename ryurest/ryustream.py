@@ -0,0 +1,225 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##             STREAMING PARSER MODULE             ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module parses large REST API responses incrementally, as they are downloaded.
+#   Responses such as the flow table are shaped { "<DPID>": [ {entry}, {entry}, ... ] }.
+#   Instead of decoding the whole body at once, iter_entries() yields one entry at a time,
+#   so only the entry being parsed (plus one download chunk) is held in memory, however large the table is.
+#   It is used by RyuSwitch.iter_flows() and ryufunc.iter_flows().
+#   Each entry is decoded with the session's codec (see ryucodec.py), and the session's instruments are told
+#   the time spent decoding and the size of the body once it has been read.
+
+
+import re
+import time
+
+try:
+    from . import ryucodec
+except (ImportError, ValueError):
+    import ryucodec
+
+
+### DOWNLOAD CHUNK SIZE (bytes) ###
+CHUNK_SIZE = 64 * 1024
+
+# Start of the array, or the end of a body without one (e.g. '{}')
+_ARRAY = re.compile(b"[\\[}]")
+
+# What follows the end of an object that may end an entry: the start of the next object, or the end of the array
+_NEXT = re.compile(b"\\s*(?:,\\s*(?=\\{)|(\\]))")
+
+# A whole string, a bracket or comma, or a '"' starting a string that continues in the next chunk
+_TOKENS = re.compile(b'"(?:[^"\\\\]|\\\\.)*"|[][{},]|"', re.DOTALL)
+
+_WHITESPACE = b" \t\n\r"
+
+# Clock used to time decoding for instruments
+_clock = getattr(time, "perf_counter", time.time)
+
+
+
+## Yield the entries of the first JSON array in a streamed response ##
+def iter_entries(response, chunk_size=CHUNK_SIZE, session=None):
+
+    '''
+    Description:
+    Yield each object of the first JSON array in the body of a response, parsing the body as it is downloaded.
+
+    Arguments:
+    response: Requests response object, requested with stream=True.
+    chunk_size: [OPTIONAL] Number of bytes downloaded at a time.
+    session: [OPTIONAL] ryusession.RyuSession the response was requested through. Entries are decoded with its codec,
+             and its instruments are told the decode time and body size. Without one, the default codec is used.
+
+    Return value:
+    Generator of dictionaries, one per array entry. Yields nothing if the body has no array (e.g. '{}').
+    The response is closed once the array ends or the generator is closed.
+    Raises ValueError if the body ends before the array does.
+
+    Usage:
+    r = ryusession.SESSION.get(API + "/stats/flow/1", stream=True)
+    for flow in ryustream.iter_entries(r, session=ryusession.SESSION):
+        print flow["priority"]
+    '''
+
+    codec = session._codec() if session is not None else ryucodec.default()
+    instruments = session.instruments if session is not None else ()
+
+    # Bytes downloaded and seconds spent decoding so far
+    size = [0]
+    elapsed = [0.0]
+
+    def download():
+        for chunk in response.iter_content(chunk_size):
+            size[0] += len(chunk)
+            yield chunk
+
+    def loads(content):
+        start = _clock()
+        try:
+            return codec.loads(content)
+        finally:
+            elapsed[0] += _clock() - start
+
+    entries = _entries(download(), loads if instruments else codec.loads)
+    try:
+        for entry in entries:
+            yield entry
+    finally:
+        entries.close()
+        response.close()
+        if instruments:
+            session.stream_read(response, elapsed[0], size[0])
+
+
+
+## Decode the entries of the first array in a body, given as an iterator of chunks ##
+def _entries(chunks, loads):
+    # The entries downloaded so far are decoded together, as one array, each time a chunk arrives.
+    # Only the entry still being downloaded is held in memory.
+    buf = b""
+
+    # Skip the leading '{"<DPID>": ' up to the start of the array
+    for chunk in chunks:
+        buf += chunk
+        match = _ARRAY.search(buf)
+        if match is not None:
+            if match.group() == b"}":
+                return
+            start = match.end()
+            break
+        buf = b""
+    else:
+        raise ValueError("Response ended before the start of the JSON array")
+
+    # Position and bracket depth _scan() got to, past 'start'
+    scanned = None
+    ended = False
+
+    while True:
+        while start < len(buf) and buf[start:start + 1] in _WHITESPACE:
+            start += 1
+        if buf[start:start + 1] == b"]":
+            return
+
+        batch = None
+        tried = False
+        # Once an entry has been scanned, the rest of it is too: its candidates did not decode
+        for end, following in _candidates(buf, start) if scanned is None else ():
+            try:
+                batch = loads(b"[" + buf[start:end] + b"]")
+            except ValueError:
+                tried = True
+                continue
+            break
+        else:
+            # An object with no candidate is still downloading. Other entries, and objects whose candidates did not
+            # decode, are found by following the brackets, carrying on from where the last chunk stopped.
+            if tried or ended or scanned is not None or buf[start:start + 1] != b"{":
+                pos, depth = scanned if scanned is not None else (start, 0)
+                found, pos, depth = _scan(buf, pos, depth)
+                scanned = pos, depth
+                if found is not None:
+                    end, following = found
+                    batch = loads(b"[" + buf[start:end] + b"]")
+                    scanned = None
+
+        if batch is not None:
+            for entry in batch:
+                yield entry
+            if following is None:
+                return
+            start = following
+            continue
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            if ended:
+                raise ValueError("Response ended before the end of the JSON array")
+            # Scan what is left once before giving up
+            ended = True
+            continue
+
+        # Drop everything already decoded
+        buf = buf[start:] + chunk
+        if scanned is not None:
+            scanned = scanned[0] - start, scanned[1]
+        start = 0
+
+
+
+## Yield where the entries downloaded so far may end, last first, as (end, start of the next entry or None) ##
+def _candidates(buf, start):
+    # Entries are usually objects: try the last few objects followed by another one, or by the end of the array.
+    # A '}' closing an inner object or inside a string gives a batch that does not decode, and the one before is tried.
+    end = len(buf)
+    tries = 3
+    while tries:
+        end = buf.rfind(b"}", start, end)
+        if end < 0:
+            return
+        match = _NEXT.match(buf, end + 1)
+        if match is not None:
+            tries -= 1
+            yield end + 1, None if match.group(1) else match.end()
+
+
+
+## Follow the brackets from pos, at the given depth, to the end of the buffer, outside strings ##
+def _scan(buf, pos, depth):
+    # Return where the last entry found ends, as (end, start of the next entry or None), and the position and depth reached
+    found = None
+    for match in _TOKENS.finditer(buf, pos):
+        token = match.group()
+        if token == b'"':
+            # The string continues in the next chunk
+            return found, match.start(), depth
+        if token in b"[{":
+            depth += 1
+        elif depth > 0 and token in b"]}":
+            depth -= 1
+        elif depth == 0 and token in b",]":
+            if token == b"]":
+                return (match.start(), None), match.end(), depth
+            found = match.start(), match.end()
+    return found, len(buf), depth
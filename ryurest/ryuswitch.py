@@ -27,13 +27,14 @@
 #   This a Python module that provides easy, Object-Orientated access to the Ryu REST API.
 #   The module uses the Requests framework to interact with the RYU REST API.
 #   For a functional approach, use the ryurest.py module which allows you to call the methods directly.
+#   Every method makes its call through the endpoint table in ryuendpoints.py, shared with the ryufunc and ryuasync modules.
 
 ### REQUIREMENTS ###
 #   "Requests" library: http://docs.python-requests.org/en/master/
 #   Install using: pip install requests
 
 ### INSTALLATION ###
-#   Place this file at the root of your project. PIP support is WIP.
+#   Place this file and ryusession.py at the root of your project. PIP support is WIP.
 
 ### USAGE INSTRUCTIONS ###
 #   1. Import this module and the RyuSwitch class into your script. For example:
@@ -73,15 +74,30 @@
 
 
 
-# Use Requests library (required)
-import requests
+# Use the shared pooled session (required)
+try:
+    from . import ryusession
+    from . import ryustream
+    from . import ryuflows
+    from . import ryuindex
+    from . import ryuendpoints
+except (ImportError, ValueError):
+    import ryusession
+    import ryustream
+    import ryuflows
+    import ryuindex
+    import ryuendpoints
 
 class RyuSwitch(object):
 
-    def __init__(self, DPID=None):
+    def __init__(self, DPID=None, session=None):
         # Set switch DPID
         self.DPID = DPID
 
+        ### HTTP Session ###
+        # All calls share the pooled connections of ryusession.SESSION unless another RyuSession is given.
+        self.session = session if session is not None else ryusession.SESSION
+
         ### Base REST API URI ###
         # DO NOT alter this path in this file unless you know what you are doing!
         # Warning: DO NOT add a trailing '/' at the end or API will fail.
@@ -113,23 +129,12 @@ class RyuSwitch(object):
 
         Usage:
         R = RyuSwitch()
-        content = R.list_switches()
+        content = R.get_switches()
         print content[0]
         '''
 
         # Path: /stats/switches
-        rest_uri = self.API + "/stats/switches"
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["switches"].call(self.session, self.API)
 
 
 
@@ -165,18 +170,12 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/desc/<DPID>
-        rest_uri = self.API + "/stats/desc/" + str(self.DPID)
+        return ryuendpoints.ENDPOINTS["desc"].call(self.session, self.API, self.DPID)
 
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
 
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+
+    ## Same as get_stats(), under the name used by ryufunc ##
+    get_switch_stats = get_stats
 
 
 
@@ -206,33 +205,115 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/flow/<DPID>
-        rest_uri = self.API + "/stats/flow/" + str(self.DPID)
+        # If no filter defined, use GET. If filter defined, use POST.
+        return ryuendpoints.ENDPOINTS["flow"].call(self.session, self.API, self.DPID, filters=filters)
+
+
 
+    ## Stream the flow table of the switch one entry at a time. Optionally give a filter. ##
+    def iter_flows(self, filters={}, chunk_size=ryustream.CHUNK_SIZE):
+
+        '''
+        Description:
+        Get all flows stats of the switch, parsing the response as it is downloaded instead of all at once.
+        Memory use stays bounded however many flow entries the switch has.
+
+        Link:
+        http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#get-all-flows-stats
+
+        Arguments:
+        filters: [OPTIONAL] dictionary to filter the results returned, as for get_flows(). See above link.
+        chunk_size: [OPTIONAL] Number of bytes downloaded at a time.
+
+        Return value:
+        Generator yielding one flow entry (dictionary) at a time, in the same format as the entries returned by get_flows().
+        False if the REST API call failed.
+
+        Usage:
+        R = RyuSwitch('123917682136708')
+        flows = R.iter_flows()
+        if flows is not False:
+            for flow in flows:
+                print flow["priority"], flow["match"]
+        '''
+
+        # Path: /stats/flow/<DPID>
         # If no filter defined, use GET. If filter defined, use POST.
-        if not filters:
-            # No filter specified, dump ALL flows.
-            # Make call to REST API (GET)
-            r = requests.get(rest_uri)
-
-            # Ryu returns HTTP 200 status if successful
-            if r.status_code == 200:
-                return r.json()
-            else:
-                return False
-                # If submission fails, Ryu returns HTTP 400 status.
-                # Catch all for HTTP errors.
+        method, rest_uri, kwargs = ryuendpoints.ENDPOINTS["flow"].prepare(self.API, self.DPID, filters=filters)
+
+        # Make call to REST API, leaving the body to be downloaded as it is parsed
+        r = self.session.request(method, rest_uri, stream=True, **kwargs)
+
+        # Ryu returns HTTP 200 status if successful
+        if r.status_code == 200:
+            return ryustream.iter_entries(r, chunk_size, self.session)
         else:
-            # Filter is present, dump only matched flows.
-            # Make call to REST API (POST)
-            r = requests.post(rest_uri, data=filters)
+            r.close()
+            return False
+            # If submission fails, Ryu returns HTTP 400 status.
+            # Catch all for HTTP errors.
+
+
+
+    ## Get the flow table of the switch as a compact FlowTable. Optionally give a filter. ##
+    def get_flow_table(self, filters={}):
+
+        '''
+        Description:
+        Get all flows stats of the switch as a FlowTable, which uses several times less memory than the result of get_flows().
+        The response is streamed into the table, so the full get_flows() result is never held in memory.
+
+        Link:
+        http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#get-all-flows-stats
 
-            # Ryu returns HTTP 200 status if successful
-            if r.status_code == 200:
-                return r.json()
-            else:
-                return False
-                # If submission fails, Ryu returns HTTP 400 status.
-                # Catch all for HTTP errors.
+        Arguments:
+        filters: [OPTIONAL] dictionary to filter the results returned, as for get_flows(). See above link.
+
+        Return value:
+        ryuflows.FlowTable of FlowEntry records. False if the REST API call failed.
+
+        Usage:
+        R = RyuSwitch('123917682136708')
+        table = R.get_flow_table()
+        print table[0].priority, table[0]["match"]
+        '''
+
+        flows = self.iter_flows(filters)
+        if flows is False:
+            return False
+
+        return ryuflows.FlowTable(flows, self.DPID)
+
+
+
+    ## Get the flow table of the switch as a FlowIndex, which can be queried locally. Optionally give a filter. ##
+    def get_flow_index(self, filters={}):
+
+        '''
+        Description:
+        Get all flows stats of the switch as a FlowIndex, which finds flows by match field, cookie, table_id, priority or
+        output port without calling the REST API again. See ryuindex.py for more info.
+
+        Link:
+        http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#get-all-flows-stats
+
+        Arguments:
+        filters: [OPTIONAL] dictionary to filter the results returned, as for get_flows(). See above link.
+
+        Return value:
+        ryuindex.FlowIndex of the flows. False if the REST API call failed.
+
+        Usage:
+        R = RyuSwitch('123917682136708')
+        index = R.get_flow_index()
+        print index.find(in_port=3)
+        '''
+
+        flows = self.iter_flows(filters)
+        if flows is False:
+            return False
+
+        return ryuindex.FlowIndex(flows, self.DPID)
 
 
 
@@ -260,21 +341,8 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/aggregateflow/<DPID>
-        rest_uri = self.API + "/stats/aggregateflow/" + str(self.DPID)
-
         # If no filter defined, use GET. If filter defined, use POST.
-        if not filters:
-            # No filter specified, dump ALL flows.
-            # Make call to REST API (GET)
-            r = requests.get(rest_uri)
-
-            return r.json()
-        else:
-            # Filter is present, dump only matched flows.
-            # Make call to REST API (POST)
-            r = requests.post(rest_uri, data=filters)
-
-            return r.json()
+        return ryuendpoints.ENDPOINTS["aggregateflow"].call(self.session, self.API, self.DPID, filters=filters)
 
 
 
@@ -303,18 +371,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/table/<DPID>
-        rest_uri = self.API + "/stats/table/" + str(self.DPID)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["table"].call(self.session, self.API, self.DPID)
 
 
 
@@ -341,18 +398,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/tablefeatures/<DPID>
-        rest_uri = self.API + "/stats/tablefeatures/" + str(self.DPID)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["tablefeatures"].call(self.session, self.API, self.DPID)
 
 
 
@@ -386,24 +432,10 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/port/<DPID>[/portnumber]
-        rest_uri = self.API + "/stats/port/" + str(self.DPID)
 
         ########## SPECIFYING A PORT IS DISABLED DUE TO BUG ##########
-        # # If ID is specified to filter/match results, alter URI accordingly.
-        # if port is not None:
-        #     # Modify URI to filter port
-        #     rest_uri = rest_uri + '/' + str(port)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        # The port is not passed on: values=(port,) would filter the results.
+        return ryuendpoints.ENDPOINTS["port"].call(self.session, self.API, self.DPID)
 
 
 
@@ -434,27 +466,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/portdesc/<DPID>[/portnumber] (Port number usage restricted to OpenFlow v1.5+)
-        rest_uri = self.API + "/stats/portdesc/" + str(self.DPID)
-
-        if port is not None and openflow is None:
-            print "[ WARNING ]: Port filter specified, but OpenFlow version was not. Filtering is only compatible with OpenFlow v1.5+. Defaulting to no filter & dumping all ports."
-        elif port is not None and openflow < 1.5:
-            print "[ WARNING ]: Port filter specified, but REST API does not allow filtering with specified OpenFlow version (v" + str(openflow) + "). Filtering is only compatible with OpenFlow v1.5+. Defaulting to no filter & dumping all ports."
-        elif port is not None and openflow >= 1.5:
-            # If ID is specified to filter/match results, and compatible OpenFlow version...
-            # Modify URI to filter port
-            rest_uri = rest_uri + '/' + str(port)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["portdesc"].call(self.session, self.API, self.DPID, values=(port,), openflow=openflow)
 
 
 
@@ -486,44 +498,8 @@ class RyuSwitch(object):
         content = R.get_queue_stats('123917682136708')                # Will get stats for ALL Queue IDs on ALL ports.
         '''
 
-        # Path: /stats/queue/<DPID>[/portnumber[/<queue_id>]]
-        rest_uri = self.API + "/stats/queue/" + str(self.DPID)
-
-        # Set URI based on which parameters/filters have been passed in
-        if any(arg is None for arg in [port, queue]):
-            # Only one of either queueID# or port# has been specified...
-
-            if port is not None:
-                # Port# has been specified. QueueID# has NOT been specified. Dump ALL queue stats for specified port.
-
-                # Modify URI to filter port only
-                    # Example (DPID == 1, Port == 2): http://localhost:8080/stats/queuedesc/1/2
-                rest_uri = rest_uri + '/' + str(port)
-
-            elif queue is not None:
-                # QueueID has been specified. Port# has NOT been specified. Dump matched QueueID for ALL ports.
-
-                # Modify URI to filter QueueID only
-                    # Example (DPID == 1, QueueID == 4): http://localhost:8080/stats/queuedesc/1/ALL/4
-                rest_uri = rest_uri + '/ALL/' + str(queue)
-
-        elif all(arg is not None for arg in [port, queue]):
-            # Both Port# AND QueueID have been specified. Dump required data only.
-
-            # Modify URI to filter both Port# and QueueID#
-                # Example (DPID == 1, Port == 2, QueueID == 4): http://localhost:8080/stats/queuedesc/1/2/4
-            rest_uri = rest_uri + '/' + str(port) + '/' + str(queue)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        # Path: /stats/queue/<DPID>[/portnumber[/<queue_id>]] (/ALL/<queue_id> if only the queue is given)
+        return ryuendpoints.ENDPOINTS["queue"].call(self.session, self.API, self.DPID, values=(port, queue))
 
 
 
@@ -555,23 +531,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/queueconfig/<DPID>[/portnumber] (API is DEPRECIATED in OpenFlow v1.4+)
-        rest_uri = self.API + "/stats/queueconfig/" + str(self.DPID)
-
-        # If ID is specified to filter/match results, alter URI accordingly.
-        if port is not None:
-            # Modify URI to filter port
-            rest_uri = rest_uri + '/' + str(port)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["queueconfig"].call(self.session, self.API, self.DPID, values=(port,))
 
 
 
@@ -605,44 +565,8 @@ class RyuSwitch(object):
         This API is only compatible with OpenFlow v1.4+. For v1.0 - v1.3, use: get_queue_config()
         '''
 
-        # Path: /stats/queuedesc/<DPID>[/portnumber[/<queue_id>]]
-        rest_uri = self.API + "/stats/queuedesc/" + str(self.DPID)
-
-        # Set URI based on which parameters/filters have been passed in
-        if any(arg is None for arg in [port, queue]):
-            # Only one of either queueID# or port# has been specified...
-
-            if port is not None:
-                # Port# has been specified. QueueID# has NOT been specified. Dump ALL queue descriptions for specified port.
-
-                # Modify URI to filter port only
-                    # Example (DPID == 1, Port == 2): http://localhost:8080/stats/queuedesc/1/2
-                rest_uri = rest_uri + '/' + str(port)
-
-            elif queue is not None:
-                # QueueID has been specified. Port# has NOT been specified. Dump matched QueueID for ALL ports.
-
-                # Modify URI to filter QueueID only
-                    # Example (DPID == 1, QueueID == 4): http://localhost:8080/stats/queuedesc/1/ALL/4
-                rest_uri = rest_uri + '/ALL/' + str(queue)
-
-        elif all(arg is not None for arg in [port, queue]):
-            # Both Port# AND QueueID have been specified. Dump required data only.
-
-            # Modify URI to filter both Port# and QueueID#
-                # Example (DPID == 1, Port == 2, QueueID == 4): http://localhost:8080/stats/queuedesc/1/2/4
-            rest_uri = rest_uri + '/' + str(port) + '/' + str(queue)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        # Path: /stats/queuedesc/<DPID>[/portnumber[/<queue_id>]] (/ALL/<queue_id> if only the queue is given)
+        return ryuendpoints.ENDPOINTS["queuedesc"].call(self.session, self.API, self.DPID, values=(port, queue))
 
 
 
@@ -671,29 +595,13 @@ class RyuSwitch(object):
         content = R.get_group_stats('123917682136708')       # Will get stats for ALL groups
         '''
 
-        # Path: /stats/group/<DPID>[/portnumber]
-        rest_uri = self.API + "/stats/group/" + str(self.DPID)
-
-        # If ID is specified to filter/match results, alter URI accordingly.
-        if group is not None:
-            # Modify URI to filter meters
-            rest_uri = rest_uri + '/' + str(group)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        # Path: /stats/group/<DPID>[/groupID]
+        return ryuendpoints.ENDPOINTS["group"].call(self.session, self.API, self.DPID, values=(group,))
 
 
 
     ## ##
-    def get_group_description(self, port=None, openflow=None):
+    def get_group_description(self, group=None, openflow=None, port=None):
 
         '''
         Description:
@@ -704,42 +612,24 @@ class RyuSwitch(object):
 
         Arguments:
         DPID: Datapath ID (DPID) of the target switch.
-        port: [OPTIONAL] Specific group# to grab description for. If not specfied, info for all groups is returned. (Restricted to OpenFlow v1.5+)
+        group: [OPTIONAL] Specific group ID# to grab description for. If not specfied, info for all groups is returned. (Restricted to OpenFlow v1.5+)
+        openflow: [OPTIONAL] The OpenFlow version of the switch. Required to filter by group ID.
+        port: [OPTIONAL] Former name of the group argument. Use group instead.
 
         Return value:
         JSON structure containing the group decription. See link above for example message body.
 
         Usage:
         R = RyuSwitch()
-        content = R.get_group_description('123917682136708', 3)    # Will get desc for ONLY Group ID #3. Switch must be OpenFlow v1.5+
+        content = R.get_group_description('123917682136708', group=3, openflow=1.5)    # Will get desc for ONLY Group ID #3. Switch must be OpenFlow v1.5+
         content = R.get_group_description('123917682136708')       # Will get desc for ALL groups. OpenFlow v1.0 - v1.4
 
         Restrictions:
         Specifying a specific groupID is limited to OpenFlow v1.5 and later.
         '''
 
-        # Path: /stats/groupdesc/<DPID>[/portnumber] (Port number usage restricted to OpenFlow v1.5+)
-        rest_uri = self.API + "/stats/groupdesc/" + str(self.DPID)
-
-        if port is not None and openflow is None:
-            print "[ WARNING ]: Port filter specified, but OpenFlow version was not. Filtering is only compatible with OpenFlow v1.5+. Defaulting to no filter & dumping all ports."
-        elif port is not None and openflow < 1.5:
-            print "[ WARNING ]: Port filter specified, but REST API does not allow filtering with specified OpenFlow version (v" + str(openflow) + "). Filtering is only compatible with OpenFlow v1.5+. Defaulting to no filter & dumping all ports."
-        elif port is not None and openflow >= 1.5:
-            # If ID is specified to filter/match results, and compatible OpenFlow version...
-            # Modify URI to filter port
-            rest_uri = rest_uri + '/' + str(port)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        # Path: /stats/groupdesc/<DPID>[/groupID] (Group ID usage restricted to OpenFlow v1.5+)
+        return ryuendpoints.ENDPOINTS["groupdesc"].call(self.session, self.API, self.DPID, values=(group if group is not None else port,), openflow=openflow)
 
 
 
@@ -765,18 +655,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/groupfeatures/<DPID>
-        rest_uri = self.API + "/stats/groupfeatures/" + str(self.DPID)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["groupfeatures"].call(self.session, self.API, self.DPID)
 
 
 
@@ -805,24 +684,8 @@ class RyuSwitch(object):
         content1 = R.get_meter_stats('123917682136708')       # Will get stats for ALL meters
         '''
 
-        # Path: /stats/group/<DPID>[/portnumber]
-        rest_uri = self.API + "/stats/meter/" + str(self.DPID)
-
-        # If ID is specified to filter/match results, alter URI accordingly.
-        if meter is not None:
-            # Modify URI to filter meters
-            rest_uri = rest_uri + '/' + str(meter)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        # Path: /stats/meter/<DPID>[/meterID]
+        return ryuendpoints.ENDPOINTS["meter"].call(self.session, self.API, self.DPID, values=(meter,))
 
 
 
@@ -860,31 +723,8 @@ class RyuSwitch(object):
         Pass in OpenFlow version as argument if using 1.5+, else method will execute v1.0-1.4 call.
         '''
 
-        # Set URI based on OpenFlow version
-        if openflow < 1.5:
-            # OpenFlow v1.0 - 1.4
-            # REST API path: /stats/meterconfig/<dpid>[/<meter_id>]
-            rest_uri = self.API + "/stats/meterconfig/" + str(self.DPID)
-        else:
-            # OpenFlow v1.5+
-            # REST API path: /stats/meterdesc/<dpid>[/<meter_id>]
-            rest_uri = self.API + "/stats/meterdesc/" + str(self.DPID)
-
-        # If ID is specified to filter/match results, alter URI accordingly.
-        if meter is not None:
-            # Modify URI to filter meters
-            rest_uri = rest_uri + '/' + str(meter)   # TODO: Add try/catch in case meter does not exist.
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        # Path: /stats/meterconfig/<DPID>[/meterID] (OpenFlow v1.0 - 1.4), /stats/meterdesc/<DPID>[/meterID] (OpenFlow 1.5+)
+        return ryuendpoints.ENDPOINTS["meterconfig"].call(self.session, self.API, self.DPID, values=(meter,), openflow=openflow)
 
 
 
@@ -910,18 +750,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/meterfeatures/<DPID>
-        rest_uri = self.API + "/stats/meterfeatures/" + str(self.DPID)
-
-        # Make call to REST API (GET)
-        r = requests.get(rest_uri)
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return r.json()
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["meterfeatures"].call(self.session, self.API, self.DPID)
 
 
 
@@ -957,11 +786,11 @@ class RyuSwitch(object):
         # rest_uri = self.API + "/stats/role/" + str(self.DPID)
         #
         # # Make call to REST API (GET)
-        # r = requests.get(rest_uri)
+        # r = self.session.get(rest_uri)
         #
         # # Ryu returns HTTP 200 status if successful
         # if r.status_code == 200:
-        #     return r.json()
+        #     return self.session.decode(r)
         # else:
         #     return False
         #     # If submission fails, Ryu returns HTTP 400 status.
@@ -997,6 +826,7 @@ class RyuSwitch(object):
                 "actions":[{ "type":"OUTPUT", "port": 2 }]
              }
          See link for details on how to construct payload.
+         A filled in ryutemplate.FlowTemplate may be given instead of a dictionary.
 
         Return value:
         Boolean. True if successful, False if error.
@@ -1007,18 +837,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/flowentry/add
-        rest_uri = self.API + "/stats/flowentry/add"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["flowentry/add"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1044,6 +863,7 @@ class RyuSwitch(object):
                 "actions":[{ "type":"OUTPUT", "port": 2 }]
              }
         See link for details on how to construct payload.
+        A filled in ryutemplate.FlowTemplate may be given instead of a dictionary.
 
         Return value:
         Boolean. True if successful, False if error.
@@ -1054,18 +874,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/flowentry/modify
-        rest_uri = self.API + "/stats/flowentry/modify"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["flowentry/modify"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1091,6 +900,7 @@ class RyuSwitch(object):
                 "actions":[{ "type":"OUTPUT", "port": 2 }]
             }
         See link for details on how to construct payload.
+        A filled in ryutemplate.FlowTemplate may be given instead of a dictionary.
 
         Return value:
         Boolean. True if successful, False if error.
@@ -1101,18 +911,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/flowentry/modify_strict
-        rest_uri = self.API + "/stats/flowentry/modify_strict"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["flowentry/modify_strict"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1138,6 +937,7 @@ class RyuSwitch(object):
                 "actions":[{ "type":"OUTPUT", "port": 2 }]
             }
         See link for details on how to construct payload.
+        A filled in ryutemplate.FlowTemplate may be given instead of a dictionary.
 
         Return value:
         Boolean. True if successful, False if error.
@@ -1147,19 +947,8 @@ class RyuSwitch(object):
         R.delete_flow(payload)   # Use if statement to check if successful.
         '''
 
-        # Path: /stats/flowentry/modify_strict
-        rest_uri = self.API + "/stats/flowentry/delete"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        # Path: /stats/flowentry/delete
+        return ryuendpoints.ENDPOINTS["flowentry/delete"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1185,6 +974,7 @@ class RyuSwitch(object):
                 "actions":[{ "type":"OUTPUT", "port": 2 }]
             }
         See link for details on how to construct payload.
+        A filled in ryutemplate.FlowTemplate may be given instead of a dictionary.
 
         Return value:
         Boolean. True if successful, False if error.
@@ -1194,19 +984,8 @@ class RyuSwitch(object):
         R.delete_flow_strict(payload)   # Use if statement to check if successful.
         '''
 
-        # Path: /stats/flowentry/modify_strict
-        rest_uri = self.API + "/stats/flowentry/delete_strict"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        # Path: /stats/flowentry/delete_strict
+        return ryuendpoints.ENDPOINTS["flowentry/delete_strict"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1231,19 +1010,109 @@ class RyuSwitch(object):
         R.delete_flow_all(DPID)   # Use if statement to check if successful.
         '''
 
-        # Path: /stats/flowentry/modify_strict
-        rest_uri = self.API + "/stats/flowentry/clear/" + str(self.DPID)
+        # Path: /stats/flowentry/clear/<DPID>
+        return ryuendpoints.ENDPOINTS["flowentry/clear"].call(self.session, self.API, self.DPID)
 
-        # Make call to REST API (DELETE)
-        r = requests.delete(rest_uri)
 
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
+
+    ###### Modify Flow Entries in Bulk ######
+
+    ## ##
+    def add_flows(self, payloads, window=ryusession.WINDOW):
+
+        '''
+        Description:
+        Add many flow entries, keeping several calls in flight at once over pooled connections.
+
+        Link:
+        http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#add-a-flow-entry
+
+        Arguments:
+        payloads: List of data payloads, each in the same format as for add_flow().
+        window: [OPTIONAL] Maximum number of calls in flight at once. Defaults to ryusession.WINDOW.
+
+        Return value:
+        List of booleans, one per payload and in the same order. True if that flow was added, False if error.
+
+        Usage:
+        R = RyuSwitch()
+        status = R.add_flows(payloads, window=64)
+        failed = [payload for payload, ok in zip(payloads, status) if not ok]
+        '''
+
+        # Path: /stats/flowentry/add
+        rest_uri = ryuendpoints.ENDPOINTS["flowentry/add"].uri(self.API)
+
+        # Make calls to REST API (POST)
+        return self.session.post_many(rest_uri, payloads, window)
+
+
+
+    ## ##
+    def modify_flows(self, payloads, strict=False, window=ryusession.WINDOW):
+
+        '''
+        Description:
+        Modify flow entries for many payloads, keeping several calls in flight at once over pooled connections.
+
+        Link:
+        http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#modify-all-matching-flow-entries
+
+        Arguments:
+        payloads: List of data payloads, each in the same format as for modify_flow().
+        strict: [OPTIONAL] If True, each payload is applied as modify_flow_strict(). Otherwise as modify_flow().
+        window: [OPTIONAL] Maximum number of calls in flight at once. Defaults to ryusession.WINDOW.
+
+        Return value:
+        List of booleans, one per payload and in the same order. True if successful, False if error.
+
+        Usage:
+        R = RyuSwitch()
+        status = R.modify_flows(payloads, strict=True)
+        '''
+
+        # Path: /stats/flowentry/modify or /stats/flowentry/modify_strict
+        if strict:
+            rest_uri = ryuendpoints.ENDPOINTS["flowentry/modify_strict"].uri(self.API)
         else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+            rest_uri = ryuendpoints.ENDPOINTS["flowentry/modify"].uri(self.API)
+
+        # Make calls to REST API (POST)
+        return self.session.post_many(rest_uri, payloads, window)
+
+
+
+    ## ##
+    def delete_flows(self, payloads, strict=False, window=ryusession.WINDOW):
+
+        '''
+        Description:
+        Delete flow entries for many payloads, keeping several calls in flight at once over pooled connections.
+
+        Link:
+        http://ryu.readthedocs.io/en/latest/app/ofctl_rest.html#delete-all-matching-flow-entries
+
+        Arguments:
+        payloads: List of data payloads, each in the same format as for delete_flow().
+        strict: [OPTIONAL] If True, each payload is applied as delete_flow_strict(). Otherwise as delete_flow().
+        window: [OPTIONAL] Maximum number of calls in flight at once. Defaults to ryusession.WINDOW.
+
+        Return value:
+        List of booleans, one per payload and in the same order. True if successful, False if error.
+
+        Usage:
+        R = RyuSwitch()
+        status = R.delete_flows(payloads, strict=True)
+        '''
+
+        # Path: /stats/flowentry/delete or /stats/flowentry/delete_strict
+        if strict:
+            rest_uri = ryuendpoints.ENDPOINTS["flowentry/delete_strict"].uri(self.API)
+        else:
+            rest_uri = ryuendpoints.ENDPOINTS["flowentry/delete"].uri(self.API)
+
+        # Make calls to REST API (POST)
+        return self.session.post_many(rest_uri, payloads, window)
 
 
 
@@ -1283,18 +1152,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/groupentry/add
-        rest_uri = self.API + "/stats/groupentry/add"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["groupentry/add"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1332,18 +1190,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/groupentry/modify
-        rest_uri = self.API + "/stats/groupentry/modify"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["groupentry/modify"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1375,18 +1222,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/groupentry/delete
-        rest_uri = self.API + "/stats/groupentry/delete"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["groupentry/delete"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1421,18 +1257,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/portdesc/modify
-        rest_uri = self.API + "/stats/portdesc/modify"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["portdesc/modify"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1470,18 +1295,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/meterentry/add
-        rest_uri = self.API + "/stats/meterentry/add"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["meterentry/add"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1517,18 +1331,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/meterentry/modify
-        rest_uri = self.API + "/stats/meterentry/modify"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["meterentry/modify"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1560,18 +1363,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/meterentry/delete
-        rest_uri = self.API + "/stats/meterentry/delete"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["meterentry/delete"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1605,18 +1397,7 @@ class RyuSwitch(object):
         '''
 
         # Path: /stats/role
-        rest_uri = self.API + "/stats/role"
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        return ryuendpoints.ENDPOINTS["role"].call(self.session, self.API, payload=payload)
 
 
 
@@ -1652,20 +1433,9 @@ class RyuSwitch(object):
         Boolean. True if successful, False if error.
 
         Usage:
-        R = RyuSwitch()
-        R.add_flow(payload)   # Use if statement to check if successful.
+        R = RyuSwitch(DPID)
+        R.send_experimenter(payload)   # Use if statement to check if successful.
         '''
 
-        # Path: /stats/experimenter/<dpid>
-        rest_uri = self.API + "/stats/flowentry/add/" + str(self.DPID)
-
-        # Make call to REST API (POST)
-        r = requests.post(rest_uri, json=payload) # payload encoded to JSON
-
-        # Ryu returns HTTP 200 status if successful
-        if r.status_code == 200:
-            return True
-        else:
-            return False
-            # If submission fails, Ryu returns HTTP 400 status.
-            # Catch all for HTTP errors.
+        # Path: /stats/experimenter/<DPID>
+        return ryuendpoints.ENDPOINTS["experimenter"].call(self.session, self.API, self.DPID, payload=payload)
@@ -0,0 +1,183 @@
+#####################################################
+##               RYU SDN CONTROLLER                ##
+##      PYTHON LIBRARY FOR NORTHBOUND REST API     ##
+##              FLOW TEMPLATE MODULE               ##
+##                     v1.0.0                      ##
+#####################################################
+
+# Copyright 2017 Nathan Catania
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+
+### ABOUT ###
+#   This module provides FlowTemplate, for sending many flow payloads that differ in only a few values
+#   (e.g. a match field and an output port).
+#   The parts of the payload that never change are encoded to JSON once, when the template is created.
+#   Filling in a template only encodes the values given and joins them with the pre-encoded parts, which is much faster
+#   than building a dictionary for each payload and encoding all of it.
+#   Filled templates are JSON payloads (bytes) that can be passed to any flow entry method in place of a dictionary:
+#   add_flow(), modify_flow_strict(), delete_flow_strict(), add_flows(), ... They are sent as they are, without encoding.
+
+### USAGE INSTRUCTIONS ###
+#   1. Create a template, marking the values that change with Slot("name"):
+#           >> template = FlowTemplate({
+#           ..     "dpid": 123917682136708, "table_id": 0, "priority": 100,
+#           ..     "match": {"eth_type": 0x800, "ipv4_dst": Slot("dst")},
+#           ..     "actions": [{"type": "OUTPUT", "port": Slot("port")}],
+#           .. })
+#
+#   2. Fill it in and send it with the usual methods:
+#           >> switch1.add_flow( template.fill(dst="10.0.0.1", port=2) )
+#           >> payloads = template.fill_many( {"dst": dst, "port": port} for dst, port in routes )
+#           >> status = switch1.add_flows(payloads)
+#
+#   3. The same template can be used for modify_flow_strict() and delete_flow_strict() payloads:
+#           >> switch1.delete_flow_strict( template.fill(dst="10.0.0.1", port=2) )
+#
+#   Slots can be used for any value (including the dpid), but not for dictionary keys.
+
+
+import json
+import re
+
+try:
+    from . import ryucodec
+except (ImportError, ValueError):
+    import ryucodec
+
+
+# int and long in Python 2, int in Python 3
+_INTEGERS = (int, type(2 ** 64))
+
+# A slot in the encoded template
+_MARKER = re.compile(r'"__ryurest_slot_(\d+)__"')
+
+
+
+class Slot(object):
+
+    '''
+    Marks a value of a FlowTemplate that is given when the template is filled in.
+    '''
+
+    def __init__(self, name):
+        self.name = name
+
+
+
+    def __repr__(self):
+        return "Slot(%r)" % self.name
+
+
+
+class Payload(bytes):
+
+    '''
+    A filled in FlowTemplate: a payload already encoded to JSON.
+    RyuSession sends it as it is instead of encoding it.
+    '''
+
+    # DPID of the target switch, used by the response cache to know what the write changes. None if unknown.
+    dpid = None
+
+
+
+class FlowTemplate(object):
+
+    def __init__(self, payload, codec=None):
+        # ryucodec.Codec used to encode slot values that are not integers (the fastest installed backend if None)
+        self.codec = codec
+
+        # Replace each slot with a unique string, encode the payload, and split the JSON at those strings
+        slots = []
+        marker = "__ryurest_slot_%d__"
+
+        def mark(value):
+            if isinstance(value, Slot):
+                slots.append(value.name)
+                return marker % (len(slots) - 1)
+            if isinstance(value, dict):
+                return dict((key, mark(item)) for key, item in value.items())
+            if isinstance(value, (list, tuple)):
+                return [mark(item) for item in value]
+            return value
+
+        text = json.dumps(mark(payload), separators=(",", ":"), sort_keys=True)
+
+        # Pre-encoded parts and slot indexes alternate: parts[0], slot, parts[1], slot, ..., parts[-1]
+        pieces = _MARKER.split(text)
+
+        # Pre-encoded parts, and slot names in the order they appear in the JSON
+        self.parts = [piece.encode("utf-8") for piece in pieces[0::2]]
+        self.slots = tuple(slots[int(index)] for index in pieces[1::2])
+
+        # The parts joined into one format string, filled with a single % operation
+        self._format = b"%s".join(part.replace(b"%", b"%%") for part in self.parts)
+
+        # DPID of the payloads: fixed, or the name of the slot giving it
+        dpid = payload.get("dpid")
+        self._dpid_slot = dpid.name if isinstance(dpid, Slot) else None
+        self._dpid = None if isinstance(dpid, Slot) else dpid
+
+
+
+    ## Fill in the template ##
+    def fill(self, **values):
+
+        '''
+        Description:
+        Return the payload with each slot replaced by the value of the same name.
+
+        Arguments:
+        values: One value per slot name.
+
+        Return value:
+        Payload (JSON bytes), to be passed to add_flow(), modify_flow_strict(), delete_flow_strict(), add_flows(), ...
+        Raises KeyError if a slot has no value.
+
+        Usage:
+        switch1.add_flow( template.fill(dst="10.0.0.1", port=2) )
+        '''
+
+        dumps = (self.codec or ryucodec.default()).dumps
+        encoded = []
+        for name in self.slots:
+            value = values[name]
+            # Integers (the most common slot values: ports, DPIDs, VLANs) are written directly. Not booleans.
+            encoded.append(b"%d" % value if type(value) in _INTEGERS else dumps(value))
+
+        payload = Payload(self._format % tuple(encoded))
+        payload.dpid = values[self._dpid_slot] if self._dpid_slot is not None else self._dpid
+        return payload
+
+
+
+    ## Fill in the template once per set of values ##
+    def fill_many(self, rows):
+
+        '''
+        Description:
+        Fill in the template for each dictionary of slot values.
+
+        Arguments:
+        rows: Iterable of dictionaries of slot name -> value.
+
+        Return value:
+        List of Payload, in the same order.
+
+        Usage:
+        status = switch1.add_flows( template.fill_many({"dst": dst, "port": port} for dst, port in routes) )
+        '''
+
+        return [self.fill(**row) for row in rows]
@@ -0,0 +1,6 @@
+# Tests run against the package in this checkout, not an installed copy.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
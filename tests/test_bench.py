@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+
+
+BENCH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "bench.py")
+
+sys.path.insert(0, os.path.dirname(BENCH))
+import bench
+
+
+def result(p50, throughput, method="get_flows"):
+    return {"benchmark": "getter", "module": "ryuswitch", "method": method, "flows": 100, "switches": 1,
+            "concurrency": 1, "latency_ms": {"p50": p50}, "throughput": throughput}
+
+
+def test_percentile():
+    assert bench.percentile([], 0.5) is None
+    assert bench.percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    assert bench.percentile([1.0, 2.0, 3.0, 4.0], 1.0) == 4.0
+
+
+def test_compare():
+    baseline = {"results": [result(1.0, 100.0), result(1.0, 100.0, method="get_stats")]}
+    assert bench.compare([result(1.1, 95.0)], baseline, 0.2) == []
+
+    regressions = bench.compare([result(2.0, 40.0), result(1.0, 100.0, method="add_flow")], baseline, 0.2)
+    assert [measurement for _, measurement, _, _ in regressions] == ["p50 latency", "throughput"]
+
+
+def test_run(tmpdir):
+    output = str(tmpdir.join("results.json"))
+    command = [sys.executable, BENCH, "--quick", "--groups", "getter", "--only", r"^ryuswitch\.get_flows$",
+               "--sizes", "100", "--iterations", "3", "--max-time", "0.1", "--output", output]
+    subprocess.check_output(command)
+
+    with open(output) as f:
+        results = json.load(f)["results"]
+    assert [(r["module"], r["method"], r["flows"], r["errors"]) for r in results] == [("ryuswitch", "get_flows", 100, 0)]
+
+    # A run much slower than the baseline fails
+    for r in results:
+        r["latency_ms"]["p50"] /= 1000.0
+    baseline = str(tmpdir.join("baseline.json"))
+    with open(baseline, "w") as f:
+        json.dump({"results": results}, f)
+    process = subprocess.Popen(command + ["--compare", baseline], stdout=subprocess.PIPE)
+    stdout = process.communicate()[0]
+    assert process.returncode == 1
+    assert b"REGRESSION" in stdout
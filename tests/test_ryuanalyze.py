@@ -0,0 +1,79 @@
+from ryurest.ryuanalyze import FlowAnalysis
+
+
+def flow(priority, match, actions, **fields):
+    entry = {"table_id": 0, "priority": priority, "match": match, "actions": actions}
+    entry.update(fields)
+    return entry
+
+
+def priorities(findings):
+    return [(found["priority"], by["priority"]) for found, by in findings]
+
+
+def test_shadowed():
+    analysis = FlowAnalysis([
+        flow(10, {"in_port": 1}, ["OUTPUT:2"]),
+        flow(5, {"in_port": 1, "eth_type": 2048}, ["OUTPUT:3"]),
+    ])
+    assert priorities(analysis.shadowed) == [(5, 10)]
+    assert analysis.redundant == []
+
+
+def test_redundant_below_higher_flow():
+    analysis = FlowAnalysis([
+        flow(10, {"in_port": 1}, ["OUTPUT:2"]),
+        flow(5, {"in_port": 1, "eth_type": 2048}, ["OUTPUT:2"]),
+    ])
+    assert priorities(analysis.redundant) == [(5, 10)]
+
+
+def test_redundant_above_fallback():
+    analysis = FlowAnalysis([
+        flow(10, {"in_port": 1}, ["OUTPUT:2"]),
+        flow(1, {}, ["OUTPUT:2"]),
+    ])
+    assert priorities(analysis.redundant) == [(10, 1)]
+
+
+def test_fallback_blocked_by_flow_in_between():
+    analysis = FlowAnalysis([
+        flow(10, {"in_port": 1}, ["OUTPUT:2"]),
+        flow(5, {"eth_type": 2048}, ["DROP"]),
+        flow(1, {}, ["OUTPUT:2"]),
+    ])
+    assert analysis.redundant == []
+    assert priorities(analysis.overlapping) == [(5, 10), (1, 5)]
+
+
+def test_identical_flows_keep_one():
+    # Each covers the other: only one of them may be removed, or the traffic is lost
+    analysis = FlowAnalysis([
+        flow(10, {"in_port": 1}, ["OUTPUT:2"]),
+        flow(5, {"in_port": 1}, ["OUTPUT:2"]),
+    ], DPID=1)
+    assert priorities(analysis.redundant) == [(10, 5)]
+    assert analysis.plan() == [{"dpid": 1, "table_id": 0, "priority": 10, "match": {"in_port": 1}}]
+
+
+def test_chain_keeps_lowest():
+    analysis = FlowAnalysis([
+        flow(10, {"in_port": 1}, ["OUTPUT:2"]),
+        flow(5, {"in_port": 1}, ["OUTPUT:2"]),
+        flow(1, {}, ["OUTPUT:2"]),
+    ])
+    assert sorted(payload["priority"] for payload in analysis.plan()) == [5, 10]
+
+
+def test_tables_are_separate():
+    analysis = FlowAnalysis([
+        flow(10, {"in_port": 1}, ["OUTPUT:2"], table_id=0),
+        flow(5, {"in_port": 1}, ["OUTPUT:3"], table_id=1),
+    ])
+    assert len(analysis) == 0
+
+
+def test_from_flows():
+    analysis = FlowAnalysis.from_flows({"1": [flow(10, {"in_port": 1}, ["OUTPUT:2"]), flow(5, {"in_port": 1}, ["OUTPUT:2"])]})
+    assert analysis.DPID == "1"
+    assert len(analysis.plan()) == 1
@@ -0,0 +1,99 @@
+import asyncio
+import gc
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from ryurest import ryuasync, ryucodec
+from ryurest.ryumock import MockController
+
+
+@pytest.fixture
+def api():
+    with MockController(2, flows=5) as API:
+        yield API
+
+
+def test_switch_methods(api):
+    async def main():
+        switch = ryuasync.AsyncRyuSwitch(1)
+        switch.API = api
+        try:
+            return await switch.get_switches(), await switch.get_flows(), await switch.delete_flow_all()
+        finally:
+            await switch.session.close()
+
+    switches, flows, cleared = asyncio.run(main())
+    assert switches == [1, 2]
+    assert len(flows["1"]) == 5
+    assert cleared is True
+
+
+def test_module_functions_across_event_loops(api, monkeypatch):
+    monkeypatch.setattr(ryuasync, "API", api)
+    session = ryuasync.AsyncRyuSession()
+    monkeypatch.setattr(ryuasync, "SESSION", session)
+    # Fewer slots than calls, so calls wait on the semaphore
+    session.set_concurrency(api, 2)
+
+    async def sweep():
+        return await asyncio.gather(*[ryuasync.get_port_stats(DPID) for DPID in (1, 2) * 5])
+
+    # The first loop's session is left open: the second loop must not use it
+    first = asyncio.run(sweep())
+    second = asyncio.run(sweep())
+    assert len(first) == len(second) == 10
+    assert all(stats is not False for stats in second)
+
+    asyncio.run(session.close())
+
+
+def test_sessions_closed_with_their_event_loop(api, recwarn):
+    session = ryuasync.AsyncRyuSession()
+
+    async def call():
+        status, _ = await session.request("GET", api + "/stats/switches")
+        return status
+
+    for _ in range(3):
+        assert asyncio.run(call()) == 200
+        assert session._sessions == session._semaphores == session._closers == {}
+
+    # A loop closed without asyncio.run() is dropped by the next call
+    loop = asyncio.new_event_loop()
+    assert loop.run_until_complete(call()) == 200
+    loop.close()
+    assert asyncio.run(call()) == 200
+    assert session._sessions == {}
+
+    # close() closes every loop's session
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(call())
+    stale = session._sessions[loop]
+    asyncio.run(session.close())
+    assert stale.closed and session._sessions == {}
+    loop.close()
+
+    gc.collect()
+    assert not [w for w in recwarn if "Unclosed" in str(w.message)]
+
+
+def test_payloads_and_bodies_go_through_the_codec(api):
+    calls = []
+    json = ryucodec.get("json")
+    codec = ryucodec.Codec("counting",
+                           lambda content: calls.append("loads") or json.loads(content),
+                           lambda payload: calls.append("dumps") or json.dumps(payload))
+    session = ryuasync.AsyncRyuSession(codec=codec)
+
+    async def main():
+        switch = ryuasync.AsyncRyuSwitch(1, session=session)
+        switch.API = api
+        added = await switch.add_flow({"dpid": 1, "priority": 7})
+        return added, await switch.get_flows()
+
+    added, flows = asyncio.run(main())
+    assert added is True
+    assert any(flow["priority"] == 7 for flow in flows["1"])
+    assert calls == ["dumps", "loads"]
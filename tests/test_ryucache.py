@@ -0,0 +1,112 @@
+import pytest
+
+from ryurest.ryucache import RyuCache, parse_uri
+from ryurest.ryumock import MockController
+from ryurest.ryusession import RyuSession
+from ryurest.ryuswitch import RyuSwitch
+
+
+URI = "http://127.0.0.1:8080/stats/"
+
+
+@pytest.fixture
+def api():
+    with MockController(2, flows=2) as API:
+        yield API
+
+
+def test_parse_uri():
+    assert parse_uri(URI + "flow/1") == ("flow", "1")
+    assert parse_uri(URI + "flowentry/delete_strict") == ("flowentry", None)
+    assert parse_uri(URI + "flowentry/clear/1") == ("flowentry", "1")
+    assert parse_uri(URI + "switches") == ("switches", None)
+
+
+def test_ttl_and_eviction():
+    cache = RyuCache(max_entries=2, ttl={"flow": 0})
+    cache.put(URI + "flow/1", "flows")
+    assert cache.get(URI + "flow/1") is None
+
+    cache.put(URI + "desc/1", "desc 1")
+    cache.put(URI + "desc/2", "desc 2")
+    cache.get(URI + "desc/1")
+    cache.put(URI + "desc/3", "desc 3")
+    assert len(cache) == 2
+    assert cache.get(URI + "desc/2") is None
+    assert cache.get(URI + "desc/1") == "desc 1"
+
+
+def test_invalidate():
+    cache = RyuCache()
+    for DPID in (1, 2):
+        cache.put(URI + "flow/%d" % DPID, "flows")
+        cache.put(URI + "desc/%d" % DPID, "desc")
+
+    cache.written(URI + "flowentry/add", {"dpid": 1})
+    assert cache.get(URI + "flow/1") is None
+    assert cache.get(URI + "desc/1") == "desc"
+    assert cache.get(URI + "flow/2") == "flows"
+
+    cache.invalidate(2)
+    assert cache.get(URI + "desc/2") is None
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_put_after_invalidation_is_dropped():
+    cache = RyuCache()
+    generation = cache.generation()
+    cache.invalidate(1, endpoints=["flow"])
+
+    # Started before the invalidation of its switch
+    cache.put(URI + "flow/1", "stale", generation)
+    assert cache.get(URI + "flow/1") is None
+
+    # Other switches, and GETs started afterwards, are cached
+    cache.put(URI + "flow/2", "flows", generation)
+    cache.put(URI + "flow/1", "flows", cache.generation())
+    assert cache.get(URI + "flow/2") == "flows"
+    assert cache.get(URI + "flow/1") == "flows"
+
+    # Invalidating every switch forgets the invalidations of single switches
+    for DPID in range(100):
+        cache.invalidate(DPID)
+    generation = cache.generation()
+    cache.invalidate(5)
+    cache.invalidate()
+    assert len(cache._invalidated) == 1
+    cache.put(URI + "flow/2", "stale", generation)
+    assert cache.get(URI + "flow/2") is None
+    cache.put(URI + "flow/5", "flows", cache.generation())
+    assert cache.get(URI + "flow/5") == "flows"
+
+
+def test_session_cache(api):
+    session = RyuSession(cache=RyuCache())
+    switch = RyuSwitch(1, session=session)
+    switch.API = api
+
+    assert len(switch.get_flows()["1"]) == 2
+    assert len(session.cache) == 1
+    switch.add_flow({"dpid": 1, "priority": 9, "match": {"in_port": 5}, "actions": []})
+    assert len(session.cache) == 0
+    assert len(switch.get_flows()["1"]) == 3
+
+
+def test_session_write_during_read(api):
+    session = RyuSession(cache=RyuCache())
+    switch = RyuSwitch(1, session=session)
+    switch.API = api
+    send = session._send
+
+    # A flow is added (and the cache invalidated) while get_flows() is in flight
+    def racing_send(method, rest_uri, kwargs):
+        r = send(method, rest_uri, kwargs)
+        if method == "GET":
+            switch.add_flow({"dpid": 1, "priority": 9, "match": {"in_port": 5}, "actions": []})
+        return r
+
+    session._send = racing_send
+    assert len(switch.get_flows()["1"]) == 2
+    session._send = send
+    assert len(switch.get_flows()["1"]) == 3
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from ryurest import ryucodec
+from ryurest.ryumock import MockController, MockSwitch
+from ryurest.ryusession import RyuSession
+from ryurest.ryuswitch import RyuSwitch
+
+
+class CountingCodec(ryucodec.Codec):
+
+    '''
+    Standard library codec counting its calls.
+    '''
+
+    def __init__(self):
+        ryucodec.Codec.__init__(self, "counting", ryucodec._json_loads, ryucodec._json_dumps)
+        self.calls = []
+
+    def loads(self, content):
+        self.calls.append("loads")
+        return ryucodec.Codec.loads(self, content)
+
+    def dumps(self, payload):
+        self.calls.append("dumps")
+        return ryucodec.Codec.dumps(self, payload)
+
+
+@pytest.fixture
+def switch():
+    with MockController([MockSwitch(1, flows=2)]) as API:
+        switch = RyuSwitch(1, session=RyuSession())
+        switch.API = API
+        yield switch
+
+
+def installed(name):
+    try:
+        ryucodec.get(name)
+    except ImportError:
+        return False
+    return True
+
+
+def test_backends():
+    names = [name for name in ryucodec.BACKENDS if installed(name)]
+    assert ryucodec.default().name == names[0]
+    for name in names:
+        codec = ryucodec.get(name)
+        payload = {"dpid": 2 ** 64 - 1, "match": {"in_port": 1}, "actions": []}
+        assert codec.loads(codec.dumps(payload)) == payload
+        assert codec.loads(b'{"1": [{"cookie": 18446744073709551615}]}') == {"1": [{"cookie": 2 ** 64 - 1}]}
+    with pytest.raises(ValueError):
+        ryucodec.get("yaml")
+
+
+def test_fallback_to_standard_library():
+    codec = ryucodec.Codec("strict", json.loads, lambda payload: json.dumps(payload, allow_nan=False).encode("utf-8"))
+    assert codec.dumps({"rate": float("nan")}) == b'{"rate": NaN}'
+
+
+def test_session_codec(switch):
+    codec = switch.session.codec = CountingCodec()
+    assert len(switch.get_flows()["1"]) == 2
+    assert switch.add_flow({"dpid": 1, "priority": 5, "match": {"in_port": 3}, "actions": []}) is True
+    assert codec.calls == ["loads", "dumps"]
+    assert len(switch.get_flows()["1"]) == 3
+
+
+def test_raw_session(switch):
+    raw = switch.session.as_raw()
+    assert raw.raw and not switch.session.raw
+
+    body = RyuSwitch(1, session=raw)
+    body.API = switch.API
+    body = body.get_flows()
+    assert isinstance(body, bytes)
+    assert json.loads(body.decode("utf-8")) == switch.get_flows()
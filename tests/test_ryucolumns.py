@@ -0,0 +1,25 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ryurest.ryucolumns import to_columns
+
+
+def port(port_no, rx_bytes, duration=10, **counters):
+    return dict({"port_no": port_no, "rx_bytes": rx_bytes, "tx_bytes": 0, "rx_packets": 0, "tx_packets": 0,
+                 "duration_sec": duration, "duration_nsec": 0}, **counters)
+
+
+def test_to_columns():
+    columns = to_columns({"1": [port(1, 100), port("LOCAL", 200)], "2": [port(1, 2 ** 64 - 1, extra=1.5)]})
+    assert columns["dpid"].tolist() == [1, 1, 2]
+    assert columns["rx_bytes"].dtype == np.uint64
+    assert columns["rx_bytes"].tolist() == [100, 200, 2 ** 64 - 1]
+    assert columns["port_no"].dtype == object
+    assert np.isnan(columns["extra"][:2]).all() and columns["extra"][2] == 1.5
+
+
+def test_fleet_results_and_fields():
+    columns = to_columns({1: {"1": [port(1, 100)]}, 2: {"2": [port(1, 5)]}}, fields=["rx_bytes"])
+    assert sorted(columns) == ["dpid", "rx_bytes"]
+    assert columns["rx_bytes"].tolist() == [100, 5]
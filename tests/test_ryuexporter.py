@@ -0,0 +1,30 @@
+import pytest
+
+from ryurest.ryuexporter import RyuExporter, render
+from ryurest.ryufleet import RyuFleet
+from ryurest.ryumock import MockController
+from ryurest.ryusession import RyuSession
+
+
+@pytest.fixture
+def api():
+    with MockController(2, flows=3) as API:
+        yield API
+
+
+def test_render():
+    results = {"get_port_stats": {1: {"1": [{"port_no": 2, "rx_bytes": 10, "tx_bytes": 2 ** 64 - 1}]}}}
+    text = render(results, getters=("get_port_stats",))
+    assert 'ryu_port_receive_bytes_total{dpid="1",port="2"} 10' in text
+    # Unsupported counters are left out
+    assert 'ryu_port_transmit_bytes_total{dpid="1"' not in text
+    assert "# TYPE ryu_port_receive_bytes_total counter" in text
+
+
+def test_exporter(api):
+    exporter = RyuExporter(port=None, fleet=RyuFleet(API=api, session=RyuSession()))
+    text = exporter.poll()
+    assert 'ryu_flows_count{dpid="2"} 3' in text
+    assert 'ryu_switch_up{dpid="1"} 1' in text
+    assert "ryu_exporter_polls_total 1" in text
+    assert exporter.metrics() == text
@@ -0,0 +1,42 @@
+import pytest
+
+from ryurest import ryusession
+from ryurest.ryufleet import RyuFleet
+from ryurest.ryumock import MockController
+
+
+@pytest.fixture
+def fleet():
+    with MockController(3, flows=4) as API:
+        fleet = RyuFleet(API=API, workers=4, session=ryusession.RyuSession())
+        yield fleet
+        fleet.close()
+
+
+def test_discovers_switches(fleet):
+    assert sorted(fleet.switches) == [1, 2, 3]
+
+
+def test_getter_on_every_switch(fleet):
+    results, errors = fleet.get_flows()
+    assert errors == {}
+    assert sorted(results) == [1, 2, 3]
+    assert all(len(flows[str(DPID)]) == 4 for DPID, flows in results.items())
+
+
+def test_run_on_some_switches(fleet):
+    results, errors = fleet.run("delete_flow_all", DPIDs=[2])
+    assert results == {2: True} and errors == {}
+    assert fleet.switches[2].get_flows() == {"2": []}
+
+
+def test_unknown_dpid_is_not_added(fleet):
+    results, errors = fleet.get_port_stats(DPIDs=[1, 99])
+    assert list(results) == [1]
+    # The mock answers 404 for a switch it does not have
+    assert errors == {99: False}
+    assert sorted(fleet.switches) == [1, 2, 3]
+
+
+def test_refresh(fleet):
+    assert sorted(fleet.refresh()) == [1, 2, 3]
@@ -0,0 +1,43 @@
+import pytest
+
+from ryurest.ryuflows import FlowTable
+
+
+FLOWS = [
+    {"table_id": 0, "priority": 10, "cookie": 1, "byte_count": 100, "packet_count": 2,
+     "match": {"in_port": 1, "eth_dst": "00:00:00:00:00:01"}, "actions": ["OUTPUT:2"]},
+    {"table_id": 0, "priority": 10, "cookie": 1, "byte_count": 300, "packet_count": 4,
+     "match": {"in_port": 2, "eth_dst": "00:00:00:00:00:02"}, "actions": ["OUTPUT:2"]},
+    {"table_id": 0, "priority": 0, "match": {}, "actions": ["OUTPUT:CONTROLLER"], "flags": {"nested": [1]}},
+]
+
+
+def test_round_trip():
+    table = FlowTable(FLOWS)
+    assert len(table) == 3
+    assert table.to_list() == FLOWS
+    assert [entry.to_dict() for entry in table] == FLOWS
+
+
+def test_entries():
+    table = FlowTable.from_flows({"1": FLOWS})
+    assert table.DPID == "1"
+
+    entry = table[1]
+    assert entry.priority == 10 and entry["byte_count"] == 300
+    assert entry.match["eth_dst"] == "00:00:00:00:00:02"
+    assert entry.get("idle_timeout", 5) == 5
+    assert table[2]["flags"] == {"nested": [1]}
+
+    # Identical actions lists are stored once
+    assert table[0].actions is table[1].actions
+
+
+def test_columns():
+    table = FlowTable(FLOWS)
+    assert sum(table.column("byte_count")) == 400
+    numpy = pytest.importorskip("numpy")
+    arrays = table.as_arrays()
+    assert arrays["packet_count"].dtype == numpy.uint64
+    assert arrays["packet_count"].tolist() == [2, 4, 0]
+
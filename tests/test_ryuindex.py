@@ -0,0 +1,64 @@
+import copy
+
+from ryurest.ryuindex import FlowIndex
+from ryurest.ryumock import MockController, MockSwitch
+from ryurest.ryusession import RyuSession
+from ryurest.ryuswitch import RyuSwitch
+
+
+FLOWS = [
+    {"table_id": 0, "priority": 10, "cookie": 1, "match": {"in_port": 1, "eth_type": 2048}, "actions": ["OUTPUT:2"]},
+    {"table_id": 0, "priority": 20, "cookie": 1, "match": {"in_port": 2}, "actions": ["OUTPUT:1", "OUTPUT:3"]},
+    {"table_id": 1, "priority": 5, "cookie": 2, "match": {"in_port": 1}, "actions": ["OUTPUT:CONTROLLER"]},
+    {"table_id": 0, "priority": 0, "cookie": 0, "match": {}, "actions": []},
+]
+
+
+def test_find():
+    index = FlowIndex(FLOWS)
+    assert index.find(in_port=1) == [FLOWS[0], FLOWS[2]]
+    assert index.find(in_port=1, table_id=1) == [FLOWS[2]]
+    assert index.find(in_port=[1, 2], table_id=0) == [FLOWS[1], FLOWS[0]]
+    assert index.find(output=3) == [FLOWS[1]]
+    assert index.find(eth_type="0x800", cookie=1) == [FLOWS[0]]
+    assert index.find(in_port=9) == []
+    assert index.count(cookie=1) == 2
+    assert len(index.find()) == 4
+
+
+def test_ofctl_v1_0_names():
+    index = FlowIndex([{"priority": 1, "match": {"dl_type": 2048, "nw_dst": "10.0.0.1"}, "actions": ["OUTPUT:1"]}])
+    assert len(index.find(eth_type=0x800, ipv4_dst="10.0.0.1")) == 1
+
+
+def test_values():
+    index = FlowIndex(FLOWS)
+    assert index.values("output")[1] == 1
+    assert index.values("in_port") == {1: 2, 2: 1}
+
+
+def test_refresh():
+    index = FlowIndex(FLOWS)
+    flows = copy.deepcopy(FLOWS)
+    flows[0]["byte_count"] = 100
+    flows[1]["actions"] = ["OUTPUT:4"]
+    del flows[2]
+    flows.append({"table_id": 0, "priority": 30, "match": {"in_port": 3}, "actions": ["OUTPUT:3"]})
+
+    assert index.refresh({"1": flows}) == (1, 1, 1)
+    assert index.find(output=3) == [flows[-1]]
+    assert index.find(output=4) == [flows[1]]
+    assert index.find(in_port=1) == [flows[0]]
+    assert index.find(in_port=1)[0]["byte_count"] == 100
+
+
+def test_get_flow_index():
+    with MockController([MockSwitch(1, flows=0)]) as API:
+        switch = RyuSwitch(1, session=RyuSession())
+        switch.API = API
+        for port in range(1, 6):
+            switch.add_flow({"dpid": 1, "priority": 1, "match": {"in_port": port},
+                             "actions": [{"type": "OUTPUT", "port": port + 1}]})
+        index = switch.get_flow_index()
+    assert len(index.find()) == 5
+    assert index.find(output=3)[0]["match"] == {"in_port": 2}
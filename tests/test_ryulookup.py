@@ -0,0 +1,43 @@
+from ryurest.ryulookup import FlowLookup
+
+
+FLOWS = [
+    {"table_id": 0, "priority": 10, "match": {"eth_type": 2048, "ipv4_dst": "10.0.0.0/8"}, "actions": ["OUTPUT:1"]},
+    {"table_id": 0, "priority": 20, "match": {"eth_type": 2048, "ipv4_dst": "10.1.0.0/255.255.0.0"}, "actions": ["OUTPUT:2"]},
+    {"table_id": 0, "priority": 5, "match": {"eth_type": 2048, "ipv4_dst": "10.1.2.3"}, "actions": ["OUTPUT:3"]},
+    {"table_id": 0, "priority": 30, "match": {"in_port": 4}, "actions": ["GOTO_TABLE:1"]},
+    {"table_id": 0, "priority": 0, "match": {}, "actions": ["OUTPUT:CONTROLLER"]},
+    {"table_id": 1, "priority": 1, "match": {"eth_type": 2048, "ip_proto": 6}, "actions": ["OUTPUT:5"]},
+]
+
+
+def test_longest_prefix_is_not_highest_priority():
+    lookup = FlowLookup(FLOWS)
+    packet = {"in_port": 1, "eth_type": 0x800, "ipv4_dst": "10.1.2.3"}
+
+    # Every prefix matches: the highest priority flow wins, not the longest prefix
+    assert lookup.lookup(packet)["actions"] == ["OUTPUT:2"]
+    assert [flow["priority"] for flow in lookup.matches(packet)] == [20, 10, 5, 0]
+
+    assert lookup.lookup(dict(packet, ipv4_dst="10.2.0.1"))["actions"] == ["OUTPUT:1"]
+    assert lookup.lookup(dict(packet, ipv4_dst="192.168.0.1"))["actions"] == ["OUTPUT:CONTROLLER"]
+
+
+def test_missing_field_does_not_match():
+    lookup = FlowLookup(FLOWS)
+    assert lookup.lookup({"ipv4_dst": "10.1.2.3"})["priority"] == 0
+    assert lookup.lookup({}, table_id=1) is None
+
+
+def test_trace_follows_goto_table():
+    lookup = FlowLookup(FLOWS)
+    path = lookup.trace({"in_port": 4, "eth_type": 0x800, "ip_proto": 6})
+    assert [(table_id, flow["actions"]) for table_id, flow in path] == [(0, ["GOTO_TABLE:1"]), (1, ["OUTPUT:5"])]
+
+    path = lookup.trace({"in_port": 4, "eth_type": 0x800, "ip_proto": 17})
+    assert path[-1] == (1, None)
+
+
+def test_from_flows():
+    lookup = FlowLookup.from_flows({"1": FLOWS})
+    assert lookup.lookup({"in_port": 4})["actions"] == ["GOTO_TABLE:1"]
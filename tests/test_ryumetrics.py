@@ -0,0 +1,68 @@
+import pytest
+
+from ryurest.ryucache import RyuCache
+from ryurest.ryumetrics import Hooks, RyuMetrics, endpoint
+from ryurest.ryumock import MockController
+from ryurest.ryusession import RyuSession
+from ryurest.ryuswitch import RyuSwitch
+
+
+@pytest.fixture
+def api():
+    with MockController(2, flows=3) as API:
+        yield API
+
+
+def test_endpoint():
+    assert endpoint("http://localhost:8080/stats/flow/1") == "flow"
+    assert endpoint("http://localhost:8080/stats/flowentry/add") == "flowentry/add"
+    assert endpoint("http://localhost:8080/stats/switches") == "switches"
+
+
+def test_metrics(api):
+    session = RyuSession()
+    metrics = session.instrument(RyuMetrics())
+    calls = []
+    session.instrument(Hooks(before=lambda *args: "token", after=lambda token, *args: calls.append(token)))
+
+    switch = RyuSwitch(1, session=session)
+    switch.API = api
+    switch.get_flows()
+    switch.get_flows()
+    switch.DPID = 99
+    switch.get_flows()
+
+    stats = metrics.snapshot()[("GET", "flow")]
+    assert stats["count"] == 3
+    assert stats["status"] == {200: 2, 404: 1}
+    assert stats["decode_count"] == 2
+    assert stats["latency_histogram"][-1] == ("+Inf", 3)
+    assert stats["response_bytes"] > 0
+    assert calls == ["token"] * 3
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+
+def test_cache_hits_are_not_recorded(api):
+    session = RyuSession(cache=RyuCache())
+    metrics = session.instrument(RyuMetrics())
+
+    switch = RyuSwitch(1, session=session)
+    switch.API = api
+    switch.get_group_features()
+    switch.get_group_features()
+    assert metrics.snapshot()[("GET", "groupfeatures")]["count"] == 1
+
+
+def test_streamed_bodies(api):
+    session = RyuSession()
+    metrics = session.instrument(RyuMetrics())
+
+    switch = RyuSwitch(1, session=session)
+    switch.API = api
+    assert len(list(switch.iter_flows(chunk_size=64))) == 3
+    stats = metrics.snapshot()[("GET", "flow")]
+    assert stats["count"] == stats["decode_count"] == 1
+    assert stats["response_bytes"] > 0
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from ryurest import ryufunc
+from ryurest.ryumock import MockController, MockSwitch
+from ryurest.ryusession import RyuSession
+from ryurest.ryuswitch import RyuSwitch
+
+
+@pytest.fixture
+def controller():
+    controller = MockController(2, flows=20)
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+@pytest.fixture
+def switch(controller):
+    switch = RyuSwitch(1, session=RyuSession())
+    switch.API = controller.API
+    return switch
+
+
+def test_flows_are_served_consistently(controller, switch, monkeypatch):
+    flows = switch.get_flows()["1"]
+    assert len(flows) == 20
+
+    assert list(switch.iter_flows(chunk_size=100)) == flows
+    assert switch.get_flow_table().to_list() == flows
+
+    monkeypatch.setattr(ryufunc, "API", controller.API)
+    assert ryufunc.get_flow_table(1).to_list() == flows
+
+
+def test_writes_change_state(controller, switch):
+    assert switch.add_flow({"dpid": 1, "priority": 9, "match": {"in_port": 5}, "actions": []}) is True
+    assert len(switch.get_flows()["1"]) == 21
+    assert len(controller.switches[1].flows) == 21
+
+    assert switch.delete_flow_all() is True
+    assert switch.get_flows() == {"1": []}
+    assert len(switch.session.get(controller.API + "/stats/flow/2").json()["2"]) == 20
+
+
+def test_switches(controller, switch):
+    assert sorted(switch.get_switches()) == [1, 2]
+    controller.add_switch(MockSwitch(5, flows=0))
+    controller.remove_switch(2)
+    assert sorted(switch.get_switches()) == [1, 5]
+
+    # Unknown switches are answered with 404, as by Ryu
+    switch.DPID = 2
+    assert switch.get_flows() is False
+    assert switch.add_flow({"dpid": 2, "priority": 1, "match": {}, "actions": []}) is False
+
+
+def test_latency(switch, controller):
+    controller.latency = 0.2
+    start = time.time()
+    switch.get_port_stats()
+    assert time.time() - start >= 0.2
@@ -0,0 +1,88 @@
+import socket
+import threading
+
+import pytest
+import requests
+
+from ryurest import ryupipeline
+from ryurest.ryumock import MockController, MockSwitch
+from ryurest.ryupipeline import PipelinedWriter
+from ryurest.ryusession import RyuSession
+from ryurest.ryuswitch import RyuSwitch
+
+
+@pytest.fixture
+def controller():
+    controller = MockController([MockSwitch(1, flows=0)])
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+@pytest.fixture
+def writer():
+    writer = PipelinedWriter(connections=2, depth=8)
+    yield writer
+    writer.close()
+
+
+def test_handles_only_writes(writer):
+    assert writer.handles("POST", "http://localhost:8080/stats/flowentry/add")
+    assert writer.handles("POST", "http://localhost:8080/stats/groupentry/delete")
+    assert not writer.handles("GET", "http://localhost:8080/stats/flow/1")
+    assert not writer.handles("POST", "http://localhost:8080/stats/flow/1")
+
+
+def test_pipelined_writes(controller, writer):
+    session = RyuSession()
+    session.pipeline = writer
+    switch = RyuSwitch(1, session=session)
+    switch.API = controller.API
+
+    payloads = [{"dpid": 1, "priority": 10, "match": {"in_port": port}, "actions": [{"type": "OUTPUT", "port": 1}]}
+                for port in range(2, 202)]
+    status = switch.add_flows(payloads, window=32)
+
+    assert status == [True] * 200
+    assert len(controller.switches[1].flows) == 200
+
+    # Failed writes are answered in order too
+    assert switch.add_flow({"dpid": 99, "priority": 1, "match": {}, "actions": []}) is False
+    assert switch.delete_flow_strict(payloads[0]) is True
+    assert len(controller.switches[1].flows) == 199
+
+
+def test_connection_failure(controller, writer):
+    response = writer.request("POST", controller.API + "/stats/flowentry/add",
+                              json={"dpid": 1, "priority": 1, "match": {}, "actions": []})
+    assert response.status_code == 200
+
+    API = controller.API
+    controller.stop()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        writer.request("POST", API + "/stats/flowentry/add", json={"dpid": 1, "match": {}, "actions": []}, timeout=1)
+
+
+def test_slow_connect_does_not_block_other_controllers(controller, writer, monkeypatch):
+    # Connecting to port 9 hangs until released
+    release = threading.Event()
+    create_connection = socket.create_connection
+
+    def connect(address, *args):
+        if address[1] == 9:
+            release.wait(10)
+            raise socket.error("refused")
+        return create_connection(address, *args)
+
+    monkeypatch.setattr(ryupipeline.socket, "create_connection", connect)
+    slow = threading.Thread(target=lambda: pytest.raises(requests.exceptions.ConnectionError, writer.request,
+                                                         "POST", "http://127.0.0.1:9/stats/flowentry/add", json={}))
+    slow.start()
+    try:
+        response = writer.request("POST", controller.API + "/stats/flowentry/add",
+                                  json={"dpid": 1, "priority": 1, "match": {}, "actions": []}, timeout=5)
+        assert response.status_code == 200
+        assert slow.is_alive()
+    finally:
+        release.set()
+        slow.join()
@@ -0,0 +1,95 @@
+import pytest
+import requests
+
+from ryurest.ryupolicy import CallPolicy, CircuitOpenError
+
+API = "http://192.0.2.1:8080"
+
+
+class Response(object):
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+
+class Controller(object):
+
+    '''
+    Stands in for requests.Session().request: gives each outcome in turn, and records the calls.
+    '''
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def __call__(self, method, rest_uri, **kwargs):
+        self.calls.append((method, rest_uri, kwargs))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return Response(outcome)
+
+
+def policy(**options):
+    options.setdefault("backoff", 0)
+    return CallPolicy(**options)
+
+
+def test_no_read_timeout_by_default():
+    send = Controller(200)
+    policy().call(send, "GET", API + "/stats/flow/1", {})
+    assert send.calls[0][2]["timeout"] == (3.05, None)
+
+
+def test_retries_server_errors():
+    send = Controller(503, 503, 200)
+    assert policy(retries=2).call(send, "GET", API + "/stats/flow/1", {}).status_code == 200
+    assert len(send.calls) == 3
+
+
+def test_gives_up_after_retries():
+    send = Controller(requests.exceptions.Timeout(), requests.exceptions.Timeout())
+    with pytest.raises(requests.exceptions.Timeout):
+        policy(retries=1).call(send, "GET", API + "/stats/flow/1", {})
+
+
+def test_unsafe_write_not_retried():
+    send = Controller(requests.exceptions.ReadTimeout(), 200)
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        policy(retries=3).call(send, "POST", API + "/stats/groupentry/add", {"json": {}})
+    assert len(send.calls) == 1
+
+
+def test_breaker_opens_and_fails_fast():
+    call_policy = policy(retries=0, failure_threshold=2)
+    send = Controller(requests.exceptions.ConnectionError(), requests.exceptions.ConnectionError())
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            call_policy.call(send, "GET", API + "/stats/desc/1", {})
+    assert call_policy.state(API) == "open"
+
+    with pytest.raises(CircuitOpenError):
+        call_policy.call(send, "GET", API + "/stats/desc/1", {})
+    assert len(send.calls) == 2
+
+    call_policy.reset(API)
+    assert call_policy.state(API) == "closed"
+
+
+def test_breaker_opening_during_retries_raises_real_error():
+    error = requests.exceptions.ConnectTimeout("no route")
+    send = Controller(error, error, error, error)
+    with pytest.raises(requests.exceptions.ConnectTimeout) as raised:
+        policy(retries=3, failure_threshold=2).call(send, "GET", API + "/stats/flow/1", {})
+    assert not isinstance(raised.value, CircuitOpenError)
+    assert len(send.calls) == 2
+
+
+def test_breaker_opening_during_retries_returns_last_response():
+    send = Controller(500, 500, 200)
+    r = policy(retries=3, failure_threshold=2).call(send, "GET", API + "/stats/flow/1", {})
+    assert r.status_code == 500
+    assert len(send.calls) == 2
@@ -0,0 +1,31 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ryurest.ryurates import PortRateTracker
+
+
+def port(port_no, rx_bytes, duration=10, **counters):
+    return dict({"port_no": port_no, "rx_bytes": rx_bytes, "tx_bytes": 0, "rx_packets": 0, "tx_packets": 0,
+                 "duration_sec": duration, "duration_nsec": 0}, **counters)
+
+
+def test_rates():
+    tracker = PortRateTracker()
+    assert len(tracker.update({"1": [port(1, 1000), port(2, 0)]})["port_no"]) == 0
+
+    rates = tracker.update({"1": [port(1, 3000, duration=12), port(2, 500, duration=12), port(3, 0)]})
+    assert rates["port_no"].tolist() == [1, 2]
+    assert rates["rx_bps"].tolist() == [1000 * 8.0, 250 * 8.0]
+    assert not rates["reset"].any()
+
+
+def test_rates_across_reset_and_wrap():
+    tracker = PortRateTracker()
+    tracker.update({"1": [port(1, 5000), port(2, 2 ** 64 - 100)]}, timestamp=100.0)
+
+    # Port 1 was reset 2 seconds ago; the counter of port 2 wrapped around 2^64
+    rates = tracker.update({"1": [port(1, 400, duration=2), port(2, 100, duration=15)]}, timestamp=105.0)
+    assert rates["reset"].tolist() == [True, False]
+    assert rates["interval"].tolist() == [2.0, 5.0]
+    assert rates["rx_bps"].tolist() == [200 * 8.0, 40 * 8.0]
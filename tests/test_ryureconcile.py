@@ -0,0 +1,57 @@
+import pytest
+
+from ryurest.ryumock import MockController, MockSwitch
+from ryurest.ryureconcile import FlowReconciler, default_priority
+from ryurest.ryuswitch import RyuSwitch
+
+
+@pytest.fixture
+def switch():
+    with MockController([MockSwitch(1, flows=0)]) as API:
+        switch = RyuSwitch(1)
+        switch.API = API
+        yield switch
+
+
+DESIRED = [
+    {"table_id": 0, "priority": 10, "match": {"in_port": 1}, "actions": [{"type": "OUTPUT", "port": 2}]},
+    {"table_id": 0, "priority": 10, "match": {"in_port": 2, "eth_type": 2048, "ipv4_dst": "10.0.0.0/24"}, "actions": [{"type": "OUTPUT", "port": 1}]},
+]
+
+
+def test_converges_then_writes_nothing(switch):
+    diff = FlowReconciler(switch).reconcile(DESIRED)
+    assert len(diff.add) == 2 and not diff.failed()
+    assert len(FlowReconciler(switch).diff(DESIRED)) == 0
+
+
+def test_modify_replace_delete(switch):
+    reconciler = FlowReconciler(switch)
+    reconciler.reconcile(DESIRED)
+
+    desired = [
+        dict(DESIRED[0], actions=[{"type": "OUTPUT", "port": 3}]),
+        dict(DESIRED[1], idle_timeout=30),
+    ]
+    diff = reconciler.diff(desired + [{"priority": 5, "match": {"in_port": 3}, "actions": []}])
+    assert (len(diff.add), len(diff.modify), len(diff.replace), len(diff.delete)) == (1, 1, 1, 0)
+
+    diff = reconciler.reconcile(desired[:1])
+    assert len(diff.delete) == 1 and not diff.failed()
+    assert len(reconciler.diff(desired[:1])) == 0
+
+
+def test_priority_required_without_openflow(switch):
+    with pytest.raises(ValueError):
+        FlowReconciler(switch).diff([{"match": {"in_port": 1}, "actions": []}])
+
+
+def test_priority_default_follows_openflow(switch):
+    assert default_priority(1.0) == 32768
+    assert default_priority(1.3) == 0
+
+    desired = [{"match": {"in_port": 1}, "actions": [{"type": "OUTPUT", "port": 2}]}]
+    reconciler = FlowReconciler(switch, openflow=1.3)
+    assert len(reconciler.reconcile(desired).add) == 1
+    # The flow installed without a priority is found again: nothing is deleted and re-added
+    assert len(reconciler.diff(desired)) == 0
@@ -0,0 +1,91 @@
+import pytest
+
+from ryurest import ryusession
+from ryurest.ryumock import MockController, MockSwitch
+from ryurest.ryuregistry import RyuRegistry
+from ryurest.ryutemplate import FlowTemplate, Slot
+
+
+@pytest.fixture
+def controllers():
+    # Switch 2 is reported by both controllers: the first listed owns it
+    first = MockController([MockSwitch(1, flows=0), MockSwitch(2, flows=0)])
+    second = MockController([MockSwitch(2, flows=0), MockSwitch(3, flows=0), MockSwitch(4, flows=0)])
+    with first as A, second as B:
+        registry = RyuRegistry([A, B], workers=4, session=ryusession.RyuSession())
+        yield registry, first, second, A, B
+        registry.close()
+
+
+def test_map_and_interleaving(controllers):
+    registry, first, second, A, B = controllers
+    assert registry.controllers == {1: A, 2: A, 3: B, 4: B}
+    assert list(registry.switches) == [1, 3, 2, 4]
+    assert registry.controller("3") == B
+    assert registry.API == A
+
+
+def test_writes_go_to_the_owning_controller(controllers):
+    registry, first, second, A, B = controllers
+    assert registry.add_flow({"dpid": 3, "priority": 5, "match": {"in_port": 1}, "actions": []})
+    assert len(second.switches[3].flows) == 1
+
+    template = FlowTemplate({"dpid": Slot("dpid"), "priority": 5, "match": {"in_port": Slot("port")}, "actions": []})
+    status = registry.add_flows([template.fill(dpid=DPID, port=7) for DPID in (1, 4, 2)])
+    assert status == [True, True, True]
+    assert [len(switch.flows) for switch in (first.switches[1], first.switches[2], second.switches[2], second.switches[4])] == [1, 1, 0, 1]
+
+
+def test_getters_fan_out_over_all_controllers(controllers):
+    registry = controllers[0]
+    results, errors = registry.get_port_stats()
+    assert sorted(results) == [1, 2, 3, 4] and errors == {}
+
+
+def test_unknown_dpid(controllers):
+    registry = controllers[0]
+    with pytest.raises(KeyError):
+        registry.switch(99)
+    with pytest.raises(ValueError):
+        registry.add_flow({"match": {}})
+
+    results, errors = registry.get_flows(DPIDs=[1, 99])
+    assert list(results) == [1]
+    assert isinstance(errors[99], KeyError)
+
+
+def test_new_switch_found_on_refresh(controllers):
+    registry, first, second, A, B = controllers
+    second.add_switch(MockSwitch(5, flows=0))
+    assert registry.controller(5) == B
+
+
+def test_unreachable_controller_keeps_its_switches(controllers):
+    registry, first, second, A, B = controllers
+    second.stop()
+    results, errors = registry.refresh()
+    assert list(results) == [A] and B in errors
+    assert registry.controller(4) == B
+
+
+def test_needs_a_controller():
+    with pytest.raises(ValueError):
+        RyuRegistry([])
+
+
+def test_unknown_dpids_refresh_once_per_call(controllers, monkeypatch):
+    registry = controllers[0]
+    refreshes = []
+    refresh = registry.refresh
+    monkeypatch.setattr(registry, "refresh", lambda: refreshes.append(1) or refresh())
+
+    results, errors = registry.get_flows(DPIDs=[1, 97, 98, 99])
+    assert list(results) == [1] and sorted(errors) == [97, 98, 99]
+    assert len(refreshes) == 1
+
+    with pytest.raises(KeyError, match="97, 98"):
+        registry.add_flows([{"dpid": DPID, "match": {}, "actions": []} for DPID in (1, 97, 98, 97)])
+    assert len(refreshes) == 2
+
+    registry.get_flows(DPIDs=[1, 3])
+    assert len(refreshes) == 2
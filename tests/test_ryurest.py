@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import ryurest
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Time an import in a new interpreter, and report whether it imported Requests
+IMPORT_CODE = """
+import sys, time
+sys.path.insert(0, %r)
+start = time.time()
+%s
+print("%%f %%s" %% (time.time() - start, "requests" in sys.modules))
+"""
+
+IMPORTS = ("import ryurest", "from ryurest import RyuSwitch", "from ryurest import ryufunc")
+
+# Cold imports timed per statement; the fastest is kept
+RUNS = 3
+
+
+def cold_import(statement):
+    times = []
+    for _ in range(RUNS):
+        output = subprocess.check_output([sys.executable, "-c", IMPORT_CODE % (ROOT_DIR, statement)])
+        elapsed, requests_imported = output.decode("utf-8").split()
+        times.append(float(elapsed))
+    return min(times), requests_imported == "True"
+
+
+@pytest.mark.parametrize("statement", IMPORTS)
+def test_import_does_not_import_requests(statement):
+    assert cold_import(statement)[1] is False
+
+
+def test_cold_import_time(record_property):
+    requests_time, _ = cold_import("import requests")
+    for statement in IMPORTS:
+        elapsed, _ = cold_import(statement)
+        record_property(statement, "%.1fms" % (elapsed * 1000))
+        # Importing the package must cost less than Requests alone, which it used to import
+        assert elapsed < requests_time
+
+
+def test_requests_imported_on_first_call():
+    code = """
+import sys
+sys.path.insert(0, %r)
+from ryurest import RyuSwitch
+from ryurest.ryumock import MockController
+with MockController(1) as API:
+    switch = RyuSwitch(1)
+    switch.API = API
+    assert "requests" not in sys.modules
+    assert switch.get_switches() == [1]
+    assert "requests" in sys.modules
+""" % ROOT_DIR
+    subprocess.check_call([sys.executable, "-c", code])
+
+
+def test_lazy_attributes():
+    from ryurest import ryuswitch, ryufunc
+    assert ryurest.RyuSwitch is ryuswitch.RyuSwitch
+    assert ryurest.ryufunc is ryufunc
+    assert "RyuFleet" in dir(ryurest) and "ryuanalyze" in dir(ryurest)
+    with pytest.raises(AttributeError):
+        ryurest.RyuNothing
+    for name in ryurest.MODULES:
+        assert getattr(ryurest, name).__name__ == "ryurest." + name
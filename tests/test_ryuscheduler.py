@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pytest
+
+from ryurest import ryuscheduler
+from ryurest.ryumock import MockController
+from ryurest.ryuscheduler import RyuScheduler
+from ryurest.ryusession import RyuSession
+
+
+@pytest.fixture
+def api():
+    with MockController(2, flows=2) as API:
+        yield API
+
+
+def test_polls_every_switch(api):
+    calls = []
+    lock = threading.Lock()
+
+    def store(DPID, method, result, error):
+        with lock:
+            calls.append((DPID, method, result is not False and error is None))
+
+    scheduler = RyuScheduler([1, 2], API=api, session=RyuSession())
+    scheduler.every(0.05, "get_port_stats", store)
+    scheduler.once("get_table_features", store)
+    scheduler.start()
+    time.sleep(0.5)
+    scheduler.stop()
+
+    assert all(ok for _, _, ok in calls)
+    assert len([call for call in calls if call[:2] == (1, "get_port_stats")]) >= 3
+    assert sorted(call[0] for call in calls if call[1] == "get_table_features") == [1, 2]
+
+
+def test_jitter_does_not_drift(api, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ryuscheduler, "_clock", lambda: clock[0])
+    # Every run is moved as late as the jitter allows
+    monkeypatch.setattr(ryuscheduler.random, "uniform", lambda low, high: high)
+
+    scheduler = RyuScheduler([1], API=api, jitter=0.1, session=RyuSession())
+    scheduler.every(10, "get_stats", lambda *args: None)
+    job = scheduler._queue[0][2]
+    start = job.base
+
+    for _ in range(50):
+        clock[0] = job.due
+        scheduler._in_flight[api] = 1
+        scheduler._run(job)
+
+    assert job.base == start + 50 * 10
+    assert job.due == job.base + 1.0
+
+
+def test_missed_runs_are_skipped(api, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(ryuscheduler, "_clock", lambda: clock[0])
+    monkeypatch.setattr(ryuscheduler.random, "uniform", lambda low, high: 0.0)
+
+    scheduler = RyuScheduler([1], API=api, session=RyuSession())
+    scheduler.every(10, "get_stats", lambda *args: None)
+    job = scheduler._queue[0][2]
+
+    # The run is made 35s late: the next one stays on the 10s grid
+    clock[0] = job.due + 35
+    scheduler._in_flight[api] = 1
+    scheduler._run(job)
+    assert job.base == 1000.0 + 40
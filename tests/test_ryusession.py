@@ -0,0 +1,154 @@
+import json
+import threading
+
+import pytest
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+from ryurest import ryufunc
+from ryurest import ryusession
+from ryurest.ryuswitch import RyuSwitch
+
+
+FLOWS = [{"priority": 1, "match": {"in_port": 1}, "actions": ["OUTPUT:2"]}]
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    '''
+    Answers a few ofctl_rest calls for switch 1, over keep-alive connections.
+    '''
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.connections.add(self.client_address)
+        if self.path == "/stats/switches":
+            self.reply(200, [1])
+        elif self.path == "/stats/flow/1":
+            self.reply(200, {"1": FLOWS})
+        else:
+            self.reply(404, None)
+
+    def do_POST(self):
+        self.server.connections.add(self.client_address)
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8"))
+        self.server.payloads.append((self.path, payload))
+        if self.path.startswith("/stats/flowentry/") and payload.get("dpid") == 1:
+            self.reply(200, None)
+        else:
+            self.reply(400, None)
+
+    def reply(self, status, body):
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def server():
+    server = Server(("127.0.0.1", 0), Handler)
+    server.connections = set()
+    server.payloads = []
+    server.API = "http://127.0.0.1:%d" % server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def switch(server):
+    session = ryusession.RyuSession()
+    switch = RyuSwitch(1, session=session)
+    switch.API = server.API
+    yield switch
+    session.close()
+
+
+def test_connection_is_reused(switch, server):
+    for _ in range(20):
+        assert switch.get_flows() == {"1": FLOWS}
+    assert switch.get_switches() == [1]
+    assert len(server.connections) == 1
+
+
+def test_errors_return_false(switch):
+    switch.DPID = 2
+    assert switch.get_flows() is False
+    assert switch.add_flow({"dpid": 2, "match": {}, "actions": []}) is False
+    assert switch.add_flow({"dpid": 1, "match": {}, "actions": []}) is True
+
+
+def test_shared_session(server, monkeypatch):
+    assert RyuSwitch(1).session is ryusession.SESSION
+    assert ryufunc.SESSION is ryusession.SESSION
+
+    monkeypatch.setattr(ryufunc, "API", server.API)
+    monkeypatch.setattr(ryufunc, "SESSION", ryusession.RyuSession())
+    for _ in range(5):
+        assert ryufunc.get_flows(1) == {"1": FLOWS}
+    assert len(server.connections) == 1
+
+
+def test_pool_size_per_controller():
+    session = ryusession.RyuSession(pool_size=4)
+    session.set_pool_size("http://10.0.0.1:8080", 50)
+    assert session.pool_sizes == {"http://10.0.0.1:8080": 50}
+    assert session._http().get_adapter("http://10.0.0.1:8080/stats/flow/1")._pool_maxsize == 50
+    assert session._http().get_adapter("http://10.0.0.1:80801/stats/flow/1")._pool_maxsize == 4
+    assert session._http().get_adapter("http://10.0.0.2:8080/stats/flow/1")._pool_maxsize == 4
+
+
+def test_bulk_writes(switch, server):
+    payloads = [{"dpid": 1 if i % 10 else 2, "priority": i, "match": {}, "actions": []} for i in range(100)]
+    status = switch.add_flows(payloads, window=8)
+    assert status == [i % 10 != 0 for i in range(100)]
+    assert sorted(payload["priority"] for _, payload in server.payloads) == list(range(100))
+
+    # Each call in flight keeps its pooled connection
+    assert len(server.connections) <= 8
+
+    assert switch.delete_flows(payloads[1:3], strict=True) == [True, True]
+    assert switch.modify_flows(payloads[1:2]) == [True]
+    assert [path for path, _ in server.payloads[100:]] == ["/stats/flowentry/delete_strict"] * 2 + ["/stats/flowentry/modify"]
+    assert switch.add_flows([]) == []
+
+
+def test_bulk_writes_to_a_closed_port():
+    session = ryusession.RyuSession()
+    assert session.post_many("http://127.0.0.1:1/stats/flowentry/add", [{"dpid": 1}] * 3, window=2) == [False] * 3
+    session.close()
+
+
+def test_bulk_writes_reuse_one_pool(switch, server):
+    session = switch.session
+    switch.add_flows([{"dpid": 1, "match": {}, "actions": []}] * 4, window=4)
+    pool = session._pool
+    switch.add_flows([{"dpid": 1, "match": {}, "actions": []}] * 4, window=2)
+    assert session._pool is pool
+
+    # Any exception fails only its own payload
+    status = session.post_many(switch.API + "/stats/flowentry/add", [{"dpid": 1}, {"dpid": object()}], window=2)
+    assert status == [True, False]
+
+    threads = threading.active_count()
+    session.close()
+    assert session._pool is None and threading.active_count() < threads
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from ryurest import ryucodec
+from ryurest.ryumetrics import Hooks
+from ryurest.ryusession import RyuSession
+from ryurest.ryustream import iter_entries
+
+
+class Response(object):
+
+    '''
+    Streamed response delivering its body in fixed-size chunks.
+    '''
+
+    def __init__(self, body):
+        self.body = body.encode("utf-8")
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+ENTRIES = [{"priority": i, "match": {"in_port": i}, "actions": ["OUTPUT:%d" % i], "name": u"café [%d]" % i} for i in range(50)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 65536])
+def test_entries_split_across_chunks(chunk_size):
+    response = Response(json.dumps({"1": ENTRIES}, ensure_ascii=False))
+    assert list(iter_entries(response, chunk_size)) == ENTRIES
+    assert response.closed
+
+
+def test_empty_table():
+    assert list(iter_entries(Response('{"1": []}'))) == []
+
+
+def test_truncated_body():
+    response = Response(json.dumps({"1": ENTRIES})[:-20])
+    with pytest.raises(ValueError):
+        list(iter_entries(response, 16))
+    assert response.closed
+
+
+def test_closing_the_generator_closes_the_response():
+    response = Response(json.dumps({"1": ENTRIES}))
+    entries = iter_entries(response, 16)
+    next(entries)
+    entries.close()
+    assert response.closed
+
+
+def test_no_array():
+    response = Response('{}')
+    assert list(iter_entries(response)) == []
+    assert response.closed
+
+
+def test_scalars_and_escapes():
+    values = [1, "a\"]}", {"x": "\\"}, [2, {"y": []}], None, {"s": "}, {", "l": [{"a": 1}, {"b": {}}]}, {}]
+    for chunk_size in (1, 3, 64):
+        assert list(iter_entries(Response(json.dumps({"1": values})), chunk_size)) == values
+
+
+def test_session_codec_and_instruments():
+    calls = []
+    codec = ryucodec.get("json")
+    session = RyuSession(codec=ryucodec.Codec("counting", lambda content: calls.append(content) or codec.loads(content),
+                                              codec.dumps))
+    read = []
+    session.instrument(Hooks(decoded=lambda *args: read.append(args[-1]), read=lambda *args: read.append(args[-1])))
+
+    response = Response(json.dumps({"1": ENTRIES[:3]}))
+    response.url = "http://localhost:8080/stats/flow/1"
+    response.request = type("Request", (object,), {"method": "GET"})
+    assert list(iter_entries(response, 16, session)) == ENTRIES[:3]
+    assert len(calls) == 3
+    elapsed, size = read
+    assert elapsed >= 0 and size == len(response.body)
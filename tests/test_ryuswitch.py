@@ -0,0 +1,95 @@
+import pytest
+
+from ryurest import ryufunc
+from ryurest.ryuendpoints import ENDPOINTS
+from ryurest.ryumock import MockController, MockSwitch
+from ryurest.ryusession import RyuSession
+from ryurest.ryuswitch import RyuSwitch
+
+
+FLOW = {"dpid": 1, "table_id": 0, "priority": 100, "match": {"in_port": 1}, "actions": [{"type": "OUTPUT", "port": 2}]}
+
+
+@pytest.fixture
+def api():
+    with MockController([MockSwitch(1, flows=3), MockSwitch(2, flows=0)]) as API:
+        yield API
+
+
+@pytest.fixture
+def switch(api):
+    switch = RyuSwitch(1, session=RyuSession())
+    switch.API = api
+    return switch
+
+
+@pytest.fixture
+def func(api):
+    # ryufunc is configured through module globals
+    saved = ryufunc.API, ryufunc.SESSION
+    ryufunc.API, ryufunc.SESSION = api, RyuSession()
+    yield ryufunc
+    ryufunc.API, ryufunc.SESSION = saved
+
+
+def test_endpoint_uri():
+    API = "http://localhost:8080"
+    assert ENDPOINTS["flow"].uri(API, 1) == API + "/stats/flow/1"
+    assert ENDPOINTS["queue"].uri(API, 1, values=(None, 4)) == API + "/stats/queue/1/ALL/4"
+    assert ENDPOINTS["port"].uri(API, 1, values=(3,)) == API + "/stats/port/1/3"
+    assert ENDPOINTS["switches"].uri(API) == API + "/stats/switches"
+    assert ENDPOINTS["meterconfig"].uri(API, 1, openflow=1.5) == API + "/stats/meterdesc/1"
+    assert ENDPOINTS["portdesc"].uri(API, 1, values=(3,), openflow=1.5) == API + "/stats/portdesc/1/3"
+
+
+def test_endpoint_filters():
+    method, rest_uri, kwargs = ENDPOINTS["flow"].prepare("http://localhost:8080", 1, filters={"table_id": 0})
+    assert method == "POST" and kwargs == {"json": {"table_id": 0}}
+    assert ENDPOINTS["flow"].prepare("http://localhost:8080", 1)[0] == "GET"
+
+
+def test_getters(switch):
+    assert sorted(switch.get_switches()) == [1, 2]
+    assert list(switch.get_stats()) == ["1"]
+    assert len(switch.get_flows()["1"]) == 3
+    assert len(switch.get_port_stats()["1"]) > 0
+    assert "1" in switch.get_table_stats()
+
+
+def test_writes(switch):
+    assert switch.add_flow(FLOW) is True
+    assert switch.get_flows({"priority": 100})["1"][0]["match"] == {"in_port": 1}
+    assert switch.delete_flow_strict(FLOW) is True
+    assert switch.get_flows({"priority": 100})["1"] == []
+
+    assert switch.add_flows([dict(FLOW, priority=priority) for priority in range(10, 20)]) == [True] * 10
+    assert switch.delete_flow_all() is True
+    assert switch.get_flows()["1"] == []
+
+
+def test_errors_return_false(switch):
+    switch.DPID = 99
+    assert switch.get_flows() is False
+    assert switch.add_flow(dict(FLOW, dpid=99)) is False
+
+
+def test_ryufunc(func):
+    assert sorted(func.get_switches()) == [1, 2]
+    assert func.get_flows(2) == {"2": []}
+    assert func.add_flow(dict(FLOW, dpid=2)) is True
+    assert len(func.get_flows(2)["2"]) == 1
+    assert func.delete_flow_all(2) is True
+    assert func.get_flows(99) is False
+
+
+
+def test_same_calls_in_every_module():
+    methods = [name for name in dir(RyuSwitch) if not name.startswith("_") and callable(getattr(RyuSwitch, name))]
+    assert [name for name in methods if not callable(getattr(ryufunc, name, None))] == []
+
+    pytest.importorskip("aiohttp")
+    from ryurest.ryuasync import AsyncRyuSwitch
+
+    # Bulk and streaming calls have no awaitable counterpart
+    local = ("add_flows", "modify_flows", "delete_flows", "iter_flows", "get_flow_table", "get_flow_index")
+    assert [name for name in methods if name not in local and not hasattr(AsyncRyuSwitch, name)] == []
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from ryurest.ryucache import RyuCache
+from ryurest.ryumock import MockController, MockSwitch
+from ryurest.ryusession import RyuSession
+from ryurest.ryuswitch import RyuSwitch
+from ryurest.ryutemplate import FlowTemplate, Payload, Slot
+
+
+TEMPLATE = {
+    "dpid": 1, "table_id": 0, "priority": 100,
+    "match": {"eth_type": 0x800, "ipv4_dst": Slot("dst")},
+    "actions": [{"type": "OUTPUT", "port": Slot("port")}],
+}
+
+
+def test_fill():
+    payload = FlowTemplate(TEMPLATE).fill(dst="10.0.0.1", port=2)
+    assert isinstance(payload, Payload)
+    assert payload.dpid == 1
+    assert json.loads(payload.decode("utf-8")) == {
+        "dpid": 1, "table_id": 0, "priority": 100,
+        "match": {"eth_type": 0x800, "ipv4_dst": "10.0.0.1"},
+        "actions": [{"type": "OUTPUT", "port": 2}],
+    }
+
+
+def test_values_are_encoded():
+    payload = FlowTemplate(TEMPLATE).fill(dst=u'a"b\\cé', port=2 ** 64 - 1)
+    decoded = json.loads(payload.decode("utf-8"))
+    assert decoded["match"]["ipv4_dst"] == u'a"b\\cé'
+    assert decoded["actions"][0]["port"] == 2 ** 64 - 1
+
+
+def test_fill_many():
+    template = FlowTemplate(dict(TEMPLATE, dpid=Slot("dpid")))
+    payloads = template.fill_many({"dpid": DPID, "dst": "10.0.0.%d" % DPID, "port": DPID} for DPID in range(1, 4))
+    assert [payload.dpid for payload in payloads] == [1, 2, 3]
+    assert json.loads(payloads[2].decode("utf-8"))["match"]["ipv4_dst"] == "10.0.0.3"
+
+
+def test_missing_slot():
+    with pytest.raises((KeyError, TypeError, ValueError)):
+        FlowTemplate(TEMPLATE).fill(dst="10.0.0.1")
+
+
+
+def test_send():
+    template = FlowTemplate({
+        "dpid": 1, "priority": 10,
+        "match": {"in_port": Slot("port")},
+        "actions": [{"type": "OUTPUT", "port": 1}],
+    })
+    with MockController([MockSwitch(1, flows=0)]) as API:
+        switch = RyuSwitch(1, session=RyuSession(cache=RyuCache()))
+        switch.API = API
+
+        assert switch.get_flows() == {"1": []}
+        assert switch.add_flows(template.fill_many({"port": port} for port in range(2, 12))) == [True] * 10
+
+        # The DPID of the filled template invalidates the cached flow table
+        assert len(switch.get_flows()["1"]) == 10
+        assert switch.delete_flow_strict(template.fill(port=2)) is True
+        assert len(switch.get_flows()["1"]) == 9